@@ -1,72 +1,480 @@
 import Xlib
 import Xlib.display
-import subprocess
-from PyQt6.QtCore import QObject, pyqtSignal, QTimer
+import Xlib.error
+import Xlib.X
+import Xlib.Xatom
+from collections import OrderedDict
+from PyQt6.QtCore import (
+    Q_ARG,
+    QMetaObject,
+    QObject,
+    QSocketNotifier,
+    Qt,
+    QThread,
+    pyqtSignal,
+    pyqtSlot,
+)
+from core.window_introspector import (
+    ALL_FIELDS,
+    GEOMETRY,
+    TITLE,
+    AtomCache,
+    WindowIntrospector,
+)
+from core.proc_tree import ProcessTree
+from core.terminal import foreground_command
+from core.terminal_resolvers import default_resolvers
+from core.window_snapshot import DesktopModel, WindowSnapshot, WindowSnapshotService
 
+# How many windows' metadata to remember. Event masks stay selected on each
+# remembered window so its DestroyNotify and property changes still arrive.
+METADATA_CACHE_SIZE = 64
 
-class LinuxAppDetector(QObject):
-    app_changed = pyqtSignal(str, dict)
+CLIENT_EVENT_MASK = Xlib.X.StructureNotifyMask | Xlib.X.PropertyChangeMask
+WINDOW_EVENTS = (Xlib.X.PropertyNotify, Xlib.X.ConfigureNotify, Xlib.X.DestroyNotify)
 
-    def __init__(self):
+
+class WindowMetadata:
+    """The fields of a window that practically never change while it exists."""
+
+    __slots__ = ("pid", "process_name", "class_name")
+
+    def __init__(self, pid: int | None, process_name: str, class_name: str):
+        self.pid = pid
+        self.process_name = process_name
+        self.class_name = class_name
+
+
+class WindowMetadataCache:
+    """
+    Per-window :class:`WindowMetadata`, keyed by X window id.
+
+    Entries are dropped when the window is destroyed or one of the properties
+    they were read from changes; the least recently used entry is dropped
+    when the cache is full. ``on_evict`` is called with the id of every
+    dropped window.
+    """
+
+    def __init__(self, on_evict, size: int = METADATA_CACHE_SIZE):
+        self.size = size
+        self.on_evict = on_evict
+        self._entries = OrderedDict()
+
+    def __contains__(self, window_id: int) -> bool:
+        return window_id in self._entries
+
+    def get(self, window_id: int) -> WindowMetadata | None:
+        metadata = self._entries.get(window_id)
+        if metadata is not None:
+            self._entries.move_to_end(window_id)
+        return metadata
+
+    def put(self, window_id: int, metadata: WindowMetadata):
+        self._entries[window_id] = metadata
+        self._entries.move_to_end(window_id)
+        while len(self._entries) > self.size:
+            evicted, _ = self._entries.popitem(last=False)
+            self.on_evict(evicted)
+
+    def invalidate(self, window_id: int) -> bool:
+        if self._entries.pop(window_id, None) is None:
+            return False
+        self.on_evict(window_id)
+        return True
+
+    def clear(self):
+        for window_id in list(self._entries):
+            self.invalidate(window_id)
+
+
+class XWindowWorker(QObject):
+    """
+    Follows the focused X11 window without polling.
+
+    Lives on its own thread with its own X connection, so slow X round-trips
+    never hold up painting or input; see :class:`LinuxAppDetector`.
+
+    The root window's ``_NET_ACTIVE_WINDOW`` property is watched for focus
+    changes, and the focused window (and its window-manager frame) for
+    ConfigureNotify and title changes. Events are read when the X connection
+    becomes readable, through a :pyclass:`QSocketNotifier` on the Qt event
+    loop, so nothing runs while the desktop is idle.
+
+    Each change is sampled once into a :class:`WindowSnapshot` and emitted
+    as ``sampled``; only what an event can have changed is re-read.
+    A window's PID, process and class are cached until it is destroyed or
+    those properties change.
+
+    Every managed window, from ``_NET_CLIENT_LIST_STACKING``, is kept as a
+    snapshot too and updated from its own events, with the reads for all
+    windows that changed in one batch. ``desktop_changed(changed, removed,
+    stacking)`` carries only the snapshots that changed, the IDs of windows
+    that are gone, and the stacking order if it changed, else ``None``.
+    These snapshots name the window's class; what runs in a terminal is
+    looked up only for the focused window, when it gains focus or its title
+    changes. Focusing a window the model is current for needs no X reads
+    beyond ``_NET_ACTIVE_WINDOW`` itself.
+    """
+
+    sampled = pyqtSignal(object)
+    desktop_changed = pyqtSignal(object, object, object)
+    activity = pyqtSignal()
+
+    def __init__(self, display):
         super().__init__()
-        self.display = Xlib.display.Display()
-        self.last_app_name = None
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.check_active_window)
+        self.display = display
+        self.root = self.display.screen().root
+        self.current = None
+        self.desktop = {}
+        self.stacking = ()
+        self.dirty = {}
+        self.removed = set()
+        self.suspended = False
+        self.stale = False
+        self.active_window_id = None
+        self.frame_window = None
+        self.metadata = WindowMetadataCache(self._forget_window)
+        self.process_tree = ProcessTree()
+        self.terminal_resolvers = default_resolvers()
+        self.notifier = None
+
+        self.atoms = AtomCache(self.display)
+        self.atoms.preload(["_NET_ACTIVE_WINDOW", "_NET_CLIENT_LIST_STACKING"])
+        self.introspector = WindowIntrospector(self.display, self.atoms)
+        self.NET_ACTIVE_WINDOW = self.atoms["_NET_ACTIVE_WINDOW"]
+        self.NET_CLIENT_LIST_STACKING = self.atoms["_NET_CLIENT_LIST_STACKING"]
+        self.title_atoms = {Xlib.Xatom.WM_NAME, self.atoms["_NET_WM_NAME"]}
+        self.metadata_atoms = {Xlib.Xatom.WM_CLASS, self.atoms["_NET_WM_PID"]}
 
-    def start(self, interval=1000):
-        self.timer.start(interval)
+    @pyqtSlot()
+    def start(self):
+        self.root.change_attributes(event_mask=Xlib.X.PropertyChangeMask)
+        self.display.flush()
+        self.notifier = QSocketNotifier(
+            self.display.fileno(), QSocketNotifier.Type.Read, self
+        )
+        self.notifier.activated.connect(self.process_events)
+        self.refresh_desktop(stacking_changed=True)
+        self.check_active_window()
 
+    @pyqtSlot()
     def stop(self):
-        self.timer.stop()
+        if self.notifier is not None:
+            self.notifier.setEnabled(False)
+            self.notifier = None
+        self._track_frame(None)
+        self.active_window_id = None
+        self.metadata.clear()
+        for resolver in self.terminal_resolvers:
+            resolver.close()
+        self.root.change_attributes(event_mask=Xlib.X.NoEventMask)
+        self.display.flush()
 
-    def check_active_window(self):
-        info = self.get_active_window_info()
-        app_name = info.get("app_name")
-        geometry = info.get("geometry")
-        if app_name and app_name != self.last_app_name:
-            self.last_app_name = app_name
-            self.app_changed.emit(app_name, geometry)
+    @pyqtSlot(bool)
+    def set_suspended(self, suspended):
+        """Stop or resume reading X and ``/proc`` in response to events.
 
-    def get_active_window_info(self):
-        root = self.display.screen().root
-        window_id = root.get_full_property(
-            self.display.intern_atom("_NET_ACTIVE_WINDOW"), Xlib.X.AnyPropertyType
-        ).value[0]
-        window = self.display.create_resource_object("window", window_id)
+        While suspended, events are still drained but only mark the model
+        stale, and the terminal resolvers' connections are closed. Resuming
+        re-reads whatever went stale in one batch.
+        """
+        if suspended == self.suspended:
+            return
+        self.suspended = suspended
+        if suspended:
+            for resolver in self.terminal_resolvers:
+                resolver.close()
+            return
+        if not (self.stale or self.dirty):
+            return
+        self.stale = False
+        if self.active_window_id in self.desktop:
+            self.dirty.setdefault(self.active_window_id, set()).update(
+                (TITLE, GEOMETRY)
+            )
+        self.refresh_desktop(stacking_changed=True)
+        self.check_active_window()
 
-        title = self._get_window_title(window)
-        pid = self._get_window_pid(window)
-        process_name = self._get_process_name(pid)
-        app_name = self._get_app_name(window)
-        geometry = self._get_window_geometry(window)
+    def process_events(self, *args):
+        """Drain the X event queue and react once per batch of events.
 
-        if "gnome-terminal" in process_name:
-            app_name = self._get_terminal_command(pid) or app_name
+        Replies read while handling a batch can queue further events without
+        the socket becoming readable again, so the queue is drained until it
+        stays empty.
+        """
+        while True:
+            focus_changed = title_changed = geometry_changed = False
+            stacking_changed = False
+            while self.display.pending_events():
+                event = self.display.next_event()
+                if event.type not in WINDOW_EVENTS:
+                    # e.g. MappingNotify, which every client gets and which
+                    # has no window.
+                    continue
+                window_id = event.window.id
+                active = window_id == self.active_window_id
+                if event.type == Xlib.X.PropertyNotify:
+                    if window_id == self.root.id:
+                        if event.atom == self.NET_ACTIVE_WINDOW:
+                            focus_changed = True
+                        elif event.atom == self.NET_CLIENT_LIST_STACKING:
+                            stacking_changed = True
+                    elif event.atom in self.metadata_atoms:
+                        self.metadata.invalidate(window_id)
+                        focus_changed = focus_changed or active
+                        self._mark_dirty(window_id, ALL_FIELDS, active)
+                    elif event.atom in self.title_atoms:
+                        title_changed = title_changed or active
+                        self._mark_dirty(window_id, (TITLE,), active)
+                elif event.type == Xlib.X.ConfigureNotify:
+                    frame = (
+                        self.frame_window is not None
+                        and window_id == self.frame_window.id
+                    )
+                    geometry_changed = geometry_changed or active or frame
+                    self._mark_dirty(window_id, (GEOMETRY,), active or frame)
+                elif event.type == Xlib.X.DestroyNotify:
+                    self.metadata.invalidate(window_id)
+                    self._remove(window_id)
+                    focus_changed = focus_changed or active
 
-        return {
-            "title": title,
-            "app_name": app_name,
-            "process_name": process_name,
-            "geometry": geometry,
-        }
+            if self.suspended:
+                # Only note that the model is behind; it is brought up to
+                # date in one go on resume. Focus moving is the user back.
+                changed = focus_changed or title_changed or geometry_changed
+                self.stale = self.stale or changed or stacking_changed
+                if focus_changed:
+                    self.activity.emit()
+                break
+            if stacking_changed or self.dirty:
+                self.refresh_desktop(stacking_changed)
+            if not (focus_changed or title_changed or geometry_changed):
+                if not stacking_changed:
+                    break
+                continue
+            current = self.current
+            window = self._active_window()
+            if window is None:
+                continue
+            if focus_changed or current is None or current.window_id != window.id:
+                # Also reached after the active window's cached metadata was
+                # invalidated, which makes the sample re-read it.
+                self.check_active_window()
+                continue
+            if title_changed:
+                current = self._resample_title(window, current)
+            if geometry_changed:
+                current = current.replace(geometry=self._get_window_geometry(window))
+            if current is None:
+                continue
+            self._emit(current)
+
+    def check_active_window(self):
+        snapshot = self.sample()
+        if snapshot is not None:
+            self._emit(snapshot)
+
+    def _emit(self, snapshot):
+        if snapshot.window_id in self.desktop:
+            self.desktop[snapshot.window_id] = snapshot
+        if snapshot != self.current:
+            self.current = snapshot
+            self.sampled.emit(snapshot)
+
+    def _mark_dirty(self, window_id, fields, active):
+        """Queue a re-read of ``fields`` for a managed window that isn't focused.
+
+        The focused window is re-read directly and its result stored in the
+        desktop model by :meth:`_emit`.
+        """
+        if not active and window_id in self.desktop:
+            self.dirty.setdefault(window_id, set()).update(fields)
 
-    def _get_window_title(self, window):
+    def _client_list(self) -> list[int] | None:
         try:
-            return window.get_wm_name()
-        except (Xlib.error.XError, UnicodeDecodeError):
-            return "Unknown"
+            prop = self.root.get_full_property(
+                self.NET_CLIENT_LIST_STACKING, Xlib.X.AnyPropertyType
+            )
+        except Xlib.error.XError:
+            return None
+        return list(prop.value) if prop else None
+
+    def _remove(self, window_id):
+        """Drop a window from the desktop model, to be reported as removed."""
+        self.dirty.pop(window_id, None)
+        if self.desktop.pop(window_id, None) is not None:
+            self.removed.add(window_id)
+
+    def refresh_desktop(self, stacking_changed=False):
+        """Bring the desktop model up to date and emit what changed.
+
+        New windows are read in full and dirty ones only for what changed;
+        all of it goes out as one pipelined batch.
+        """
+        stacking = None
+        if stacking_changed:
+            client_ids = self._client_list()
+            if client_ids is not None:
+                for window_id in self.desktop.keys() - set(client_ids):
+                    self._remove(window_id)
+                for window_id in client_ids:
+                    if window_id not in self.desktop:
+                        self.dirty[window_id] = set(ALL_FIELDS)
+                if tuple(client_ids) != self.stacking:
+                    stacking = self.stacking = tuple(client_ids)
+                self.metadata.size = max(METADATA_CACHE_SIZE, 2 * len(client_ids))
+
+        queries = []
+        for window_id, fields in self.dirty.items():
+            if window_id not in self.desktop or window_id not in self.metadata:
+                fields = ALL_FIELDS
+            window = self.display.create_resource_object("window", window_id)
+            queries.append((window, tuple(fields)))
+        self.dirty = {}
+        changed = []
+        if queries:
+            results = self.introspector.query_each(queries)
+            for window, _ in queries:
+                info = results[window.id]
+                if info is None:
+                    self.metadata.invalidate(window.id)
+                    self._remove(window.id)
+                    continue
+                previous = self.desktop.get(window.id)
+                snapshot = self._build_snapshot(window, info, previous)
+                if snapshot != previous:
+                    self.desktop[window.id] = snapshot
+                    changed.append(snapshot)
+        removed, self.removed = tuple(self.removed - self.desktop.keys()), set()
+        if changed or removed or stacking is not None:
+            self.desktop_changed.emit(tuple(changed), removed, stacking)
 
-    def _get_window_pid(self, window):
+    def _build_snapshot(self, window, info, previous=None):
+        """A snapshot from the fields in ``info``, the rest taken from ``previous``.
+
+        A new title resets the application to the window's class; the
+        command running in a terminal is filled in by :meth:`sample` and
+        :meth:`_resample_title`, for the focused window only.
+        """
+        metadata = self._window_metadata(window, info)
+        if TITLE in info or previous is None:
+            title = info.get(TITLE) or "Unknown"
+            app_name = metadata.class_name
+        else:
+            title = previous.title
+            app_name = previous.app_name
+        if GEOMETRY in info or previous is None:
+            geometry = info.get(GEOMETRY)
+        else:
+            geometry = previous.geometry
+        return WindowSnapshot(
+            window.id, title, metadata.pid, metadata.process_name, app_name, geometry
+        )
+
+    def _active_window(self):
         try:
-            pid_prop = window.get_full_property(
-                self.display.intern_atom("_NET_WM_PID"), Xlib.X.AnyPropertyType
+            prop = self.root.get_full_property(
+                self.NET_ACTIVE_WINDOW, Xlib.X.AnyPropertyType
             )
-            if pid_prop:
-                return pid_prop.value[0]
         except Xlib.error.XError:
-            pass
-        return None
+            return None
+        if not prop or not prop.value or not prop.value[0]:
+            return None
+        window_id = prop.value[0]
+        window = self.display.create_resource_object("window", window_id)
+        if window_id != self.active_window_id:
+            self.active_window_id = window_id
+            self._track_frame(self._get_frame(window))
+            # Connections held for the terminal that had focus, such as a
+            # tmux control client, aren't needed any more.
+            for resolver in self.terminal_resolvers:
+                resolver.release()
+        return window
+
+    def _get_frame(self, window):
+        """The window manager's frame around ``window``: its top-level ancestor."""
+        try:
+            while True:
+                parent = window.query_tree().parent
+                if not parent or parent.id == self.root.id:
+                    return window
+                window = parent
+        except Xlib.error.XError:
+            return None
+
+    def _track_frame(self, frame):
+        """Follow moves of ``frame``, the focused window's window-manager frame."""
+        catch = Xlib.error.CatchError(Xlib.error.BadWindow)
+        if self.frame_window is not None and self.frame_window.id not in self.metadata:
+            self.frame_window.change_attributes(
+                event_mask=Xlib.X.NoEventMask, onerror=catch
+            )
+        self.frame_window = frame
+        if frame is not None and frame.id != self.active_window_id:
+            frame.change_attributes(
+                event_mask=Xlib.X.StructureNotifyMask, onerror=catch
+            )
+        self.display.flush()
+
+    def _forget_window(self, window_id):
+        """Stop listening to a window that is no longer in the metadata cache."""
+        if window_id == self.active_window_id:
+            return
+        window = self.display.create_resource_object("window", window_id)
+        window.change_attributes(
+            event_mask=Xlib.X.NoEventMask,
+            onerror=Xlib.error.CatchError(Xlib.error.BadWindow),
+        )
+
+    def _window_metadata(self, window, info):
+        """Cached metadata for ``window``, read from ``info`` when not cached."""
+        metadata = self.metadata.get(window.id)
+        if metadata is None:
+            pid = info["pid"]
+            class_name = info["wm_class"][1] if info["wm_class"] else "Unknown"
+            metadata = WindowMetadata(pid, self._get_process_name(pid), class_name)
+            window.change_attributes(
+                event_mask=CLIENT_EVENT_MASK,
+                onerror=Xlib.error.CatchError(Xlib.error.BadWindow),
+            )
+            self.metadata.put(window.id, metadata)
+        return metadata
+
+    def sample(self) -> WindowSnapshot | None:
+        """Reads everything about the focused window into a new snapshot."""
+        window = self._active_window()
+        if window is None:
+            return None
+
+        known = self.desktop.get(window.id)
+        metadata = self.metadata.get(window.id)
+        if known is not None and metadata is not None and window.id not in self.dirty:
+            # The desktop model is current for this window: only what runs in
+            # it, for a terminal, can have changed unseen.
+            app_name = self._get_terminal_command(metadata.pid) or metadata.class_name
+            return known.replace(app_name=app_name)
+
+        fields = (TITLE, GEOMETRY) if metadata is not None else ALL_FIELDS
+        info = self.introspector.query(window, fields)
+        if info is None:
+            self.metadata.invalidate(window.id)
+            return None
+        snapshot = self._build_snapshot(window, info)
+        app_name = self._get_terminal_command(snapshot.pid) or snapshot.app_name
+        return snapshot.replace(app_name=app_name)
+
+    def _resample_title(self, window, snapshot):
+        """Re-reads the title, and for a terminal the command running in it."""
+        info = self.introspector.query(window, (TITLE,))
+        if info is None:
+            return None
+        title = info["title"] or "Unknown"
+        for resolver in self.terminal_resolvers:
+            resolver.invalidate()
+        metadata = self.metadata.get(window.id)
+        class_name = metadata.class_name if metadata else snapshot.app_name
+        app_name = self._get_terminal_command(snapshot.pid) or class_name
+        return snapshot.replace(title=title, app_name=app_name)
 
     def _get_process_name(self, pid):
         if pid:
@@ -77,66 +485,110 @@ class LinuxAppDetector(QObject):
                 pass
         return "Unknown"
 
-    def _get_app_name(self, window):
-        try:
-            class_prop = window.get_wm_class()
-            if class_prop:
-                return class_prop[1]
-        except (Xlib.error.XError, UnicodeDecodeError):
-            pass
-        return "Unknown"
-
     def _get_window_geometry(self, window):
-        """Return a dict with absolute geometry taking frame extents into account."""
-        try:
-            geom = window.get_geometry()
-            abs_coords = window.translate_coords(self.display.screen().root, 0, 0)
-            x = abs_coords.x
-            y = abs_coords.y
-            width = geom.width
-            height = geom.height
-            try:
-                frame_prop = window.get_full_property(
-                    self.display.intern_atom("_NET_FRAME_EXTENTS"),
-                    Xlib.X.AnyPropertyType,
-                )
-                if frame_prop and len(frame_prop.value) >= 4:
-                    left, right, top, bottom = frame_prop.value[:4]
-                    x -= left
-                    y -= top
-                    width += left + right
-                    height += top + bottom
-            except Xlib.error.XError:
-                pass
-            return {
-                "x": int(x),
-                "y": int(y),
-                "width": int(width),
-                "height": int(height),
-            }
-        except Xlib.error.XError:
-            return {"x": 0, "y": 0, "width": 0, "height": 0}
+        """Return ``(x, y, width, height)`` in root coordinates, frame included."""
+        info = self.introspector.query(window, (GEOMETRY,))
+        return info["geometry"] if info else None
 
     def _get_terminal_command(self, pid):
         """
-        Attempt to get the command running in the terminal.
-        This is a bit of a hack and might not be reliable.
+        The command in the foreground of the terminal ``pid``, if it is one.
+
+        Works for any terminal emulator: see :func:`core.terminal.foreground_command`.
         """
-        try:
-            children_pids = (
-                subprocess.check_output(["pgrep", "-P", str(pid)]).decode().split()
-            )
-            if children_pids:
-                shell_pid = children_pids[0]
-                command_pids = (
-                    subprocess.check_output(["pgrep", "-P", str(shell_pid)])
-                    .decode()
-                    .split()
-                )
-                if command_pids:
-                    command_pid = command_pids[0]
-                    with open(f"/proc/{command_pid}/cmdline", "r") as f:
-                        return f.read().strip().replace("\x00", " ")
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            pass
-        return None
+        if not pid:
+            return None
+        return foreground_command(self.process_tree, pid, self.terminal_resolvers)
+
+
+class AppDetector(QObject):
+    """
+    Base for the sources of focused-window snapshots the UI listens to.
+
+    Subclasses feed ``self.snapshots``, and ``self.desktop`` if they can see
+    every window; ``app_changed`` is derived from the snapshots. While
+    suspended, ``activity`` reports the user moving focus.
+    """
+
+    app_changed = pyqtSignal(str, dict)
+    activity = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.last_app_name = None
+        self.snapshots = WindowSnapshotService(self)
+        self.snapshots.snapshot_changed.connect(self._on_snapshot_changed)
+        self.desktop = DesktopModel(self)
+        self.snapshots.snapshot_changed.connect(self.desktop.update_window)
+
+    def start(self):
+        """Start reporting focus changes; a no-op by default."""
+
+    def stop(self):
+        """Stop reporting focus changes and let go of resources; a no-op by default."""
+
+    def set_suspended(self, suspended: bool):
+        """Pause detection work while nobody is looking; a no-op by default."""
+
+    def _on_snapshot_changed(self, snapshot):
+        app_name = snapshot.app_name
+        if app_name and app_name != self.last_app_name:
+            self.last_app_name = app_name
+            self.app_changed.emit(app_name, snapshot.geometry_dict())
+
+    def get_active_window_info(self):
+        snapshot = self.snapshots.current
+        if snapshot is None:
+            return {}
+        return {
+            "title": snapshot.title,
+            "app_name": snapshot.app_name,
+            "process_name": snapshot.process_name,
+            "geometry": snapshot.geometry_dict(),
+        }
+
+
+class LinuxAppDetector(AppDetector):
+    """
+    Reports the focused X11 window to the UI.
+
+    The X work is done by an :class:`XWindowWorker` on a dedicated thread
+    with its own ``Display``. Its snapshots reach ``self.snapshots`` through
+    a queued connection, as do desktop changes for ``self.desktop``, so
+    every consumer is notified on the GUI thread.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.thread = QThread()
+        self.thread.setObjectName("x-window-worker")
+        self.worker = XWindowWorker(Xlib.display.Display())
+        self.worker.moveToThread(self.thread)
+        self.worker.sampled.connect(
+            self.snapshots.publish, Qt.ConnectionType.QueuedConnection
+        )
+        self.worker.desktop_changed.connect(
+            self.desktop.apply, Qt.ConnectionType.QueuedConnection
+        )
+        self.worker.activity.connect(self.activity, Qt.ConnectionType.QueuedConnection)
+        self.thread.started.connect(self.worker.start)
+
+    def start(self):
+        self.thread.start()
+
+    def set_suspended(self, suspended):
+        QMetaObject.invokeMethod(
+            self.worker,
+            "set_suspended",
+            Qt.ConnectionType.QueuedConnection,
+            Q_ARG(bool, suspended),
+        )
+
+    def stop(self):
+        if not self.thread.isRunning():
+            return
+        QMetaObject.invokeMethod(
+            self.worker, "stop", Qt.ConnectionType.BlockingQueuedConnection
+        )
+        self.thread.quit()
+        self.thread.wait()
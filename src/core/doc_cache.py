@@ -0,0 +1,267 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+SCHEMA_VERSION = 3
+
+
+def default_cache_dir() -> str:
+    """Returns ``$XDG_CACHE_HOME/wingman``, falling back to ``~/.cache/wingman``."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "wingman")
+
+
+def file_fingerprint(path: str, include_inode: bool = False) -> str | None:
+    """
+    Builds a cheap identity string for a file from a single ``stat()``.
+
+    Args:
+        path: The file to fingerprint.
+        include_inode: Also include the inode number, which catches binaries
+            that were replaced by a package upgrade with identical size/mtime.
+
+    Returns:
+        The fingerprint, or None if the file cannot be stat'ed.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if include_inode:
+        return f"{path}|{st.st_ino}|{st.st_mtime_ns}|{st.st_size}"
+    return f"{path}|{st.st_mtime_ns}|{st.st_size}"
+
+
+def read_memory_pressure() -> tuple[float | None, float | None]:
+    """
+    Samples how tight memory is on this machine.
+
+    Returns:
+        ``(available_ratio, psi_some_avg10)``: MemAvailable/MemTotal from
+        ``/proc/meminfo`` and the 10 s "some" stall percentage from
+        ``/proc/pressure/memory``. Either is None when unavailable.
+    """
+    available_ratio = None
+    try:
+        fields = {}
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("MemTotal", "MemAvailable"):
+                    fields[key] = int(value.split()[0])
+        if fields.get("MemTotal"):
+            available_ratio = fields["MemAvailable"] / fields["MemTotal"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    psi_some = None
+    try:
+        with open("/proc/pressure/memory", "r") as f:
+            for line in f:
+                if line.startswith("some "):
+                    for field in line.split()[1:]:
+                        name, _, value = field.partition("=")
+                        if name == "avg10":
+                            psi_some = float(value)
+    except (OSError, ValueError):
+        pass
+
+    return available_ratio, psi_some
+
+
+def pressure_scale(available_ratio: float | None, psi_some: float | None) -> float:
+    """Maps a memory pressure sample to the fraction of the budget to keep."""
+    scale = 1.0
+    if available_ratio is not None:
+        if available_ratio < 0.05:
+            scale = min(scale, 0.0)
+        elif available_ratio < 0.10:
+            scale = min(scale, 0.25)
+        elif available_ratio < 0.20:
+            scale = min(scale, 0.5)
+    if psi_some is not None:
+        if psi_some >= 20.0:
+            scale = min(scale, 0.0)
+        elif psi_some >= 5.0:
+            scale = min(scale, 0.25)
+        elif psi_some >= 1.0:
+            scale = min(scale, 0.5)
+    return scale
+
+
+class MemoryCache:
+    """
+    Hot in-process tier of rendered documents, evicted least-recently-used
+    first once their combined size exceeds a byte budget.
+
+    The budget shrinks while the system reports memory pressure, sampled at
+    most every ``pressure_interval`` seconds on any lookup or store, and
+    entries over the shrunken budget are dropped straight away.
+    """
+
+    MISS = object()
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, pressure_interval=5.0):
+        self.max_bytes = max_bytes
+        self.pressure_interval = pressure_interval
+        self.budget = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_pressure_check = 0.0
+
+    def get(self, key, fingerprint):
+        """Returns the cached content for ``key`` if its fingerprint matches,
+        otherwise :attr:`MemoryCache.MISS`."""
+        with self._lock:
+            if self._update_budget():
+                self._evict()
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != fingerprint:
+                return self.MISS
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, fingerprint, content):
+        """Stores ``content`` for ``key`` and evicts down to the current budget."""
+        cost = sys.getsizeof(content)
+        with self._lock:
+            self._update_budget()
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[2]
+            if cost <= self.budget:
+                self._entries[key] = (fingerprint, content, cost)
+                self.size += cost
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _update_budget(self) -> bool:
+        """Re-samples memory pressure if it's due; returns whether it was."""
+        now = time.monotonic()
+        if now - self._last_pressure_check < self.pressure_interval:
+            return False
+        self._last_pressure_check = now
+        self.budget = int(self.max_bytes * pressure_scale(*read_memory_pressure()))
+        return True
+
+    def _evict(self):
+        while self.size > self.budget and self._entries:
+            _, (_, _, cost) = self._entries.popitem(last=False)
+            self.size -= cost
+
+
+class DocCache:
+    """
+    Persistent store of rendered documentation keyed by ``(command, source)``.
+
+    Each entry remembers the fingerprint of the artifact it was rendered from
+    (the man page file or the executable); a lookup with a different
+    fingerprint is a miss. A stored ``None`` records that the source had no
+    documentation, so failed probes are not repeated either.
+
+    Any SQLite error disables the cache rather than failing the lookup.
+    """
+
+    MISS = object()
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.path.join(default_cache_dir(), "docs.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = None
+        try:
+            self._conn = self._open()
+        except (OSError, sqlite3.Error):
+            self._conn = None
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS documents")
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            " command TEXT NOT NULL,"
+            " source TEXT NOT NULL,"
+            " fingerprint TEXT NOT NULL,"
+            " content TEXT,"
+            " updated REAL NOT NULL,"
+            " PRIMARY KEY (command, source))"
+        )
+        conn.commit()
+        return conn
+
+    def get(self, command: str, source: str, fingerprint: str):
+        """
+        Looks up a cached rendering.
+
+        Args:
+            command: The documented command.
+            source: The documentation source, e.g. ``"man"`` or ``"help"``.
+            fingerprint: The current fingerprint of the backing artifact.
+
+        Returns:
+            The cached content (possibly None for a cached negative result), or
+            :attr:`DocCache.MISS` if there is no entry for this fingerprint.
+        """
+        if self._conn is None:
+            return self.MISS
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT fingerprint, content FROM documents"
+                    " WHERE command = ? AND source = ?",
+                    (command, source),
+                ).fetchone()
+        except sqlite3.Error:
+            return self.MISS
+        if row is None or row[0] != fingerprint:
+            return self.MISS
+        return row[1]
+
+    def put(self, command: str, source: str, fingerprint: str, content: str | None):
+        """Stores a rendering, replacing any entry for the same command and source."""
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO documents"
+                    " (command, source, fingerprint, content, updated)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (command, source, fingerprint, content, time.time()),
+                )
+                self._conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def entries(self, source: str) -> list[tuple[str, str, str | None]]:
+        """Returns ``(command, fingerprint, content)`` for every entry from ``source``."""
+        if self._conn is None:
+            return []
+        try:
+            with self._lock:
+                return self._conn.execute(
+                    "SELECT command, fingerprint, content FROM documents"
+                    " WHERE source = ?",
+                    (source,),
+                ).fetchall()
+        except sqlite3.Error:
+            return []
+
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,206 @@
+import threading
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class _DocumentationJob(QRunnable):
+    """Runs a single DocRetriever lookup on a pool thread.
+
+    The job never touches widgets; it reports back through the loader's
+    private signals, which Qt queues onto the GUI thread.
+
+    A prefetch job has no generation and only warms the caches, unless a
+    request for the same command adopts it while it is still running. It
+    never runs ``<command> --help``: prefetching follows focus, and would
+    otherwise execute every application the user switches to.
+    """
+
+    def __init__(self, loader, command, generation, cancel_event):
+        super().__init__()
+        self.loader = loader
+        self.doc_retriever = loader.doc_retriever
+        self.command = command
+        self.generation = generation
+        self.cancel_event = cancel_event
+        self.done = False
+        self.parts = []
+        self._lock = threading.Lock()
+
+    def adopt(self, generation):
+        """Deliver this job's results as ``generation``.
+
+        Returns:
+            The ``(source, document)`` parts completed so far, or None if the
+            job already finished or was cancelled.
+        """
+        with self._lock:
+            if self.done or self.cancel_event.is_set():
+                return None
+            self.generation = generation
+            return list(self.parts)
+
+    def _part(self, source, document):
+        with self._lock:
+            self.parts.append((source, document))
+            generation = self.generation
+        if generation is not None and not self.cancel_event.is_set():
+            self.loader._job_part.emit(generation, self.command, source, document)
+
+    def run(self):
+        if self.cancel_event.is_set():
+            return
+        try:
+            documentation = self.doc_retriever.get_documentation(
+                self.command,
+                cancel=self.cancel_event,
+                on_result=self._part,
+                run_help=self.generation is not None,
+            )
+        except Exception as e:
+            self._finish(self.loader._job_failed, str(e))
+            return
+        self._finish(self.loader._job_finished, documentation)
+
+    def _finish(self, signal, payload):
+        with self._lock:
+            self.done = True
+            generation = self.generation
+        if generation is not None and not self.cancel_event.is_set():
+            signal.emit(generation, self.command, payload)
+
+
+class DocLoader(QObject):
+    """Non-blocking front end for :class:`~core.doc_retriever.DocRetriever`.
+
+    Every call to :meth:`request` bumps a generation counter and the result is
+    only published if its generation is still the current one, so a slow
+    lookup that finishes after the user moved on is silently dropped.
+
+    When the retriever gathers all sources, :attr:`documentation_part`
+    reports each source as it completes, ahead of :attr:`documentation_ready`.
+    """
+
+    documentation_ready = pyqtSignal(int, str, object)
+    documentation_failed = pyqtSignal(int, str, str)
+    documentation_part = pyqtSignal(int, str, str, object)
+
+    _job_finished = pyqtSignal(int, str, object)
+    _job_failed = pyqtSignal(int, str, str)
+    _job_part = pyqtSignal(int, str, str, object)
+
+    PREFETCH_PRIORITY = -1
+
+    def __init__(self, doc_retriever, parent=None, max_threads=2):
+        super().__init__(parent)
+        self.doc_retriever = doc_retriever
+        self.generation = 0
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._active_job = None
+        self._prefetch_job = None
+
+        self._job_finished.connect(self._on_job_finished)
+        self._job_failed.connect(self._on_job_failed)
+        self._job_part.connect(self._on_job_part)
+
+    def request(self, command: str) -> int:
+        """Start retrieving documentation for ``command`` in the background.
+
+        Any request still in flight is cancelled first. A running prefetch of
+        ``command`` is taken over, unless the lookup needs the ``--help``
+        source the prefetch left out.
+
+        Returns:
+            The generation token identifying this request.
+        """
+        generation = self.cancel()
+        prefetch = self._prefetch_job
+        if prefetch is not None and prefetch[0].command != command:
+            prefetch = None
+        if prefetch is not None and self.doc_retriever.uses_help(command):
+            self.cancel_prefetch()
+            prefetch = None
+        if prefetch is not None:
+            self._prefetch_job = None
+            parts = prefetch[0].adopt(generation)
+            if parts is not None:
+                self._active_job = prefetch
+                for source, document in parts:
+                    self._job_part.emit(generation, command, source, document)
+                # Queued behind other work at low priority; move it up.
+                if self._take(prefetch[0]):
+                    self.pool.start(prefetch[0])
+                return generation
+
+        cancel_event = threading.Event()
+        job = _DocumentationJob(self, command, generation, cancel_event)
+        self._active_job = (job, cancel_event)
+        self.pool.start(job)
+        return generation
+
+    def prefetch(self, command: str):
+        """Warm the caches for ``command`` at low priority, without delivering it.
+
+        Replaces any earlier prefetch. A later :meth:`request` for the same
+        command takes over the running prefetch instead of starting again.
+        """
+        self.cancel_prefetch()
+        cancel_event = threading.Event()
+        job = _DocumentationJob(self, command, None, cancel_event)
+        self._prefetch_job = (job, cancel_event)
+        self.pool.start(job, self.PREFETCH_PRIORITY)
+
+    def cancel_prefetch(self):
+        """Stop the current prefetch, if any."""
+        if self._prefetch_job is not None:
+            job, cancel_event = self._prefetch_job
+            cancel_event.set()
+            self._take(job)
+            self._prefetch_job = None
+
+    def cancel(self) -> int:
+        """Invalidate the current request so its result is never delivered.
+
+        Returns:
+            The new current generation.
+        """
+        self.generation += 1
+        if self._active_job is not None:
+            job, cancel_event = self._active_job
+            cancel_event.set()
+            self._take(job)
+            self._active_job = None
+        return self.generation
+
+    def _take(self, job) -> bool:
+        """Remove ``job`` from the queue if it hasn't started yet.
+
+        A job that already ran has been deleted by the pool (it auto-deletes),
+        which leaves its Python wrapper unusable.
+        """
+        try:
+            return self.pool.tryTake(job)
+        except RuntimeError:
+            return False
+
+    def shutdown(self):
+        """Cancel outstanding work and drop anything still queued."""
+        self.cancel()
+        self.cancel_prefetch()
+        self.pool.clear()
+
+    def _on_job_finished(self, generation, command, documentation):
+        if generation != self.generation:
+            return
+        self._active_job = None
+        self.documentation_ready.emit(generation, command, documentation)
+
+    def _on_job_part(self, generation, command, source, document):
+        if generation != self.generation:
+            return
+        self.documentation_part.emit(generation, command, source, document)
+
+    def _on_job_failed(self, generation, command, error):
+        if generation != self.generation:
+            return
+        self._active_job = None
+        self.documentation_failed.emit(generation, command, error)
@@ -1,96 +1,475 @@
+import html
+import os
+import selectors
+import shutil
+import signal
 import subprocess
+import threading
+import time
+import urllib.parse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import requests
+from core.doc_cache import DocCache, MemoryCache, file_fingerprint
+from core.document import Document, Section
+from core.http_cache import DEFAULT_TIMEOUT, HttpCache, HttpClient
+from core.manpath import ManPageIndex
+from core.roff import UnsupportedRoff, page_fingerprint, render_man_page
+from core.search_index import SearchIndex
 
+DEFAULT_DOC_SOURCES = ["man", "help", "online"]
 
-def get_man_page(command: str) -> str | None:
+# Seconds each source may take before it is skipped.
+DEFAULT_SOURCE_TIMEOUTS = {"man": 5.0, "help": 3.0, "online": 8.0}
+
+# "first-wins" returns the best source that answered; "gather-all" also reports
+# every source as it completes so all of them can be shown.
+FIRST_WINS = "first-wins"
+GATHER_ALL = "gather-all"
+
+
+# Limits for every subprocess run to produce documentation.
+DEFAULT_PROBE_TIMEOUT = 5.0
+DEFAULT_PROBE_MAX_BYTES = 1024 * 1024
+
+
+class ProbeAborted(Exception):
+    """A documentation subprocess was killed before it finished."""
+
+
+def _kill_process_group(process):
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_bounded(
+    argv: list[str],
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+    max_bytes: int = DEFAULT_PROBE_MAX_BYTES,
+    cancel=None,
+) -> tuple[int, str]:
+    """
+    Runs a command in its own process group and captures its standard output.
+
+    The whole group is killed once the command finishes, so nothing it
+    spawned outlives it, and also as soon as it exceeds ``timeout``, writes
+    more than ``max_bytes`` or ``cancel`` is set. Standard input is
+    /dev/null so interactive programs cannot wait for input.
+
+    Args:
+        argv: The command line.
+        timeout: Seconds the command may run.
+        max_bytes: Most output accepted before the command is killed.
+        cancel: Optional ``threading.Event`` that aborts the command.
+
+    Returns:
+        ``(returncode, stdout)``.
+
+    Raises:
+        FileNotFoundError: The command does not exist.
+        ProbeAborted: The command was killed before it completed.
+    """
+    process = subprocess.Popen(
+        argv,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + timeout
+    chunks = []
+    size = 0
+    reason = None
+    try:
+        with selectors.DefaultSelector() as selector:
+            selector.register(process.stdout, selectors.EVENT_READ)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    reason = f"timed out after {timeout:g}s"
+                    break
+                if cancel is not None and cancel.is_set():
+                    reason = "cancelled"
+                    break
+                # Wake up regularly to notice cancellation.
+                if selector.select(min(remaining, 0.1)):
+                    chunk = os.read(process.stdout.fileno(), 65536)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size > max_bytes:
+                        reason = f"wrote more than {max_bytes} bytes"
+                        break
+                elif process.poll() is not None:
+                    # Exited, but something it started still holds stdout open.
+                    break
+        if reason is None:
+            try:
+                process.wait(max(deadline - time.monotonic(), 0))
+            except subprocess.TimeoutExpired:
+                reason = f"timed out after {timeout:g}s"
+    finally:
+        _kill_process_group(process)
+        process.stdout.close()
+        process.wait()
+    if reason is not None:
+        raise ProbeAborted(f"{argv[0]} {reason}")
+    return process.returncode, b"".join(chunks).decode(errors="replace")
+
+
+def get_man_page(
+    command: str,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+    max_bytes: int = DEFAULT_PROBE_MAX_BYTES,
+    cancel=None,
+) -> str | None:
     """
     Executes `man <command>` and captures the output.
 
     Args:
         command: The command to get the man page for.
+        timeout, max_bytes, cancel: Limits passed on to :func:`run_bounded`.
 
     Returns:
         The man page as a string, or None if not found.
+
+    Raises:
+        ProbeAborted: `man` was killed for exceeding a limit.
     """
     try:
-        result = subprocess.run(
-            ["man", command],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        return result.stdout
-    except (subprocess.CalledProcessError, FileNotFoundError):
+        returncode, output = run_bounded(["man", command], timeout, max_bytes, cancel)
+    except FileNotFoundError:
         return None
+    return output if returncode == 0 else None
 
 
-def get_help_output(command: str) -> str | None:
+def get_help_output(
+    command: str,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+    max_bytes: int = DEFAULT_PROBE_MAX_BYTES,
+    cancel=None,
+) -> str | None:
     """
     Executes `<command> --help` or `<command> -h` and captures the output.
 
     Args:
         command: The command to get the help output for.
+        timeout, max_bytes, cancel: Limits passed on to :func:`run_bounded`
+            for each attempt.
 
     Returns:
         The help output as a string, or None if not found.
+
+    Raises:
+        ProbeAborted: The command was killed for exceeding a limit; `-h` is
+            not tried after `--help` hangs.
     """
     for flag in ["--help", "-h"]:
         try:
-            result = subprocess.run(
-                [command, flag],
-                capture_output=True,
-                text=True,
-                check=True,
+            returncode, output = run_bounded(
+                [command, flag], timeout, max_bytes, cancel
             )
-            return result.stdout
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            continue
+        except FileNotFoundError:
+            return None
+        if returncode == 0:
+            return output
     return None
 
 
-def get_online_docs(url: str) -> str | None:
+def get_online_docs(url: str, client: HttpClient | None = None) -> str | None:
     """
     Fetches online documentation from a URL.
 
     Args:
         url: The URL to fetch the documentation from.
+        client: The pooled, caching client to use; without one a single
+            uncached request is made.
 
     Returns:
         The documentation as a string, or None if there was an error.
     """
+    if client is not None:
+        return client.get_text(url)
     try:
-        response = requests.get(url)
+        response = requests.get(url, timeout=DEFAULT_TIMEOUT)
         response.raise_for_status()
         return response.text
     except requests.exceptions.RequestException:
         return None
 
 
-def format_documentation(title: str, content: str) -> str:
+def format_documentation(title: str, content: str, is_html: bool = False) -> str:
     """
     Formats the retrieved documentation for display.
 
     Args:
         title: The title for the documentation.
         content: The documentation content.
+        is_html: Whether ``content`` is already an HTML fragment; plain text
+            is escaped and kept preformatted.
 
     Returns:
-        The formatted documentation.
+        The formatted documentation as HTML.
     """
-    return f"--- {title} ---\n\n{content}"
+    if not is_html:
+        content = f"<pre>{html.escape(content, quote=False)}</pre>"
+    return f"<h3>{html.escape(title, quote=False)}</h3>\n{content}"
 
 
 class DocRetriever:
-    def __init__(self, config):
+    def __init__(self, config, cache=None):
         self.config = config
+        if cache is None:
+            cache = DocCache(config.get("doc_cache_path") if config else None)
+        self.cache = cache
+        memory_mb = config.get("doc_memory_cache_mb", 32) if config else 32
+        self.memory_cache = MemoryCache(int(memory_mb * 1024 * 1024))
+        self.man_index = ManPageIndex()
+        self.search_index = SearchIndex(
+            self.man_index,
+            self.cache,
+            config.get("search_index_path") if config else None,
+        )
+        self.http_client = HttpClient(
+            HttpCache(config.get("http_cache_path") if config else None),
+            timeout=(
+                self._setting("http_connect_timeout", DEFAULT_TIMEOUT[0]),
+                self._setting("http_read_timeout", DEFAULT_TIMEOUT[1]),
+            ),
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=2 * len(DEFAULT_DOC_SOURCES),
+            thread_name_prefix="wingman-docs",
+        )
+
+    def _setting(self, key, default):
+        return self.config.get(key, default) if self.config else default
+
+    def _probe_limits(self, cancel):
+        return {
+            "timeout": self._setting("probe_timeout", DEFAULT_PROBE_TIMEOUT),
+            "max_bytes": self._setting("probe_max_bytes", DEFAULT_PROBE_MAX_BYTES),
+            "cancel": cancel,
+        }
+
+    def _cached(self, command, source, fingerprint, produce):
+        """Returns ``produce(command)``, served from the cache while
+        ``fingerprint`` still matches the artifact it was rendered from."""
+        if fingerprint is None:
+            return produce(command)
+        key = (command, source)
+        content = self.memory_cache.get(key, fingerprint)
+        if content is not MemoryCache.MISS:
+            return content
+        content = self.cache.get(command, source, fingerprint)
+        if content is DocCache.MISS:
+            content = produce(command)
+            self.cache.put(command, source, fingerprint, content)
+        self.memory_cache.put(key, fingerprint, content)
+        return content
+
+    def get_man_page(self, command: str, cancel=None) -> Document | None:
+        """
+        Renders the man page for ``command`` into a sectioned document.
+
+        The page source is rendered in-process by :mod:`core.roff`; pages it
+        cannot handle, and pages missing from the index, fall back to running
+        ``man`` within the ``probe_timeout``/``probe_max_bytes`` limits.
+        Results, including their section offsets, are cached keyed on the
+        path, mtime and size of the page file and of any page it redirects to
+        with ``.so``; an aborted ``man`` is not cached.
+        """
+        limits = self._probe_limits(cancel)
+        page = self.man_index.locate(command)
+        if page is None:
+            text = get_man_page(command, **limits)
+            return Document.from_text("", text) if text else None
+        content = self._cached(
+            command,
+            "man",
+            page_fingerprint(page),
+            lambda command: self._render_man_page(command, page, limits),
+        )
+        return Document.from_json(content) if content else None
+
+    @staticmethod
+    def _render_man_page(command, page, limits):
+        try:
+            document = Document.from_html("", render_man_page(page))
+        except (UnsupportedRoff, OSError):
+            text = get_man_page(command, **limits)
+            if not text:
+                return None
+            document = Document.from_text("", text)
+        return document.to_json()
+
+    def get_help_output(self, command: str, cancel=None) -> str | None:
+        """Cached :func:`get_help_output`, keyed on the executable's inode, mtime and size.
+
+        Raises:
+            ProbeAborted: The probe was killed; nothing is cached.
+        """
+        executable = shutil.which(command)
+        if executable is None:
+            return None
+        fingerprint = file_fingerprint(executable, include_inode=True)
+        limits = self._probe_limits(cancel)
+        return self._cached(
+            command,
+            "help",
+            fingerprint,
+            lambda command: get_help_output(command, **limits),
+        )
 
-    def get_documentation(self, command: str) -> str:
-        man_page = get_man_page(command)
-        if man_page:
-            return format_documentation(f"Man page for {command}", man_page)
+    def get_online_docs(self, command: str) -> str | None:
+        """Fetches the page ``url_patterns`` configures for ``command``, if any."""
+        patterns = self._setting("url_patterns", {}) or {}
+        pattern = patterns.get(command, patterns.get("default"))
+        if not pattern:
+            return None
+        url = pattern.format(query=urllib.parse.quote_plus(command))
+        return get_online_docs(url, self.http_client)
+
+    def _fetch(self, source, command, stop):
+        """Retrieves ``command``'s documentation from a single source."""
+        if stop.is_set():
+            return None
+        if source == "man":
+            document = self.get_man_page(command, cancel=stop)
+            if document:
+                document.title = f"Man page for {command}"
+            return document
+        if source == "help":
+            help_output = self.get_help_output(command, cancel=stop)
+            if help_output:
+                return Document.from_text(f"Help for {command}", help_output)
+            return None
+        if source == "online":
+            page = self.get_online_docs(command)
+            if page:
+                return Document(
+                    f"Online documentation for {command}",
+                    page,
+                    [Section("", 0, len(page))],
+                )
+        return None
+
+    def search(self, query: str, limit: int = 20) -> list[dict]:
+        """Ranks installed commands against a free-text query; see
+        :meth:`core.search_index.SearchIndex.search`."""
+        return self.search_index.search(query, limit)
+
+    def _sources(self) -> list[str]:
+        return [
+            source
+            for source in self._setting("doc_sources", DEFAULT_DOC_SOURCES)
+            if source in DEFAULT_DOC_SOURCES
+        ]
+
+    def uses_help(self, command: str) -> bool:
+        """
+        Whether looking up ``command`` runs ``<command> --help``.
+
+        That executes the command itself, so in ``first-wins`` mode it is
+        skipped when a man page, which ranks ahead of it, is installed.
+        """
+        sources = self._sources()
+        if "help" not in sources:
+            return False
+        if self._setting("doc_mode", FIRST_WINS) == GATHER_ALL:
+            return True
+        if "man" in sources and sources.index("man") < sources.index("help"):
+            return self.man_index.locate(command) is None
+        return True
+
+    def get_documentation(
+        self, command: str, cancel=None, on_result=None, run_help=True
+    ) -> Document | None:
+        """
+        Retrieves documentation for a command from all configured sources at once.
+
+        Sources listed in ``doc_sources`` are queried concurrently, each
+        bounded by its entry in ``doc_source_timeouts``. In ``first-wins``
+        mode the first source in ``doc_sources`` order that produced
+        documentation is returned as soon as every source ahead of it has
+        answered or timed out; the remaining sources are abandoned. In
+        ``gather-all`` mode every source is waited for and ``on_result`` is
+        called as each one completes.
+
+        Args:
+            command: The command to document.
+            cancel: Optional ``threading.Event``; once set, the lookup is
+                abandoned and None is returned.
+            on_result: Optional ``on_result(source, document)`` callback used in
+                ``gather-all`` mode. It runs on the calling thread.
+            run_help: Whether the ``help`` source may run the command, when
+                :meth:`uses_help` says it's needed; prefetching passes False.
+
+        Returns:
+            The documentation from the highest-priority source that had any.
+        """
+        sources = self._sources()
+        if "help" in sources and not (run_help and self.uses_help(command)):
+            sources.remove("help")
+        gather_all = self._setting("doc_mode", FIRST_WINS) == GATHER_ALL
+        timeouts = dict(DEFAULT_SOURCE_TIMEOUTS)
+        timeouts.update(self._setting("doc_source_timeouts", {}) or {})
+
+        # One event per source, so a source that misses its deadline has its
+        # subprocess killed while the others carry on.
+        stops = {source: threading.Event() for source in sources}
+        start = time.monotonic()
+        pending = {
+            source: self.executor.submit(self._fetch, source, command, stops[source])
+            for source in sources
+        }
+        deadlines = {source: start + timeouts.get(source, 5.0) for source in sources}
+        results = {}
+        try:
+            while pending:
+                if cancel is not None and cancel.is_set():
+                    return None
+                now = time.monotonic()
+                for source, future in list(pending.items()):
+                    if future.done():
+                        try:
+                            results[source] = future.result()
+                        except Exception:
+                            results[source] = None
+                        del pending[source]
+                        if gather_all and results[source] and on_result:
+                            on_result(source, results[source])
+                    elif now >= deadlines[source]:
+                        stops[source].set()
+                        results[source] = None
+                        del pending[source]
+                if not gather_all:
+                    for source in sources:
+                        if source not in results:
+                            break
+                        if results[source]:
+                            return results[source]
+                if pending:
+                    timeout = min(deadlines[source] for source in pending) - now
+                    # Wake up regularly to notice cancellation.
+                    wait(
+                        pending.values(),
+                        timeout=min(max(timeout, 0), 0.1),
+                        return_when=FIRST_COMPLETED,
+                    )
+        finally:
+            for stop in stops.values():
+                stop.set()
 
-        help_output = get_help_output(command)
-        if help_output:
-            return format_documentation(f"Help for {command}", help_output)
+        for source in sources:
+            if results.get(source):
+                return results[source]
+        return Document.from_text(command, f"No documentation found for {command}")
 
-        return f"No documentation found for {command}"
+    def close(self):
+        """Stops background work; called when the application quits."""
+        self.search_index.close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.http_client.close()
@@ -0,0 +1,95 @@
+import html
+import json
+import re
+
+# Sections shown as soon as a document arrives; the rest are laid out on demand.
+LEAD_SECTIONS = ("NAME", "SYNOPSIS")
+
+_HEADING_RE = re.compile(r"<h2>(.*?)</h2>", re.S)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+class Section:
+    """A top-level section of a document: its heading and its span of the HTML."""
+
+    __slots__ = ("name", "start", "end")
+
+    def __init__(self, name: str, start: int, end: int):
+        self.name = name
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"Section({self.name!r}, {self.start}, {self.end})"
+
+
+class Document:
+    """
+    Rendered documentation split into its top-level sections.
+
+    The HTML is kept as one string; sections are ``[start, end)`` offsets into
+    it, so individual sections can be laid out lazily without re-rendering.
+    Content before the first heading forms a section with an empty name.
+    """
+
+    def __init__(self, title: str, fragment: str, sections: list[Section]):
+        self.title = title
+        self.html = fragment
+        self.sections = sections
+
+    @classmethod
+    def from_html(cls, title: str, fragment: str) -> "Document":
+        """Splits an HTML fragment at its ``<h2>`` headings."""
+        sections = []
+        start = 0
+        name = ""
+        for match in _HEADING_RE.finditer(fragment):
+            if match.start() > start:
+                sections.append(Section(name, start, match.start()))
+            heading = html.unescape(_TAG_RE.sub("", match.group(1)))
+            name = " ".join(heading.split()).upper()
+            start = match.start()
+        sections.append(Section(name, start, len(fragment)))
+        return cls(title, fragment, sections)
+
+    @classmethod
+    def from_text(cls, title: str, text: str) -> "Document":
+        """Wraps plain text, such as ``--help`` output, as a single section."""
+        fragment = f"<pre>{html.escape(text, quote=False)}</pre>"
+        return cls(title, fragment, [Section("", 0, len(fragment))])
+
+    def section_html(self, index: int) -> str:
+        section = self.sections[index]
+        return self.html[section.start : section.end]
+
+    def find(self, name: str) -> int | None:
+        """Returns the index of the section called ``name``, if any."""
+        name = name.upper()
+        for index, section in enumerate(self.sections):
+            if section.name == name:
+                return index
+        return None
+
+    def lead_count(self) -> int:
+        """How many leading sections to show before laying out the rest lazily."""
+        count = 0
+        for section in self.sections:
+            if section.name and section.name not in LEAD_SECTIONS:
+                break
+            count += 1
+        return max(count, 1)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "title": self.title,
+                "html": self.html,
+                "sections": [[s.name, s.start, s.end] for s in self.sections],
+            }
+        )
+
+    @classmethod
+    def from_json(cls, data: str) -> "Document":
+        fields = json.loads(data)
+        sections = [Section(*entry) for entry in fields["sections"]]
+        return cls(fields["title"], fields["html"], sections)
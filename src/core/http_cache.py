@@ -0,0 +1,311 @@
+import email.utils
+import json
+import os
+import sqlite3
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import get_encoding_from_headers
+from core.doc_cache import default_cache_dir
+
+SCHEMA_VERSION = 1
+
+# (connect, read) timeouts in seconds.
+DEFAULT_TIMEOUT = (3.05, 10.0)
+
+# Cap on the heuristic freshness given to responses that only carry a
+# Last-Modified header (RFC 7234, section 4.2.2).
+MAX_HEURISTIC_FRESHNESS = 24 * 60 * 60
+
+# Headers a 304 response may not update (RFC 7234, section 4.3.4).
+_CONTENT_HEADERS = {"content-encoding", "content-length", "content-type"}
+
+
+def _parse_http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def parse_cache_control(value: str | None) -> dict[str, str | None]:
+    """Parses a Cache-Control header into ``{directive: argument}``."""
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _seconds(value: str | None) -> int | None:
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: dict[str, str]) -> float:
+    """How long a response may be served from cache without revalidation."""
+    directives = parse_cache_control(headers.get("cache-control"))
+    if "no-cache" in directives:
+        return 0.0
+    max_age = _seconds(directives.get("max-age"))
+    if max_age is not None:
+        return float(max_age)
+    date = _parse_http_date(headers.get("date"))
+    expires = headers.get("expires")
+    if expires is not None:
+        expires_at = _parse_http_date(expires)
+        if expires_at is None or date is None:
+            return 0.0
+        return max(expires_at - date, 0.0)
+    last_modified = _parse_http_date(headers.get("last-modified"))
+    if date is not None and last_modified is not None:
+        return min(max(date - last_modified, 0.0) * 0.1, MAX_HEURISTIC_FRESHNESS)
+    return 0.0
+
+
+def current_age(headers: dict[str, str], request_time: float, response_time: float):
+    """The age of a stored response now (RFC 7234, section 4.2.3)."""
+    date = _parse_http_date(headers.get("date")) or response_time
+    apparent_age = max(response_time - date, 0.0)
+    age_value = _seconds(headers.get("age")) or 0
+    response_delay = response_time - request_time
+    corrected_initial_age = max(apparent_age, age_value + response_delay)
+    return corrected_initial_age + (time.time() - response_time)
+
+
+def is_storable(status: int, headers: dict[str, str]) -> bool:
+    directives = parse_cache_control(headers.get("cache-control"))
+    if "no-store" in directives:
+        return False
+    # Entries are keyed by URL alone, so a response that varies on request
+    # headers can't be matched. Accept-Encoding is safe: the session always
+    # sends the same one and bodies are stored decoded.
+    varies = {name.strip().lower() for name in headers.get("vary", "").split(",")}
+    if varies - {"", "accept-encoding"}:
+        return False
+    return status == 200
+
+
+class CachedResponse:
+    __slots__ = ("url", "status", "headers", "body", "request_time", "response_time")
+
+    def __init__(self, url, status, headers, body, request_time, response_time):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.request_time = request_time
+        self.response_time = response_time
+
+    def is_fresh(self) -> bool:
+        age = current_age(self.headers, self.request_time, self.response_time)
+        return age < freshness_lifetime(self.headers)
+
+    def may_serve_stale(self) -> bool:
+        """Whether this may stand in for a response the server failed to give."""
+        directives = parse_cache_control(self.headers.get("cache-control"))
+        return "must-revalidate" not in directives and "no-cache" not in directives
+
+    def text(self) -> str:
+        encoding = get_encoding_from_headers(self.headers) or "utf-8"
+        try:
+            return self.body.decode(encoding, errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+
+class HttpCache:
+    """
+    Private on-disk HTTP cache of GET responses, keyed by URL.
+
+    Any SQLite error disables the cache rather than failing the request.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.path.join(default_cache_dir(), "http.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = None
+        try:
+            self._conn = self._open()
+        except (OSError, sqlite3.Error):
+            self._conn = None
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS responses")
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY,"
+            " status INTEGER NOT NULL,"
+            " headers TEXT NOT NULL,"
+            " body BLOB NOT NULL,"
+            " request_time REAL NOT NULL,"
+            " response_time REAL NOT NULL)"
+        )
+        conn.commit()
+        return conn
+
+    def get(self, url: str) -> CachedResponse | None:
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT status, headers, body, request_time, response_time"
+                    " FROM responses WHERE url = ?",
+                    (url,),
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        status, headers, body, request_time, response_time = row
+        return CachedResponse(
+            url, status, json.loads(headers), body, request_time, response_time
+        )
+
+    def put(self, response: CachedResponse):
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses"
+                    " (url, status, headers, body, request_time, response_time)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        response.url,
+                        response.status,
+                        json.dumps(response.headers),
+                        response.body,
+                        response.request_time,
+                        response.response_time,
+                    ),
+                )
+                self._conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def delete(self, url: str):
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                self._conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+
+class HttpClient:
+    """
+    Shared HTTP client for online documentation.
+
+    Connections are pooled and kept alive across requests, responses may be
+    compressed in transit, and GET responses are cached on disk following
+    RFC 7234: fresh entries are served without touching the network, stale
+    ones are revalidated with If-None-Match / If-Modified-Since, and a stale
+    entry is served if revalidation fails, unless it was marked
+    must-revalidate or no-cache.
+    """
+
+    def __init__(
+        self,
+        cache: HttpCache | None = None,
+        timeout=DEFAULT_TIMEOUT,
+        session: requests.Session | None = None,
+        pool_size: int = 8,
+    ):
+        self.cache = cache
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        session.headers["Accept-Encoding"] = "gzip, deflate"
+        self.session = session
+
+    def get_text(self, url: str) -> str | None:
+        """
+        Fetches ``url`` and returns its body as text.
+
+        Returns:
+            The body, or None if the request failed and nothing usable was
+            cached.
+        """
+        cached = self.cache.get(url) if self.cache is not None else None
+        if cached is not None and cached.is_fresh():
+            return cached.text()
+
+        headers = {}
+        if cached is not None:
+            if "etag" in cached.headers:
+                headers["If-None-Match"] = cached.headers["etag"]
+            if "last-modified" in cached.headers:
+                headers["If-Modified-Since"] = cached.headers["last-modified"]
+
+        request_time = time.time()
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.exceptions.RequestException:
+            if cached is not None and cached.may_serve_stale():
+                return cached.text()
+            return None
+        response_time = time.time()
+        response_headers = {k.lower(): v for k, v in response.headers.items()}
+
+        if response.status_code == 304 and cached is not None:
+            for name, value in response_headers.items():
+                if name not in _CONTENT_HEADERS:
+                    cached.headers[name] = value
+            cached.request_time = request_time
+            cached.response_time = response_time
+            self.cache.put(cached)
+            return cached.text()
+
+        if response.status_code >= 500 and cached is not None:
+            return cached.text() if cached.may_serve_stale() else None
+        if not response.ok:
+            return None
+
+        # requests already undid any Content-Encoding, so store the plain body.
+        response_headers.pop("content-encoding", None)
+        response_headers.pop("content-length", None)
+        stored = CachedResponse(
+            url,
+            response.status_code,
+            response_headers,
+            response.content,
+            request_time,
+            response_time,
+        )
+        if self.cache is not None:
+            if is_storable(response.status_code, response_headers):
+                self.cache.put(stored)
+            elif cached is not None:
+                self.cache.delete(url)
+        return stored.text()
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,180 @@
+import os
+import threading
+import time
+
+DEFAULT_MANPATH = [
+    "/usr/local/share/man",
+    "/usr/share/man",
+    "/usr/local/man",
+    "/usr/man",
+]
+
+# Same search order man-db uses by default.
+SECTION_ORDER = ["1", "n", "l", "8", "3", "0", "2", "5", "4", "9", "6", "7"]
+
+COMPRESSION_SUFFIXES = (".gz", ".xz", ".bz2", ".zst")
+
+
+def get_manpath() -> list[str]:
+    """
+    Returns the directories searched for man pages.
+
+    Honours ``$MANPATH``; an empty element (``::`` or a leading/trailing
+    colon) splices in the default directories, as with man-db.
+
+    Returns:
+        Existing man page root directories, in search order.
+    """
+    env = os.environ.get("MANPATH")
+    if env is None:
+        candidates = DEFAULT_MANPATH
+    else:
+        candidates = []
+        for entry in env.split(":"):
+            if entry:
+                candidates.append(entry)
+            else:
+                candidates.extend(DEFAULT_MANPATH)
+
+    roots = []
+    for path in candidates:
+        if path not in roots and os.path.isdir(path):
+            roots.append(path)
+    return roots
+
+
+def _locale_roots(root: str) -> list[str]:
+    """Localised subdirectories of ``root`` to search before ``root`` itself."""
+    lang = (
+        os.environ.get("LC_ALL")
+        or os.environ.get("LC_MESSAGES")
+        or os.environ.get("LANG")
+    )
+    roots = []
+    if lang and lang not in ("C", "POSIX") and not lang.startswith("C."):
+        full = lang.split("@")[0]
+        for name in (full, full.split(".")[0], full.split("_")[0]):
+            path = os.path.join(root, name)
+            if path not in roots and os.path.isdir(path):
+                roots.append(path)
+    roots.append(root)
+    return roots
+
+
+def split_page_name(filename: str) -> tuple[str, str, str] | None:
+    """
+    Splits a man page file name into its parts.
+
+    Args:
+        filename: A file name such as ``ls.1.gz`` or ``openssl-ca.1ssl``.
+
+    Returns:
+        A ``(name, section, compression)`` tuple, or None if the name does not
+        look like a man page.
+    """
+    compression = ""
+    for suffix in COMPRESSION_SUFFIXES:
+        if filename.endswith(suffix):
+            compression = suffix
+            filename = filename[: -len(suffix)]
+            break
+    name, dot, section = filename.rpartition(".")
+    if not dot or not name or not section:
+        return None
+    return name, section, compression
+
+
+class ManPageIndex:
+    """
+    In-memory map from page name to man page file, built by listing the
+    ``man<section>`` directories under each MANPATH root.
+
+    A directory is only re-listed when its mtime changes, and mtimes are only
+    checked every ``recheck_interval`` seconds, so most lookups cost no
+    system calls at all.
+    """
+
+    def __init__(self, manpath=None, recheck_interval=30.0):
+        self.manpath = manpath
+        self.recheck_interval = recheck_interval
+        self._lock = threading.Lock()
+        self._dirs = {}
+        self._order = []
+        self._last_check = 0.0
+
+    def _section_dirs(self):
+        roots = self.manpath if self.manpath is not None else get_manpath()
+        dirs = []
+        for root in roots:
+            for base in _locale_roots(root):
+                for section in SECTION_ORDER:
+                    path = os.path.join(base, f"man{section}")
+                    if os.path.isdir(path):
+                        dirs.append((path, section))
+        return dirs
+
+    def _scan(self, path, section):
+        pages = {}
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    parts = split_page_name(entry.name)
+                    if parts is None:
+                        continue
+                    name, page_section, _ = parts
+                    # Prefer "ls.1" over "ls.1posix" inside man1.
+                    if name not in pages or page_section == section:
+                        pages[name] = entry.path
+        except OSError:
+            pass
+        return pages
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._order and now - self._last_check < self.recheck_interval:
+            return
+        self._last_check = now
+
+        order = []
+        for path, section in self._section_dirs():
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            cached = self._dirs.get(path)
+            if cached is None or cached[0] != mtime:
+                self._dirs[path] = (mtime, self._scan(path, section))
+            order.append(path)
+        self._order = order
+
+    def locate(self, command: str) -> str | None:
+        """
+        Finds the file ``man <command>`` would most likely display.
+
+        Args:
+            command: The page name.
+
+        Returns:
+            The path of the page source, or None if no page was found.
+        """
+        with self._lock:
+            self._refresh()
+            for path in self._order:
+                page = self._dirs[path][1].get(command)
+                if page is not None:
+                    return page
+        return None
+
+    def pages(self) -> dict[str, str]:
+        """
+        Lists every page name with the file :meth:`locate` would return for it.
+
+        Returns:
+            A mapping from page name to page source path.
+        """
+        with self._lock:
+            self._refresh()
+            pages = {}
+            for path in reversed(self._order):
+                pages.update(self._dirs[path][1])
+        return pages
@@ -0,0 +1,152 @@
+import Xlib.display
+import Xlib.error
+import Xlib.ext.screensaver
+from PyQt6.QtCore import QObject, QSocketNotifier, QTimer, pyqtSignal
+
+IDLE_TIMEOUT = 300.0
+IDLE_POLL_INTERVAL = 1.0
+
+HIDDEN = "hidden"
+IDLE = "idle"
+SCREENSAVER = "screensaver"
+
+
+class IdleMonitor(QObject):
+    """
+    Tells when the user has gone idle, from the X screensaver extension.
+
+    While the user is active, the server's idle time is checked only when
+    ``timeout`` could first have been reached, so an active session costs
+    one round-trip per ``timeout``. Once idle, it is checked every
+    ``IDLE_POLL_INTERVAL`` to catch the first input, and :meth:`poke` ends
+    idleness at once when activity is seen some other way. The screensaver
+    turning on or off, which is also how most lockers blank the screen,
+    arrives as an event.
+
+    Uses its own connection to the X server; without the extension it
+    never reports idle.
+    """
+
+    idle_changed = pyqtSignal(bool)
+    screensaver_changed = pyqtSignal(bool)
+
+    def __init__(self, timeout=IDLE_TIMEOUT, display=None, parent=None):
+        super().__init__(parent)
+        self.timeout = timeout
+        self.idle = False
+        self.screensaver_active = False
+        self.notifier = None
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.check)
+
+        self.display = display or Xlib.display.Display()
+        self.root = self.display.screen().root
+        self.available = self.display.has_extension("MIT-SCREEN-SAVER")
+        if not self.available:
+            return
+        self.root.screensaver_select_input(Xlib.ext.screensaver.NotifyMask)
+        self.display.flush()
+        self.notifier = QSocketNotifier(
+            self.display.fileno(), QSocketNotifier.Type.Read, self
+        )
+        self.notifier.activated.connect(self.process_events)
+        self.check()
+
+    def check(self):
+        """Re-reads the idle time and schedules the next check."""
+        if not self.available:
+            return
+        try:
+            idle = self.root.screensaver_query_info().idle / 1000
+        except Xlib.error.XError:
+            return
+        self._set_idle(idle >= self.timeout)
+        interval = IDLE_POLL_INTERVAL if self.idle else self.timeout - idle
+        self.timer.start(max(int(interval * 1000), 100))
+
+    def poke(self):
+        """Activity was seen some other way, e.g. focus moved: the user is back."""
+        self._set_idle(False)
+        if self.available:
+            self.timer.start(int(self.timeout * 1000))
+
+    def process_events(self, *args):
+        while self.display.pending_events():
+            event = self.display.next_event()
+            if not isinstance(event, Xlib.ext.screensaver.Notify):
+                continue
+            if event.state == Xlib.ext.screensaver.StateCycle:
+                continue
+            active = event.state == Xlib.ext.screensaver.StateOn
+            if active != self.screensaver_active:
+                self.screensaver_active = active
+                self.screensaver_changed.emit(active)
+            if not active:
+                self.check()
+
+    def _set_idle(self, idle):
+        if idle != self.idle:
+            self.idle = idle
+            self.idle_changed.emit(idle)
+
+    def close(self):
+        self.timer.stop()
+        if self.notifier is not None:
+            self.notifier.setEnabled(False)
+            self.notifier = None
+        self.display.close()
+
+
+class PowerManager(QObject):
+    """
+    Suspends detection and prefetching while their results can't be seen.
+
+    Work is suspended while any reason holds: the panel is hidden
+    (``HIDDEN``), the user is idle (``IDLE``) or the screensaver is on
+    (``SCREENSAVER``). A suspended detector keeps listening, so focus moving
+    clears ``IDLE`` straight away, and resuming brings it up to date in one
+    batch.
+    """
+
+    suspended_changed = pyqtSignal(bool)
+
+    def __init__(self, detector, doc_loader=None, parent=None):
+        super().__init__(parent)
+        self.detector = detector
+        self.doc_loader = doc_loader
+        self.idle_monitor = None
+        self.reasons = set()
+        detector.activity.connect(self._on_activity)
+
+    @property
+    def suspended(self) -> bool:
+        return bool(self.reasons)
+
+    def watch_idle(self, idle_monitor: IdleMonitor):
+        self.idle_monitor = idle_monitor
+        idle_monitor.idle_changed.connect(lambda idle: self.set_reason(IDLE, idle))
+        idle_monitor.screensaver_changed.connect(
+            lambda active: self.set_reason(SCREENSAVER, active)
+        )
+        self.set_reason(IDLE, idle_monitor.idle)
+        self.set_reason(SCREENSAVER, idle_monitor.screensaver_active)
+
+    def set_reason(self, reason: str, active: bool):
+        """Adds or removes a reason to suspend, acting if that changes anything."""
+        was_suspended = self.suspended
+        if active:
+            self.reasons.add(reason)
+        else:
+            self.reasons.discard(reason)
+        if self.suspended == was_suspended:
+            return
+        self.detector.set_suspended(self.suspended)
+        if self.suspended and self.doc_loader is not None:
+            self.doc_loader.cancel_prefetch()
+        self.suspended_changed.emit(self.suspended)
+
+    def _on_activity(self):
+        self.set_reason(IDLE, False)
+        if self.idle_monitor is not None:
+            self.idle_monitor.poke()
@@ -0,0 +1,180 @@
+import os
+
+PROC = "/proc"
+
+
+class ProcessInfo:
+    """The fields of ``/proc/<pid>/stat`` the process tree needs."""
+
+    __slots__ = ("pid", "ppid", "comm", "session", "tty_nr", "tpgid", "start_time")
+
+    def __init__(
+        self,
+        pid: int,
+        ppid: int,
+        comm: str,
+        session: int,
+        tty_nr: int,
+        tpgid: int,
+        start_time: int,
+    ):
+        self.pid = pid
+        self.ppid = ppid
+        self.comm = comm
+        self.session = session
+        self.tty_nr = tty_nr
+        self.tpgid = tpgid
+        self.start_time = start_time
+
+    def __repr__(self):
+        return f"ProcessInfo({self.pid}, ppid={self.ppid}, comm={self.comm!r})"
+
+
+def read_stat(pid: int, proc: str = PROC) -> ProcessInfo | None:
+    """Parses ``/proc/<pid>/stat``, or returns None if the process is gone."""
+    try:
+        with open(f"{proc}/{pid}/stat", "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    # comm is in parentheses and may itself contain spaces and parentheses,
+    # so the fields after it are found from the last closing parenthesis.
+    open_paren = data.find(b"(")
+    close_paren = data.rfind(b")")
+    if open_paren < 0 or close_paren < 0:
+        return None
+    comm = data[open_paren + 1 : close_paren].decode(errors="replace")
+    fields = data[close_paren + 2 :].split()
+    try:
+        # fields[0] is field 3 (state), so field N of proc(5) is fields[N - 3].
+        return ProcessInfo(
+            pid,
+            int(fields[1]),
+            comm,
+            int(fields[3]),
+            int(fields[4]),
+            int(fields[5]),
+            int(fields[19]),
+        )
+    except (IndexError, ValueError):
+        return None
+
+
+class ProcessTree:
+    """
+    In-memory index of the process tree, built from ``/proc/*/stat``.
+
+    :meth:`refresh` lists ``/proc`` and only reads ``stat`` for PIDs that
+    appeared since the last refresh, dropping the ones that went away, so
+    keeping the index current costs one directory listing when nothing has
+    started or exited. Fields that change over a process's life, such as
+    ``comm`` after an exec or ``tpgid``, are as of that first read; call
+    :meth:`update` for the processes a lookup relies on.
+    """
+
+    def __init__(self, proc: str = PROC):
+        self.proc = proc
+        self._processes = {}
+        self._children = {}
+
+    def refresh(self):
+        try:
+            current = {int(name) for name in os.listdir(self.proc) if name.isdigit()}
+        except OSError:
+            return
+        known = self._processes.keys()
+        for pid in known - current:
+            self._remove(pid)
+        for pid in current - known:
+            info = read_stat(pid, self.proc)
+            if info is not None:
+                self._add(info)
+
+    def update(self, pid: int) -> ProcessInfo | None:
+        """
+        Re-reads ``pid``'s ``stat`` into the index and returns it, or None if
+        the process is gone.
+
+        A PID whose ``start_time`` changed belongs to a new process: the old
+        one's children are re-read too, as they now have another parent.
+        """
+        info = read_stat(pid, self.proc)
+        old = self._processes.get(pid)
+        if old is not None:
+            self._remove(pid)
+        if info is not None:
+            self._add(info)
+        if old is not None and (info is None or info.start_time != old.start_time):
+            for child in self.children(pid):
+                self.update(child)
+        return info
+
+    def _add(self, info: ProcessInfo):
+        self._processes[info.pid] = info
+        self._children.setdefault(info.ppid, set()).add(info.pid)
+
+    def _remove(self, pid: int):
+        info = self._processes.pop(pid)
+        siblings = self._children.get(info.ppid)
+        if siblings is not None:
+            siblings.discard(pid)
+            if not siblings:
+                del self._children[info.ppid]
+
+    def get(self, pid: int) -> ProcessInfo | None:
+        return self._processes.get(pid)
+
+    def pids(self) -> list[int]:
+        return list(self._processes)
+
+    def __contains__(self, pid: int) -> bool:
+        return pid in self._processes
+
+    def __len__(self) -> int:
+        return len(self._processes)
+
+    def children(self, pid: int) -> list[int]:
+        """Direct children of ``pid``, in ascending PID order like ``pgrep -P``."""
+        return sorted(self._children.get(pid, ()))
+
+    def descendants(self, pid: int) -> list[int]:
+        """Every process below ``pid``, breadth first."""
+        result = []
+        queue = self.children(pid)
+        while queue:
+            child = queue.pop(0)
+            result.append(child)
+            queue.extend(self.children(child))
+        return result
+
+    def cmdline(self, pid: int) -> str | None:
+        """The command line of ``pid`` with arguments joined by spaces."""
+        try:
+            with open(f"{self.proc}/{pid}/cmdline", "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        return data.decode(errors="replace").replace("\x00", " ").strip()
+
+    def argv(self, pid: int) -> list[str]:
+        """The arguments of ``pid``, or an empty list if it is gone."""
+        try:
+            with open(f"{self.proc}/{pid}/cmdline", "rb") as f:
+                data = f.read()
+        except OSError:
+            return []
+        return [arg.decode(errors="replace") for arg in data.split(b"\0") if arg]
+
+    def environ(self, pid: int) -> dict[str, str]:
+        """The environment ``pid`` started with, if it is readable."""
+        try:
+            with open(f"{self.proc}/{pid}/environ", "rb") as f:
+                data = f.read()
+        except OSError:
+            return {}
+        env = {}
+        for entry in data.split(b"\0"):
+            name, sep, value = entry.decode(errors="replace").partition("=")
+            if sep:
+                env[name] = value
+        return env
@@ -0,0 +1,1478 @@
+import bz2
+import html
+import lzma
+import mmap
+import os
+import zlib
+
+try:
+    from compression import zstd as _zstd  # Python 3.14+
+except ImportError:
+    try:
+        import zstandard as _zstd
+    except ImportError:
+        _zstd = None
+
+
+INDENT_PX = 24
+MAX_UNKNOWN_REQUESTS = 25
+MAX_MACRO_DEPTH = 20
+MAX_SO_DEPTH = 5
+# Page files this small may be a ``.so`` redirection to another page.
+SO_STUB_MAX_SIZE = 512
+
+# fmt: off
+GLYPHS = {
+    "em": "—", "en": "–", "hy": "-", "mi": "-", "aq": "'", "dq": '"',
+    "lq": "“", "rq": "”", "oq": "‘", "cq": "’", "ga": "`", "aa": "´",
+    "ha": "^", "ti": "~", "bu": "•", "co": "©", "rg": "®", "tm": "™",
+    "de": "°", "+-": "±", "mu": "×", "di": "÷", "<=": "≤", ">=": "≥",
+    "!=": "≠", "==": "≡", "->": "→", "<-": "←", "<>": "↔", "ua": "↑",
+    "da": "↓", "rA": "⇒", "lA": "⇐", "sl": "/", "rs": "\\", "ba": "|",
+    "br": "|", "or": "|", "bv": "|", "sc": "§", "ps": "¶", "dg": "†",
+    "dd": "‡", "Fo": "«", "Fc": "»", "fo": "‹", "fc": "›", "12": "½",
+    "14": "¼", "34": "¾", "ss": "ß", "ae": "æ", "AE": "Æ", "oe": "œ",
+    "OE": "Œ", "o/": "ø", "O/": "Ø", "la": "⟨", "ra": "⟩", "lB": "[",
+    "rB": "]", "lC": "{", "rC": "}", "at": "@", "sh": "#", "Do": "$",
+    "ct": "¢", "Po": "£", "Ye": "¥", "Eu": "€", "eu": "€", "ul": "_",
+    "ru": "_", "pl": "+", "eq": "=", "**": "*", "if": "∞", "sr": "√",
+    "pd": "∂", "no": "¬", "tf": "∴", "ap": "~", "fm": "′", "sd": "″",
+    "r!": "¡", "r?": "¿",
+}
+ACCENTS = {"'": "́", "`": "̀", ":": "̈", "^": "̂", "~": "̃", ",": "̧"}
+GREEK = ("abgdezyhiklmncoprstufxqw", "αβγδεζηθικλμνξοπρστυφχψω")
+
+FONTS = {
+    "R": "R", "1": "R", "B": "B", "3": "B", "I": "I", "2": "I", "BI": "BI",
+    "4": "BI", "CW": "R", "CR": "R", "C": "R", "CB": "B", "CI": "I",
+    "TR": "R", "TB": "B", "TI": "I", "TBI": "BI", "HR": "R", "HB": "B",
+    "HI": "I", "L": "R",
+}
+
+DEFAULT_STRINGS = {"lq": "“", "rq": "”", "R": "®", "Tm": "™", "aq": "'", ".T": "utf8"}
+
+MDOC_CALLABLE = {
+    "Ac", "Ad", "An", "Ao", "Ap", "Aq", "Ar", "At", "Bc", "Bo", "Bq", "Brc",
+    "Bro", "Brq", "Bsx", "Bx", "Cd", "Cm", "Dc", "Do", "Dq", "Dv", "Dx", "Em",
+    "Er", "Es", "Ev", "Fa", "Fl", "Fn", "Ft", "Fx", "Ic", "In", "Li", "Lk",
+    "Ms", "Mt", "Nm", "No", "Ns", "Nx", "Oc", "Oo", "Op", "Ox", "Pa", "Pc",
+    "Pf", "Po", "Pq", "Qc", "Ql", "Qo", "Qq", "Sc", "So", "Sq", "St", "Sx",
+    "Sy", "Ta", "Tn", "Ux", "Va", "Vt", "Xc", "Xo", "Xr",
+}
+MDOC_ENCLOSURES = {
+    "Aq": ("⟨", "⟩"), "Bq": ("[", "]"), "Brq": ("{", "}"), "Dq": ("“", "”"),
+    "Op": ("[", "]"), "Pq": ("(", ")"), "Ql": ("‘", "’"), "Qq": ('"', '"'),
+    "Sq": ("‘", "’"),
+}
+MDOC_OPEN = {"Ao": "⟨", "Bo": "[", "Bro": "{", "Do": "“", "Oo": "[", "Po": "(", "Qo": '"', "So": "‘"}
+MDOC_CLOSE = {"Ac": "⟩", "Bc": "]", "Brc": "}", "Dc": "”", "Oc": "]", "Pc": ")", "Qc": '"', "Sc": "’"}
+MDOC_FONTS = {
+    "Ad": "I", "Ar": "I", "Cd": "B", "Cm": "B", "Dv": "R", "Em": "I",
+    "Er": "R", "Ev": "R", "Fa": "I", "Ft": "I", "Ic": "B", "Li": "R",
+    "Lk": "I", "Ms": "B", "Mt": "I", "No": "R", "Pa": "I", "Sx": "R",
+    "Sy": "B", "Tn": "R", "Va": "I", "Vt": "I",
+}
+MDOC_OS = {
+    "At": "AT&T UNIX", "Bsx": "BSD/OS", "Bx": "BSD", "Dx": "DragonFly",
+    "Fx": "FreeBSD", "Nx": "NetBSD", "Ox": "OpenBSD", "Ux": "UNIX",
+}
+MDOC_STANDARDS = {
+    "-p1003.1": "IEEE Std 1003.1 (“POSIX.1”)",
+    "-p1003.1-2001": "IEEE Std 1003.1-2001 (“POSIX.1”)",
+    "-p1003.1-2008": "IEEE Std 1003.1-2008 (“POSIX.1”)",
+    "-p1003.2": "IEEE Std 1003.2 (“POSIX.2”)",
+    "-isoC": "ISO/IEC 9899:1990 (“ISO C90”)",
+    "-isoC-99": "ISO/IEC 9899:1999 (“ISO C99”)",
+    "-isoC-2011": "ISO/IEC 9899:2011 (“ISO C11”)",
+    "-susv2": "Version 2 of the Single UNIX Specification (“SUSv2”)",
+    "-susv3": "Version 3 of the Single UNIX Specification (“SUSv3”)",
+    "-susv4": "Version 4 of the Single UNIX Specification (“SUSv4”)",
+    "-xpg4": "X/Open Portability Guide Issue 4 (“XPG4”)",
+}
+MDOC_LIST_TYPES = {
+    "tag", "hang", "ohang", "inset", "diag", "bullet", "dash", "hyphen",
+    "enum", "item", "column",
+}
+CLOSE_PUNCT = {".", ",", ":", ";", ")", "]", "?", "!"}
+OPEN_PUNCT = {"(", "["}
+
+# Requests that only affect typesetting details we do not reproduce.
+IGNORED_REQUESTS = {
+    "ad", "na", "hy", "nh", "ne", "ll", "lt", "ta", "ps", "vs", "ss", "cs",
+    "hw", "hc", "ev", "pc", "ns", "rs", "mk", "rt", "fl", "lf", "tm", "ab",
+    "ex", "ch", "wh", "it", "po", "pl", "bp", "em", "cu", "ul", "tr", "ftr",
+    "fam", "char", "warn", "in", "PD", "DT", "AT", "UC", "IX", "hym", "hla",
+    "kern", "lg", "nm", "nn", "pvs", "sty", "fp", "fspecial", "fschar",
+    "rchar", "schar", "tkf", "uf", "vpt", "linetabs", "cflags", "shc", "Dd",
+    "Os", "Bk", "Ek", "Db", "Tg", "Sm", "Ud", "Lb", "rn", "als", "nroff",
+    "troff", "blm", "lsm", "ecs", "ecr", "LO", "Vb", "Ve", "Sp", "hcode",
+    "mso", "open", "opena", "write", "close", "aln", "rj", "ami", "dei",
+}
+# Requests that need a preprocessor or change how input is parsed.
+UNSUPPORTED_REQUESTS = {"EQ", "PS", "GS", "G1", "cc", "c2", "ec", "eo", "so", "nx", "rd", "pso"}
+# fmt: on
+
+
+class UnsupportedRoff(Exception):
+    """Raised for pages that need preprocessors or features we do not emulate."""
+
+
+def _zstd_decompress(data) -> bytes:
+    if _zstd is None:
+        raise UnsupportedRoff("zstd support is not available")
+    if _zstd.__name__ == "zstandard":
+        return _zstd.ZstdDecompressor().decompressobj().decompress(data)
+    return _zstd.decompress(data)
+
+
+def _decompress(path: str, data) -> bytes:
+    if path.endswith(".gz"):
+        return zlib.decompress(data, wbits=47)
+    if path.endswith(".xz"):
+        return lzma.decompress(data)
+    if path.endswith(".bz2"):
+        return bz2.decompress(data)
+    if path.endswith(".zst"):
+        return _zstd_decompress(data)
+    return bytes(data)
+
+
+def read_man_source(path: str) -> str:
+    """
+    Reads a man page source file, decompressing it if needed.
+
+    The file is memory-mapped so the compressed bytes are handed straight to
+    the decompressor without an intermediate copy.
+
+    Args:
+        path: The page file, optionally ending in .gz, .xz, .bz2 or .zst.
+
+    Returns:
+        The roff source as text.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            try:
+                data = _decompress(path, mapped)
+            except (zlib.error, lzma.LZMAError, OSError, ValueError) as e:
+                raise UnsupportedRoff(f"cannot decompress {path}: {e}") from e
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+
+def _so_target(path: str, text: str) -> str | None:
+    """The file a page consisting only of a ``.so`` request points to, if it is one."""
+    lines = [
+        line
+        for line in text.splitlines()
+        if line.strip() and not line.startswith(('.\\"', ".\\#", "'\\\""))
+    ]
+    if len(lines) != 1 or not lines[0].startswith(".so "):
+        return None
+    target = lines[0][4:].strip()
+    root = os.path.dirname(os.path.dirname(path))
+    for suffix in ("", ".gz", ".xz", ".bz2", ".zst"):
+        candidate = os.path.join(root, target + suffix)
+        if os.path.isfile(candidate):
+            return candidate
+    raise UnsupportedRoff(f"cannot resolve .so {target}")
+
+
+def resolve_so(path: str, text: str, depth: int = 0) -> tuple[str, str]:
+    """
+    Follows ``.so man1/other.1`` redirections to the page that holds the text.
+
+    Returns:
+        The ``(path, text)`` of the page that was finally read.
+    """
+    if depth > MAX_SO_DEPTH:
+        return path, text
+    target = _so_target(path, text)
+    if target is None:
+        return path, text
+    return resolve_so(target, read_man_source(target), depth + 1)
+
+
+def page_fingerprint(path: str) -> str | None:
+    """
+    A fingerprint of the page file and of each page its ``.so`` redirections
+    lead to, so it changes when the text that gets rendered does.
+
+    Only files small enough to be a redirection are opened; other pages cost
+    one ``stat()``, like :func:`core.doc_cache.file_fingerprint`.
+
+    Returns:
+        The fingerprint, or None if the page cannot be stat'ed.
+    """
+    parts = []
+    for _ in range(MAX_SO_DEPTH + 2):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        parts.append(f"{path}|{st.st_mtime_ns}|{st.st_size}")
+        if st.st_size > SO_STUB_MAX_SIZE:
+            break
+        try:
+            target = _so_target(path, read_man_source(path))
+        except (UnsupportedRoff, OSError):
+            break
+        if target is None:
+            break
+        path = target
+    return "\n".join(parts)
+
+
+def render_man_page(path: str) -> str:
+    """
+    Renders a man page file to HTML without running man or groff.
+
+    Args:
+        path: The page source file.
+
+    Returns:
+        An HTML fragment.
+
+    Raises:
+        UnsupportedRoff: The page uses features the renderer does not handle.
+        OSError: The file cannot be read.
+    """
+    _, text = resolve_so(path, read_man_source(path))
+    return RoffRenderer().render(text)
+
+
+def split_args(text: str) -> list[str]:
+    """Splits a request's arguments the way roff does, honouring double quotes."""
+    return [arg for arg, _ in _split_args_quoted(text)]
+
+
+def _split_args_quoted(text: str) -> list[tuple[str, bool]]:
+    args = []
+    i = 0
+    n = len(text)
+    while i < n:
+        while i < n and text[i] in " \t":
+            i += 1
+        if i >= n:
+            break
+        if text[i] == '"':
+            i += 1
+            buf = []
+            while i < n:
+                if text[i] == '"':
+                    if i + 1 < n and text[i + 1] == '"':
+                        buf.append('"')
+                        i += 2
+                        continue
+                    i += 1
+                    break
+                buf.append(text[i])
+                i += 1
+            args.append(("".join(buf), True))
+        else:
+            start = i
+            while i < n and text[i] not in " \t":
+                i += 2 if text[i] == "\\" else 1
+            args.append((text[start:i], False))
+    return args
+
+
+def _delimited(text: str, i: int) -> tuple[str, int]:
+    """Reads a ``'...'``-style escape argument starting at ``text[i]``."""
+    if i >= len(text):
+        return "", i
+    end = text.find(text[i], i + 1)
+    if end == -1:
+        return text[i + 1 :], len(text)
+    return text[i + 1 : end], end + 1
+
+
+def _escape_name(text: str, i: int) -> tuple[str, int]:
+    """Reads an escape's name: one char, ``(xx`` or ``[name]``."""
+    if i >= len(text):
+        return "", i
+    if text[i] == "(":
+        return text[i + 1 : i + 3], i + 3
+    if text[i] == "[":
+        end = text.find("]", i)
+        if end == -1:
+            return text[i + 1 :], len(text)
+        return text[i + 1 : end], end + 1
+    return text[i], i + 1
+
+
+def glyph(name: str) -> str:
+    """Maps a roff special character name such as ``em`` or ``u00E9`` to text."""
+    if name in GLYPHS:
+        return GLYPHS[name]
+    if len(name) == 2 and name[0] == "*" and name[1].lower() in GREEK[0]:
+        letter = GREEK[1][GREEK[0].index(name[1].lower())]
+        return letter.upper() if name[1].isupper() else letter
+    if len(name) == 2 and name[0] in ACCENTS:
+        return name[1] + ACCENTS[name[0]]
+    if name.startswith("u") and len(name) >= 5:
+        try:
+            return "".join(chr(int(part, 16)) for part in name[1:].split("_"))
+        except ValueError:
+            pass
+    if name.startswith("char") and name[4:].isdigit():
+        return chr(int(name[4:]))
+    return ""
+
+
+class _MdocText:
+    """Collects mdoc words into runs, applying mdoc's spacing rules."""
+
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.runs = []
+        self.no_space = True
+
+    def word(self, text, font="R", space=True):
+        if not self.no_space and space and text not in CLOSE_PUNCT:
+            self.runs.append(("R", " ", None))
+        self.renderer._inline(text, self.runs, font)
+        self.no_space = text in OPEN_PUNCT
+
+
+class RoffRenderer:
+    """
+    Renders the common subset of the man(7) and mdoc(7) macro packages to
+    HTML that :pyclass:`QTextBrowser` can display.
+
+    Only what documentation pages actually use is emulated: fonts, paragraphs,
+    tagged and indented paragraphs, lists, displays, strings, number
+    registers, conditionals and simple user macros. Pages that need a
+    preprocessor (tbl, eqn, pic) raise :class:`UnsupportedRoff` so the caller
+    can fall back to ``man``.
+
+    Output is a flat sequence of ``<h2>``/``<h3>`` headings, ``<p>`` and
+    ``<pre>`` blocks; nesting is expressed as a left margin.
+    """
+
+    def __init__(self):
+        self.blocks = []
+        self.runs = []
+        self.kind = "p"
+        self.pending_next = None
+        self.indent = 0
+        self.nofill = False
+        self.font = "R"
+        self.prev_font = "R"
+        self.next_line_font = None
+        self.no_space = False
+        self.href = None
+        self.href_start = 0
+        self.strings = dict(DEFAULT_STRINGS)
+        self.registers = {".g": 1, ".$": 0}
+        self.macros = {}
+        self.conditions = []
+        self.stack = []
+        self.lists = []
+        self.xo_open = False
+        self.fo_args = None
+        self.title = None
+        self.section = None
+        self.mdoc_name = None
+        self.current_heading = None
+        self.unknown = 0
+        self.depth = 0
+
+    def render(self, text: str) -> str:
+        """Renders roff source to an HTML fragment."""
+        self._run_lines(self._split_lines(text))
+        self._flush()
+        if self.unknown > MAX_UNKNOWN_REQUESTS:
+            raise UnsupportedRoff(f"{self.unknown} unknown requests")
+        return "\n".join(self.blocks)
+
+    # -- input -------------------------------------------------------------
+
+    @staticmethod
+    def _split_lines(text):
+        lines = []
+        pending = ""
+        for line in text.split("\n"):
+            line = line.rstrip("\r")
+            trailing = len(line) - len(line.rstrip("\\"))
+            if trailing % 2 == 1:
+                pending += line[:-1]
+                continue
+            lines.append(pending + line)
+            pending = ""
+        if pending:
+            lines.append(pending)
+        return lines
+
+    def _run_lines(self, lines):
+        i = 0
+        n = len(lines)
+        while i < n:
+            line = lines[i]
+            i += 1
+            if line[:1] in (".", "'"):
+                name, rest = self._request_name(line)
+                if name in ("ig", "de", "de1", "am", "am1"):
+                    i = self._define(name, rest, lines, i)
+                    continue
+                if name in ("if", "ie", "el"):
+                    i = self._conditional(name, rest, lines, i)
+                    continue
+                if name == "TS":
+                    i = self._table(lines, i)
+                    continue
+            self._process_line(line)
+
+    def _define(self, name, rest, lines, i):
+        """Handles ``.ig`` and ``.de``/``.am``; returns the index after the body."""
+        args = split_args(rest)
+        end = ".."
+        if name == "ig" and args:
+            end = "." + args[0]
+        elif name != "ig" and len(args) > 1:
+            end = "." + args[1]
+        body = []
+        while i < len(lines) and lines[i].strip() != end:
+            body.append(lines[i])
+            i += 1
+        if name != "ig" and args:
+            # Macro bodies are read in copy mode, where \\ becomes \.
+            body = [line.replace("\\\\", "\\") for line in body]
+            if name.startswith("am"):
+                self.macros.setdefault(args[0], []).extend(body)
+            else:
+                self.macros[args[0]] = body
+        return i + 1
+
+    def _conditional(self, name, rest, lines, i):
+        """Handles ``.if``/``.ie``/``.el``; returns the index of the next line."""
+        if name == "el":
+            truth = not self.conditions.pop() if self.conditions else False
+            body = rest
+        else:
+            truth, body = self._condition(rest)
+            if name == "ie":
+                self.conditions.append(truth)
+        body = body.lstrip(" \t")
+        if truth:
+            if body.startswith("\\{"):
+                body = body[2:].lstrip(" \t")
+            if body.strip():
+                if body[:1] in (".", "'"):
+                    inner, inner_rest = self._request_name(body)
+                    if inner in ("if", "ie", "el"):
+                        return self._conditional(inner, inner_rest, lines, i)
+                self._process_line(body)
+            return i
+        depth = body.count("\\{") - body.count("\\}")
+        while depth > 0 and i < len(lines):
+            depth += lines[i].count("\\{") - lines[i].count("\\}")
+            i += 1
+        return i
+
+    def _condition(self, text):
+        """Evaluates a condition; returns ``(truth, rest_of_line)``."""
+        text = text.lstrip(" \t")
+        negate = False
+        while text.startswith("!"):
+            negate = not negate
+            text = text[1:]
+        if not text:
+            return False, ""
+        first = text[0]
+        if first in "nteov" and (len(text) == 1 or text[1] in " \t\\"):
+            # We emulate nroff: "n" and odd-page are true, troff/even/vroff false.
+            truth = first in "no"
+            rest = text[1:]
+        elif first in "drcmFS" and len(text) > 1 and text[1] in " \t":
+            arg, _, rest = text[2:].lstrip().partition(" ")
+            if first == "d":
+                truth = arg in self.strings or arg in self.macros
+            elif first == "r":
+                truth = arg in self.registers
+            else:
+                truth = True
+        elif first in "0123456789(+-|" or text.startswith(("\\n", "\\w", "\\B")):
+            expr, _, rest = text.partition(" ")
+            truth = self._eval(expr) > 0
+        else:
+            second = text.find(first, 1)
+            third = text.find(first, second + 1) if second != -1 else -1
+            if third == -1:
+                return False, ""
+            truth = self._plain(text[1:second]) == self._plain(text[second + 1 : third])
+            rest = text[third + 1 :]
+        return truth != negate, rest
+
+    def _eval(self, expr):
+        """Evaluates a roff numeric expression; roff has no operator precedence."""
+        value, _ = self._eval_at(self._expand_registers(expr), 0)
+        return value
+
+    def _eval_at(self, expr, pos):
+        ops = (
+            "<=",
+            ">=",
+            "==",
+            "<?",
+            ">?",
+            "<",
+            ">",
+            "=",
+            "+",
+            "-",
+            "*",
+            "/",
+            "%",
+            "&",
+            ":",
+        )
+        value, pos = self._eval_term(expr, pos)
+        while pos < len(expr):
+            op = next((op for op in ops if expr.startswith(op, pos)), None)
+            if op is None:
+                break
+            rhs, pos = self._eval_term(expr, pos + len(op))
+            if op == "+":
+                value += rhs
+            elif op == "-":
+                value -= rhs
+            elif op == "*":
+                value *= rhs
+            elif op == "/":
+                value = int(value / rhs) if rhs else 0
+            elif op == "%":
+                value = value % rhs if rhs else 0
+            elif op == "<?":
+                value = min(value, rhs)
+            elif op == ">?":
+                value = max(value, rhs)
+            elif op == "<":
+                value = int(value < rhs)
+            elif op == ">":
+                value = int(value > rhs)
+            elif op == "<=":
+                value = int(value <= rhs)
+            elif op == ">=":
+                value = int(value >= rhs)
+            elif op in ("=", "=="):
+                value = int(value == rhs)
+            elif op == "&":
+                value = int(value > 0 and rhs > 0)
+            elif op == ":":
+                value = int(value > 0 or rhs > 0)
+        return value, pos
+
+    def _eval_term(self, expr, pos):
+        if pos < len(expr) and expr[pos] == "(":
+            value, pos = self._eval_at(expr, pos + 1)
+            if pos < len(expr) and expr[pos] == ")":
+                pos += 1
+            return value, pos
+        sign = 1
+        while pos < len(expr) and expr[pos] in "+-":
+            if expr[pos] == "-":
+                sign = -sign
+            pos += 1
+        start = pos
+        while pos < len(expr) and (expr[pos].isdigit() or expr[pos] == "."):
+            pos += 1
+        try:
+            value = int(float(expr[start:pos] or 0))
+        except ValueError:
+            value = 0
+        if pos < len(expr) and expr[pos] in "icpPmMnvuf":
+            pos += 1
+        return sign * value, pos
+
+    def _expand_registers(self, text):
+        out = []
+        i = 0
+        while i < len(text):
+            if text[i] != "\\" or i + 1 >= len(text):
+                out.append(text[i])
+                i += 1
+                continue
+            esc = text[i + 1]
+            if esc == "n":
+                j = i + 2
+                if j < len(text) and text[j] in "+-":
+                    j += 1
+                name, i = _escape_name(text, j)
+                out.append(str(self.registers.get(name, 0)))
+            elif esc in "wB":
+                _, i = _delimited(text, i + 2)
+                out.append("0" if esc == "w" else "1")
+            elif esc == "*":
+                name, i = _escape_name(text, i + 2)
+                out.append(self.strings.get(name, ""))
+            else:
+                out.append(text[i : i + 2])
+                i += 2
+        return "".join(out)
+
+    def _plain(self, text):
+        return "".join(run[1] for run in self._inline(text, [], self.font))
+
+    @staticmethod
+    def _request_name(line):
+        body = line[1:].lstrip(" \t")
+        end = 0
+        while end < len(body) and body[end] not in " \t":
+            if body[end] == "\\":
+                break
+            end += 1
+        rest = body[end:]
+        comment = rest.find('\\"')
+        while comment > 0 and rest[comment - 1] == "\\":
+            comment = rest.find('\\"', comment + 2)
+        if comment != -1:
+            rest = rest[:comment]
+        return body[:end], rest.strip(" \t")
+
+    def _process_line(self, line):
+        bare = line.replace("\\{", "").replace("\\}", "")
+        if bare != line and bare.strip() in ("", ".", "'"):
+            return
+        if bare[:1] in (".", "'"):
+            name, rest = self._request_name(bare)
+            if name:
+                self._request(name, rest)
+        else:
+            self._text_line(bare)
+        if self.pending_next and self.runs and not self.xo_open:
+            self._flush()
+            self.kind = self.pending_next
+            self.pending_next = None
+
+    # -- output ------------------------------------------------------------
+
+    def _margin(self):
+        return (self.indent + (1 if self.kind == "dd" else 0)) * INDENT_PX
+
+    def _flush(self):
+        runs = self.runs
+        self.runs = []
+        self.href_start = 0
+        if not runs:
+            return
+        margin = self._margin()
+        if self.nofill:
+            text = self._runs_html(runs).rstrip("\n")
+            style = f' style="margin-left:{margin}px"' if margin else ""
+            self.blocks.append(f"<pre{style}>{text}</pre>")
+            return
+        body = self._runs_html(runs).strip()
+        if not body or body == "<br>":
+            return
+        if self.kind in ("h2", "h3"):
+            heading = " ".join("".join(run[1] for run in runs).split())
+            if self.kind == "h2":
+                self.current_heading = heading.upper()
+            heading = html.escape(heading, quote=False)
+            self.blocks.append(f"<{self.kind}>{heading}</{self.kind}>")
+            return
+        styles = []
+        if margin:
+            styles.append(f"margin-left:{margin}px")
+        if self.kind == "dt":
+            styles.append("margin-bottom:0px")
+        elif self.kind == "dd":
+            styles.append("margin-top:0px")
+        style = f' style="{"; ".join(styles)}"' if styles else ""
+        self.blocks.append(f"<p{style}>{body}</p>")
+
+    @staticmethod
+    def _runs_html(runs):
+        merged = []
+        for font, text, href in runs:
+            if (
+                merged
+                and font is not None
+                and merged[-1][0] == font
+                and merged[-1][2] == href
+            ):
+                merged[-1][1] += text
+            else:
+                merged.append([font, text, href])
+        parts = []
+        for font, text, href in merged:
+            if font is None:
+                parts.append("<br>")
+                continue
+            body = html.escape(text, quote=False)
+            if font == "B":
+                body = f"<b>{body}</b>"
+            elif font == "I":
+                body = f"<i>{body}</i>"
+            elif font == "BI":
+                body = f"<b><i>{body}</i></b>"
+            if href:
+                body = f'<a href="{html.escape(href)}">{body}</a>'
+            parts.append(body)
+        return "".join(parts)
+
+    def _add_runs(self, runs):
+        """Appends a filled line's runs, separated from the previous by a space."""
+        if not runs:
+            return
+        if self.nofill:
+            self.runs.extend(runs)
+            self.runs.append(("R", "\n", None))
+            return
+        if self.runs and not self.no_space:
+            last = self.runs[-1]
+            if last[0] is not None and not last[1].endswith((" ", " ")):
+                self.runs.append(("R", " ", self.href))
+        self.no_space = False
+        self.runs.extend(runs)
+
+    def _line_break(self):
+        if self.runs and not self.nofill:
+            self.runs.append((None, "\n", None))
+
+    def _paragraph(self, kind="p"):
+        self._flush()
+        self.pending_next = None
+        self.kind = kind
+
+    def _heading(self, level, rest):
+        """Starts a section (``h2``) or subsection (``h3``).
+
+        Without arguments the heading text is taken from the next line.
+        """
+        self._flush()
+        self.nofill = False
+        self.next_line_font = None
+        if level == "h2":
+            self.indent = 0
+            self.stack.clear()
+            self.lists.clear()
+        self.kind = level
+        self.pending_next = "p"
+        if rest:
+            self.runs = self._inline(" ".join(split_args(rest)), [])
+            self._flush()
+            self.kind = "p"
+            self.pending_next = None
+
+    # -- tbl -------------------------------------------------------------
+
+    def _table(self, lines, i):
+        """Renders a tbl(1) table as an HTML table; returns the index after ``.TE``."""
+        end = i
+        while end < len(lines) and not lines[end].startswith((".TE", "'TE")):
+            end += 1
+        rows = lines[i:end]
+        self._flush()
+
+        tab = "\t"
+        boxed = False
+        if rows and rows[0].rstrip().endswith(";"):
+            options = rows.pop(0)
+            boxed = "box" in options
+            start = options.find("tab(")
+            if start != -1 and start + 4 < len(options):
+                tab = options[start + 4]
+        # Skip the format specification, including any ".T&" continuations.
+        in_format = True
+        cells_rows = []
+        pending = None
+        for line in rows:
+            if in_format:
+                in_format = not line.rstrip().endswith(".")
+                continue
+            if line.startswith((".T&", "'T&")):
+                in_format = True
+                continue
+            if pending is not None:
+                row, block = pending
+                if line.startswith("T}"):
+                    row.append(self._table_block(block))
+                    pending = None
+                    line = line[2:].lstrip(tab)
+                    if not line:
+                        cells_rows.append(row)
+                        continue
+                    pending = self._table_cells(line, tab, row, cells_rows)
+                else:
+                    block.append(line)
+                continue
+            if line.strip() in ("_", "=") or line[:1] in (".", "'"):
+                continue
+            pending = self._table_cells(line, tab, [], cells_rows)
+
+        border = ' border="1" cellspacing="0"' if boxed else ""
+        margin = self._margin()
+        style = f' style="margin-left:{margin}px"' if margin else ""
+        body = []
+        for row in cells_rows:
+            cells = "".join(f"<td>{cell}</td>" for cell in row)
+            body.append(f"<tr>{cells}</tr>")
+        if body:
+            self.blocks.append(
+                f'<table{border} cellpadding="4"{style}>{"".join(body)}</table>'
+            )
+        return end + 1
+
+    def _table_cells(self, line, tab, row, rows):
+        """Adds a data line's cells to ``row``; returns the pending ``T{`` block."""
+        for cell in line.split(tab):
+            if cell.strip() == "T{":
+                return row, []
+            if cell.strip() in ("_", "=", "\\^"):
+                cell = ""
+            row.append(self._runs_html(self._inline(cell, [])))
+        rows.append(row)
+        return None
+
+    def _table_block(self, lines):
+        """Renders the text of a ``T{ ... T}`` cell, which may contain requests."""
+        saved = self.blocks, self.runs, self.kind, self.pending_next, self.indent
+        self.blocks, self.runs, self.kind, self.pending_next = [], [], "p", None
+        self.indent = 0
+        self._run_lines(lines)
+        self._flush()
+        content = "".join(self.blocks)
+        self.blocks, self.runs, self.kind, self.pending_next, self.indent = saved
+        return content
+
+    # -- inline escapes ----------------------------------------------------
+
+    def _set_font(self, name):
+        if name in ("P", ""):
+            self.font, self.prev_font = self.prev_font, self.font
+            return
+        self.prev_font = self.font
+        self.font = FONTS.get(name, "R")
+
+    def _inline(self, text, runs, font=None):
+        """Appends runs for ``text``; ``font`` temporarily overrides the current font."""
+        saved = (self.font, self.prev_font)
+        if font is not None:
+            self.font = font
+        buf = []
+
+        def emit():
+            if buf:
+                runs.append((self.font, "".join(buf), self.href))
+                buf.clear()
+
+        i = 0
+        n = len(text)
+        while i < n:
+            c = text[i]
+            if c != "\\":
+                buf.append(c)
+                i += 1
+                continue
+            if i + 1 >= n:
+                break
+            e = text[i + 1]
+            i += 2
+            if e == "f":
+                name, i = _escape_name(text, i)
+                emit()
+                self._set_font(name)
+            elif e in "([":
+                name, i = _escape_name(text, i - 1)
+                buf.append(glyph(name))
+            elif e == "*":
+                name, i = _escape_name(text, i)
+                emit()
+                if self.depth < MAX_MACRO_DEPTH:
+                    self.depth += 1
+                    self._inline(self.strings.get(name.split(" ")[0], ""), runs)
+                    self.depth -= 1
+            elif e == "n":
+                if i < n and text[i] in "+-":
+                    i += 1
+                name, i = _escape_name(text, i)
+                buf.append(str(self.registers.get(name, 0)))
+            elif e == "s":
+                if i < n and text[i] in "+-":
+                    i += 1
+                if i < n and text[i] in "'\"":
+                    _, i = _delimited(text, i)
+                elif i < n and text[i] in "([":
+                    _, i = _escape_name(text, i)
+                elif i < n and text[i].isdigit():
+                    i += 2 if text[i] in "123" and text[i + 1 : i + 2].isdigit() else 1
+            elif e in "mMFgkVYj":
+                _, i = _escape_name(text, i)
+            elif e in "hvwlLoDXbxHSRAZBCN":
+                arg, i = _delimited(text, i)
+                if e == "w":
+                    buf.append("0")
+                elif e in "AB":
+                    buf.append("1")
+                elif e == "o" and arg:
+                    buf.append(arg[-1])
+                elif e == "C":
+                    buf.append(glyph(arg))
+                elif e == "N" and arg.isdigit():
+                    buf.append(chr(int(arg)))
+                elif e == "Z":
+                    buf.append(arg)
+            elif e == "$":
+                _, i = _escape_name(text, i)
+            elif e in '"#':
+                break
+            elif e in "eE\\":
+                buf.append("\\")
+            elif e in " ~":
+                buf.append(" ")
+            elif e == "0":
+                buf.append(" ")
+            elif e == "t":
+                buf.append("\t")
+            elif e == "-":
+                buf.append("-")
+            elif e == "'":
+                buf.append("´")
+            elif e in "&)|^,/%:{}adpruzc":
+                pass
+            else:
+                buf.append(e)
+        emit()
+        if font is not None:
+            self.font, self.prev_font = saved
+        return runs
+
+    # -- text lines --------------------------------------------------------
+
+    def _text_line(self, line):
+        font = self.next_line_font
+        self.next_line_font = None
+        if self.nofill:
+            self._add_runs(self._inline(line, [], font) or [("R", "", None)])
+            return
+        if not line.strip():
+            self._flush()
+            if self.kind == "dt" and not self.pending_next:
+                self.kind = "dd"
+            return
+        if line[0] in " \t":
+            self._line_break()
+        self._add_runs(self._inline(line, [], font))
+        # A trailing \c joins the next input line without a space.
+        self.no_space = line.endswith("\\c")
+
+    def _font_line(self, fonts, args):
+        if not args:
+            self.next_line_font = fonts[0]
+            return
+        runs = []
+        for k, arg in enumerate(args):
+            self._inline(arg, runs, fonts[k % len(fonts)])
+        self._add_runs(runs)
+
+    # -- requests ----------------------------------------------------------
+
+    def _request(self, name, rest):
+        if name in self.macros:
+            self._call_macro(name, rest)
+            return
+        handler = getattr(self, f"_m_{name}", None)
+        if handler is not None:
+            handler(rest)
+        elif name in MDOC_CALLABLE:
+            self._mdoc_inline(name, rest)
+        elif name in UNSUPPORTED_REQUESTS:
+            raise UnsupportedRoff(f"request .{name}")
+        elif name.startswith("%"):
+            self._add_runs(self._inline(rest, []))
+        elif name not in IGNORED_REQUESTS:
+            self.unknown += 1
+
+    def _call_macro(self, name, rest):
+        if self.depth >= MAX_MACRO_DEPTH:
+            raise UnsupportedRoff(f"macro .{name} nests too deeply")
+        args = split_args(rest)
+        saved = self.registers.get(".$", 0)
+        self.registers[".$"] = len(args)
+        body = []
+        for line in self.macros[name]:
+            for k in range(9, 0, -1):
+                line = line.replace(f"\\${k}", args[k - 1] if k <= len(args) else "")
+            line = line.replace("\\$*", " ".join(args))
+            line = line.replace("\\$@", " ".join(f'"{arg}"' for arg in args))
+            body.append(line)
+        self.depth += 1
+        try:
+            self._run_lines(body)
+        finally:
+            self.depth -= 1
+            self.registers[".$"] = saved
+
+    def _m_ds(self, rest):
+        name, _, value = rest.partition(" ")
+        self.strings[name] = value[1:] if value.startswith('"') else value
+
+    def _m_as(self, rest):
+        name, _, value = rest.partition(" ")
+        value = value[1:] if value.startswith('"') else value
+        self.strings[name] = self.strings.get(name, "") + value
+
+    def _m_nr(self, rest):
+        args = split_args(rest)
+        if len(args) >= 2:
+            self.registers[args[0]] = self._eval(args[1])
+
+    def _m_rm(self, rest):
+        for name in split_args(rest):
+            self.macros.pop(name, None)
+            self.strings.pop(name, None)
+
+    def _m_rr(self, rest):
+        for name in split_args(rest):
+            self.registers.pop(name, None)
+
+    def _m_do(self, rest):
+        self._process_line("." + rest)
+
+    def _m_nop(self, rest):
+        self._text_line(rest)
+
+    def _m_TH(self, rest):
+        args = split_args(rest)
+        self.title = self._plain(args[0]) if args else None
+        self.section = args[1] if len(args) > 1 else None
+
+    def _m_SH(self, rest):
+        self._heading("h2", rest)
+
+    def _m_SS(self, rest):
+        self._heading("h3", rest)
+
+    def _m_PP(self, rest):
+        self._paragraph()
+
+    _m_LP = _m_PP
+    _m_P = _m_PP
+    _m_HP = _m_PP
+
+    def _m_TP(self, rest):
+        self._paragraph("dt")
+        self.pending_next = "dd"
+
+    _m_TQ = _m_TP
+
+    def _m_IP(self, rest):
+        args = split_args(rest)
+        self._paragraph("dt")
+        if args and args[0]:
+            self._add_runs(self._inline(args[0], []))
+            self._flush()
+        self.kind = "dd"
+
+    def _m_RS(self, rest):
+        self._flush()
+        self.stack.append((self.indent, self.kind, "RS", None))
+        self.indent += 2 if self.kind == "dd" else 1
+        self.kind = "p"
+
+    def _m_RE(self, rest):
+        self._flush()
+        if self.stack and self.stack[-1][2] == "RS":
+            self.indent, self.kind, _, _ = self.stack.pop()
+
+    def _m_br(self, rest):
+        self._line_break()
+
+    _m_ti = _m_br
+    _m_ce = _m_br
+
+    def _m_sp(self, rest):
+        if self.nofill:
+            self.runs.append(("R", "\n", None))
+            return
+        self._flush()
+        if self.kind == "dt" and not self.pending_next:
+            self.kind = "dd"
+
+    def _m_nf(self, rest):
+        self._flush()
+        self.nofill = True
+
+    def _m_fi(self, rest):
+        self._flush()
+        self.nofill = False
+
+    _m_EX = _m_nf
+    _m_EE = _m_fi
+
+    def _m_ft(self, rest):
+        self._set_font(rest.strip() or "P")
+
+    def _m_B(self, rest):
+        self._font_line(["B"], [" ".join(split_args(rest))] if rest else [])
+
+    def _m_I(self, rest):
+        self._font_line(["I"], [" ".join(split_args(rest))] if rest else [])
+
+    def _m_SM(self, rest):
+        self._font_line(["R"], [" ".join(split_args(rest))] if rest else [])
+
+    _m_SB = _m_B
+
+    def _m_BR(self, rest):
+        self._font_line(["B", "R"], split_args(rest))
+
+    def _m_BI(self, rest):
+        self._font_line(["B", "I"], split_args(rest))
+
+    def _m_IB(self, rest):
+        self._font_line(["I", "B"], split_args(rest))
+
+    def _m_IR(self, rest):
+        self._font_line(["I", "R"], split_args(rest))
+
+    def _m_RB(self, rest):
+        self._font_line(["R", "B"], split_args(rest))
+
+    def _m_RI(self, rest):
+        self._font_line(["R", "I"], split_args(rest))
+
+    def _m_SY(self, rest):
+        self._paragraph()
+        self._add_runs(self._inline(" ".join(split_args(rest)), [], "B"))
+
+    def _m_OP(self, rest):
+        args = split_args(rest)
+        runs = [("R", "[", None)]
+        if args:
+            self._inline(args[0], runs, "B")
+        if len(args) > 1:
+            runs.append(("R", " ", None))
+            self._inline(args[1], runs, "I")
+        runs.append(("R", "]", None))
+        self._add_runs(runs)
+
+    def _m_YS(self, rest):
+        self._paragraph()
+
+    def _m_UR(self, rest):
+        args = split_args(rest)
+        self.href = args[0] if args else ""
+        self.href_start = len(self.runs)
+
+    def _m_MT(self, rest):
+        args = split_args(rest)
+        self.href = f"mailto:{args[0]}" if args else ""
+        self.href_start = len(self.runs)
+
+    def _m_UE(self, rest):
+        href = self.href
+        self.href = None
+        if href is None:
+            return
+        if len(self.runs) <= self.href_start:
+            label = href.removeprefix("mailto:")
+            self._add_runs([("R", label, href)])
+        trailer = split_args(rest)
+        if trailer:
+            self.runs.extend(self._inline(trailer[0], []))
+
+    _m_ME = _m_UE
+
+    # -- mdoc --------------------------------------------------------------
+
+    def _m_Dt(self, rest):
+        args = split_args(rest)
+        self.title = args[0] if args else None
+        self.section = args[1] if len(args) > 1 else None
+
+    _m_Sh = _m_SH
+    _m_Ss = _m_SS
+
+    def _m_Pp(self, rest):
+        self._paragraph("dd" if self.kind == "dd" else "p")
+
+    _m_Lp = _m_Pp
+
+    def _m_Nd(self, rest):
+        self._add_runs(self._inline(rest, [("R", "— ", None)]))
+
+    def _m_Nm(self, rest):
+        args = split_args(rest)
+        if args and self.mdoc_name is None:
+            self.mdoc_name = args[0]
+        if self.current_heading == "SYNOPSIS" and not self.lists:
+            self._paragraph()
+        self._mdoc_inline("Nm", rest)
+
+    def _m_D1(self, rest, literal=False):
+        self._flush()
+        saved = self.indent, self.nofill
+        self.indent += 1
+        self.nofill = literal
+        out = _MdocText(self)
+        self._mdoc_parse(_split_args_quoted(rest), out)
+        self.runs = out.runs
+        self._flush()
+        self.indent, self.nofill = saved
+
+    def _m_Dl(self, rest):
+        self._m_D1(rest, literal=True)
+
+    def _m_Bd(self, rest):
+        args = split_args(rest)
+        self._flush()
+        self.stack.append((self.indent, self.kind, "Bd", self.nofill))
+        self.indent += (1 if self.kind == "dd" else 0) + (1 if "-offset" in args else 0)
+        self.kind = "p"
+        self.nofill = "-literal" in args or "-unfilled" in args
+
+    def _m_Ed(self, rest):
+        self._flush()
+        while self.stack:
+            indent, kind, tag, nofill = self.stack.pop()
+            if tag == "Bd":
+                self.indent, self.kind, self.nofill = indent, kind, nofill
+                break
+
+    def _m_Bl(self, rest):
+        args = split_args(rest)
+        self._flush()
+        list_type = next((a[1:] for a in args if a[1:] in MDOC_LIST_TYPES), "tag")
+        self.stack.append((self.indent, self.kind, "Bl", None))
+        self.indent += (1 if self.kind == "dd" else 0) + (1 if "-offset" in args else 0)
+        self.lists.append([list_type, 0])
+        self.kind = "p"
+
+    def _m_El(self, rest):
+        self._flush()
+        self.pending_next = None
+        if self.lists:
+            self.lists.pop()
+        while self.stack:
+            indent, kind, tag, _ = self.stack.pop()
+            if tag == "Bl":
+                self.indent, self.kind = indent, kind
+                break
+
+    def _m_It(self, rest):
+        self._flush()
+        self.pending_next = None
+        list_type = self.lists[-1][0] if self.lists else "tag"
+        args = _split_args_quoted(rest)
+        out = _MdocText(self)
+        if list_type in ("tag", "hang", "ohang", "inset", "diag"):
+            self.kind = "dt"
+            self._mdoc_parse(args, out)
+            self.runs = out.runs
+            if self.xo_open:
+                self.pending_next = "dd"
+            else:
+                self._flush()
+                self.kind = "dd"
+            return
+        if list_type == "column":
+            self.kind = "p"
+            cells = [(text, True) for text, quoted in args if quoted or text != "Ta"]
+            for k, cell in enumerate(cells):
+                if k:
+                    out.word("  ", space=False)
+                    out.no_space = True
+                self._mdoc_parse([cell], out)
+            self.runs = out.runs
+            return
+        self.kind = "dd"
+        self.lists[-1][1] += 1
+        prefix = {"bullet": "•", "dash": "–", "hyphen": "-"}.get(list_type)
+        if list_type == "enum":
+            prefix = f"{self.lists[-1][1]}."
+        if prefix:
+            self.runs.append(("R", prefix + " ", None))
+        self.no_space = True
+        self._mdoc_parse(args, out)
+        self._add_runs(out.runs)
+
+    def _m_Ex(self, rest):
+        name = next((a for a in split_args(rest) if a != "-std"), self.mdoc_name or "")
+        text = f"The {name} utility exits 0 on success, and >0 if an error occurs."
+        self._add_runs([("R", text, None)])
+
+    def _m_Rv(self, rest):
+        name = next((a for a in split_args(rest) if a != "-std"), self.mdoc_name or "")
+        text = (
+            f"The {name}() function returns the value 0 if successful; otherwise "
+            "the value -1 is returned and the global variable errno is set to "
+            "indicate the error."
+        )
+        self._add_runs([("R", text, None)])
+
+    def _m_Fd(self, rest):
+        self._add_runs(self._inline(rest, [], "B"))
+
+    def _m_Fo(self, rest):
+        args = split_args(rest)
+        self._add_runs([("B", args[0] if args else "", None), ("R", "(", None)])
+        self.no_space = True
+        self.fo_args = 0
+
+    def _m_Fc(self, rest):
+        self.no_space = True
+        self._add_runs([("R", ")", None)])
+        self.fo_args = None
+
+    def _m_Fa(self, rest):
+        if self.fo_args is not None:
+            if self.fo_args:
+                self.runs.append(("R", ", ", None))
+            self.no_space = True
+            self.fo_args += 1
+        self._mdoc_inline("Fa", rest)
+
+    def _m_Bf(self, rest):
+        args = split_args(rest)
+        self.prev_font = self.font
+        self.font = {"-emphasis": "I", "Em": "I", "-symbolic": "B", "Sy": "B"}.get(
+            args[0] if args else "", "R"
+        )
+
+    def _m_Ef(self, rest):
+        self.font = "R"
+
+    def _m_Rs(self, rest):
+        self._paragraph()
+
+    _m_Re = _m_Rs
+
+    def _mdoc_inline(self, name, rest):
+        out = _MdocText(self)
+        self._mdoc_parse([(name, False)] + _split_args_quoted(rest), out)
+        self._add_runs(out.runs)
+
+    def _mdoc_parse(self, args, out):
+        i = 0
+        while i < len(args):
+            text, quoted = args[i]
+            if not quoted and text in MDOC_CALLABLE:
+                i = self._mdoc_macro(text, args, i + 1, out)
+            else:
+                out.word(text)
+                i += 1
+
+    @staticmethod
+    def _mdoc_words(args, i):
+        """Collects plain words up to the next callable macro or punctuation."""
+        words = []
+        while i < len(args):
+            text, quoted = args[i]
+            if not quoted and (
+                text in MDOC_CALLABLE or text in CLOSE_PUNCT or text in OPEN_PUNCT
+            ):
+                break
+            words.append(text)
+            i += 1
+        return words, i
+
+    def _mdoc_macro(self, name, args, i, out):
+        """Applies one callable mdoc macro; returns the index of the next argument."""
+        if name in MDOC_ENCLOSURES:
+            opening, closing = MDOC_ENCLOSURES[name]
+            end = len(args)
+            while end > i and not args[end - 1][1] and args[end - 1][0] in CLOSE_PUNCT:
+                end -= 1
+            out.word(opening)
+            out.no_space = True
+            self._mdoc_parse(args[i:end], out)
+            out.no_space = True
+            out.word(closing, space=False)
+            return end
+        if name in MDOC_OPEN:
+            out.word(MDOC_OPEN[name])
+            out.no_space = True
+            return i
+        if name in MDOC_CLOSE:
+            out.no_space = True
+            out.word(MDOC_CLOSE[name], space=False)
+            return i
+        words, j = self._mdoc_words(args, i)
+        if name == "Fl":
+            if not words:
+                out.word("-", "B")
+                out.no_space = j < len(args) and args[j][0] not in CLOSE_PUNCT
+            for word in words:
+                out.word("-" + word, "B")
+        elif name == "Ar":
+            for word in words or ["file ..."]:
+                out.word(word, "I")
+        elif name == "Pa":
+            for word in words or ["~"]:
+                out.word(word, "I")
+        elif name == "Nm":
+            for word in words or [self.mdoc_name or ""]:
+                out.word(word, "B")
+        elif name == "Xr":
+            if words:
+                out.word(words[0], "B")
+            if len(words) > 1:
+                out.no_space = True
+                out.word(f"({words[1]})", space=False)
+            for word in words[2:]:
+                out.word(word)
+        elif name == "Fn":
+            if words:
+                out.word(words[0], "B")
+                out.no_space = True
+                out.word("(", space=False)
+                out.no_space = True
+                for k, word in enumerate(words[1:]):
+                    if k:
+                        out.no_space = True
+                        out.word(",", space=False)
+                    out.word(word, "I")
+                out.no_space = True
+                out.word(")", space=False)
+        elif name in MDOC_FONTS:
+            for word in words:
+                out.word(word, MDOC_FONTS[name])
+        elif name in MDOC_OS:
+            label = MDOC_OS[name]
+            if words and name == "At":
+                label = f"Version {words[0].lstrip('v')} {label}"
+            elif words:
+                label = f"{label} {words[0]}"
+            out.word(label)
+        elif name == "St":
+            for word in words:
+                out.word(MDOC_STANDARDS.get(word, word))
+        elif name == "In":
+            for word in words:
+                out.word(f"<{word}>", "B")
+        elif name == "An":
+            for word in words:
+                if word not in ("-split", "-nosplit"):
+                    out.word(word)
+        elif name in ("Ns", "Ap", "Pf", "Ta", "Xo", "Xc", "Es"):
+            j = i
+            if name == "Ns":
+                out.no_space = True
+            elif name == "Ap":
+                out.no_space = True
+                out.word("'", space=False)
+                out.no_space = True
+            elif name == "Pf" and i < len(args):
+                out.word(args[i][0])
+                out.no_space = True
+                j = i + 1
+            elif name == "Ta":
+                out.word("  ", space=False)
+                out.no_space = True
+            elif name == "Xo":
+                self.xo_open = True
+            elif name == "Xc":
+                self.xo_open = False
+            elif name == "Es":
+                j = min(i + 2, len(args))
+        else:
+            for word in words:
+                out.word(word)
+        return j
@@ -0,0 +1,529 @@
+import html
+import math
+import mmap
+import multiprocessing
+import os
+import re
+import sqlite3
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from core.doc_cache import default_cache_dir
+from core.manpath import split_page_name
+from core.roff import UnsupportedRoff, page_fingerprint, render_man_page
+
+SCHEMA_VERSION = 1
+
+POSTINGS_MAGIC = b"WMIX"
+# magic, version, doc count, term count, average doc length,
+# then the offsets of the doc table, string pool, term table and postings.
+HEADER = struct.Struct("<4sIIIdQQQQ")
+DOC_ENTRY = struct.Struct("<III")  # length, label offset, label size
+TERM_ENTRY = struct.Struct("<IIII")  # term offset, term size, first posting, count
+POSTING = struct.Struct("<II")  # doc id, weighted term frequency
+
+# How much lower than the GUI's the build process's CPU priority is.
+BUILD_NICENESS = 10
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Term frequency multipliers: a word in the command name or its one-line
+# description says far more about the page than one in the body.
+NAME_WEIGHT = 8
+SUMMARY_WEIGHT = 4
+
+# fmt: off
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "for", "from",
+    "if", "in", "into", "is", "it", "its", "of", "on", "or", "that", "the",
+    "this", "to", "was", "will", "with", "you", "your",
+}
+# fmt: on
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9_]*")
+_TAG_RE = re.compile(r"<[^>]+>")
+_NAME_SECTION_RE = re.compile(r"<h2>NAME</h2>\s*<p[^>]*>(.*?)</p>", re.S | re.I)
+
+
+def _stem(token: str) -> str:
+    """Strips common English inflections so "compresses" matches "compress"."""
+    for suffix in ("ing", "ion", "ed", "es", "s"):
+        if len(token) > len(suffix) + 3 and token.endswith(suffix):
+            return token[: -len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """Splits text into lower-cased, stemmed index terms without stopwords."""
+    return [
+        _stem(token)
+        for token in _TOKEN_RE.findall(text.lower())
+        if token not in STOPWORDS
+    ]
+
+
+def html_to_text(fragment: str) -> str:
+    return html.unescape(_TAG_RE.sub(" ", fragment))
+
+
+def man_summary(fragment: str) -> str:
+    """Extracts the one-line description from a rendered page's NAME section."""
+    match = _NAME_SECTION_RE.search(fragment)
+    if not match:
+        return ""
+    text = " ".join(html_to_text(match.group(1)).split())
+    for separator in (" — ", " - ", " -- "):
+        if separator in text:
+            return text.split(separator, 1)[1]
+    return text
+
+
+def _weighted_terms(command: str, summary: str, body: str) -> dict[str, int]:
+    terms = {}
+    for weight, text in ((NAME_WEIGHT, command), (SUMMARY_WEIGHT, summary), (1, body)):
+        for term in tokenize(text.replace("-", " ")):
+            terms[term] = terms.get(term, 0) + weight
+        if weight == NAME_WEIGHT:
+            term = command.lower()
+            terms[term] = terms.get(term, 0) + weight
+    return terms
+
+
+def _encode_terms(terms: dict[str, int]) -> bytes:
+    return zlib.compress("\n".join(f"{t}\t{n}" for t, n in terms.items()).encode())
+
+
+def _decode_terms(blob: bytes):
+    for line in zlib.decompress(blob).decode().split("\n"):
+        term, _, count = line.partition("\t")
+        if term:
+            yield term, int(count)
+
+
+class _Sources:
+    """The man pages and ``--help`` texts to index, as plain data that can be
+    handed to the build process in place of the man index and doc cache."""
+
+    def __init__(self, pages: dict[str, str], help_entries: list):
+        self._pages = pages
+        self._help_entries = help_entries
+
+    def pages(self) -> dict[str, str]:
+        return self._pages
+
+    def entries(self, source: str) -> list:
+        return self._help_entries if source == "help" else []
+
+
+def _build_in_child(pages, help_entries, directory, stop):
+    """Entry point of the build process: :meth:`SearchIndex.build` over a
+    snapshot of the sources, stopping when ``stop`` is set."""
+    try:
+        os.nice(BUILD_NICENESS)
+    except OSError:
+        pass
+    sources = _Sources(pages, help_entries)
+    index = SearchIndex(sources, sources, directory)
+    index._stop = stop
+    sys.exit(0 if index.build() else 1)
+
+
+class SearchIndex:
+    """
+    Full-text BM25 index over installed man pages and cached ``--help`` text.
+
+    Per-document term counts live in a SQLite table so a rebuild only has to
+    re-tokenize pages whose fingerprint changed. From those, a flat binary
+    postings file is written; queries memory-map it and binary-search its
+    sorted term table, so the index costs page cache rather than heap in the
+    GUI process.
+    """
+
+    def __init__(self, man_index, doc_cache=None, directory: str | None = None):
+        self.man_index = man_index
+        self.doc_cache = doc_cache
+        self.directory = directory or default_cache_dir()
+        self.db_path = os.path.join(self.directory, "search.sqlite3")
+        self.postings_path = os.path.join(self.directory, "search.postings")
+        self._build_lock = threading.Lock()
+        self._build_thread = None
+        self._stop = threading.Event()
+        self._reader_lock = threading.Lock()
+        self._mapped = None
+        self._mapped_identity = None
+
+    # -- building ----------------------------------------------------------
+
+    def start_background_build(self):
+        """
+        Brings the index up to date in the background, unless a build is
+        running.
+
+        Rendering pages is pure Python, and on a thread it would hold the GIL
+        against the GUI for the whole build. The build runs in a separate,
+        lower-priority process instead; a daemon thread here only lists the
+        sources and waits for it.
+        """
+        if self.is_building():
+            return
+        self._stop.clear()
+        self._build_thread = threading.Thread(
+            target=self._build_in_process, name="wingman-search-index", daemon=True
+        )
+        self._build_thread.start()
+
+    def _build_in_process(self) -> bool:
+        pages = self.man_index.pages()
+        help_entries = self.doc_cache.entries("help") if self.doc_cache else []
+        context = multiprocessing.get_context("spawn")
+        stop = context.Event()
+        process = context.Process(
+            target=_build_in_child,
+            args=(pages, help_entries, self.directory, stop),
+            name="wingman-search-index",
+            daemon=True,
+        )
+        with self._build_lock:
+            if self._stop.is_set():
+                return False
+            try:
+                process.start()
+            except OSError:
+                return False
+            while process.is_alive():
+                if self._stop.wait(0.25):
+                    stop.set()
+                    break
+            process.join()
+            return process.exitcode == 0
+
+    def stop(self):
+        """Asks a running build to stop after the current document."""
+        self._stop.set()
+
+    def is_building(self) -> bool:
+        return self._build_thread is not None and self._build_thread.is_alive()
+
+    def build(self) -> bool:
+        """
+        Updates the index for pages that were added, changed or removed.
+
+        Returns:
+            True if the postings file is up to date, False if the build was
+            stopped or the index directory is not writable.
+        """
+        with self._build_lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                conn = self._open_db()
+            except (OSError, sqlite3.Error):
+                return False
+            try:
+                changed = self._update_documents(conn)
+                if changed is None:
+                    return False
+                if changed or not os.path.exists(self.postings_path):
+                    self._write_postings(conn)
+                return True
+            except (OSError, sqlite3.Error):
+                return False
+            finally:
+                conn.close()
+
+    def _open_db(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS documents")
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            " command TEXT NOT NULL,"
+            " source TEXT NOT NULL,"
+            " fingerprint TEXT NOT NULL,"
+            " section TEXT,"
+            " summary TEXT,"
+            " length INTEGER NOT NULL,"
+            " terms BLOB NOT NULL,"
+            " PRIMARY KEY (command, source))"
+        )
+        conn.commit()
+        return conn
+
+    def _sources(self):
+        """Yields ``(command, source, fingerprint, section, load)`` for every
+        document that should be in the index."""
+        for command, page in self.man_index.pages().items():
+            fingerprint = page_fingerprint(page)
+            if fingerprint is None:
+                continue
+            parts = split_page_name(os.path.basename(page))
+            section = parts[1] if parts else None
+            yield command, "man", fingerprint, section, self._man_loader(page)
+        if self.doc_cache is None:
+            return
+        for command, fingerprint, content in self.doc_cache.entries("help"):
+            if content:
+                yield command, "help", fingerprint, None, self._help_loader(content)
+
+    @staticmethod
+    def _man_loader(page):
+        def load():
+            try:
+                fragment = render_man_page(page)
+            except (UnsupportedRoff, OSError):
+                return "", ""
+            return man_summary(fragment), html_to_text(fragment)
+
+        return load
+
+    @staticmethod
+    def _help_loader(content):
+        def load():
+            lines = [line.strip() for line in content.splitlines() if line.strip()]
+            summary = next(
+                (line for line in lines if not line.lower().startswith("usage")), ""
+            )
+            return summary[:200], content
+
+        return load
+
+    def _update_documents(self, conn):
+        """Re-tokenizes stale documents; returns whether anything changed, or
+        None if the build was stopped."""
+        known = {
+            (command, source): fingerprint
+            for command, source, fingerprint in conn.execute(
+                "SELECT command, source, fingerprint FROM documents"
+            )
+        }
+        seen = set()
+        changed = False
+        pending = 0
+        for command, source, fingerprint, section, load in self._sources():
+            if self._stop.is_set():
+                conn.commit()
+                return None
+            key = (command, source)
+            seen.add(key)
+            if known.get(key) == fingerprint:
+                continue
+            summary, body = load()
+            terms = _weighted_terms(command, summary, body)
+            conn.execute(
+                "INSERT OR REPLACE INTO documents"
+                " (command, source, fingerprint, section, summary, length, terms)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    command,
+                    source,
+                    fingerprint,
+                    section,
+                    summary,
+                    sum(terms.values()),
+                    _encode_terms(terms),
+                ),
+            )
+            changed = True
+            pending += 1
+            if pending >= 200:
+                conn.commit()
+                pending = 0
+        removed = [key for key in known if key not in seen]
+        conn.executemany(
+            "DELETE FROM documents WHERE command = ? AND source = ?", removed
+        )
+        conn.commit()
+        return changed or bool(removed)
+
+    def _write_postings(self, conn):
+        labels = []
+        lengths = []
+        postings = {}
+        rows = conn.execute(
+            "SELECT command, source, section, summary, length, terms"
+            " FROM documents ORDER BY command, source"
+        )
+        for doc_id, (command, source, section, summary, length, blob) in enumerate(
+            rows
+        ):
+            labels.append(f"{command}\x1f{source}\x1f{section or ''}\x1f{summary}")
+            lengths.append(length)
+            for term, count in _decode_terms(blob):
+                entry = postings.get(term)
+                if entry is None:
+                    entry = postings[term] = array("I")
+                entry.append(doc_id)
+                entry.append(min(count, 0xFFFFFFFF))
+
+        strings = bytearray()
+        doc_table = bytearray()
+        for label, length in zip(labels, lengths):
+            encoded = label.encode()
+            doc_table += DOC_ENTRY.pack(length, len(strings), len(encoded))
+            strings += encoded
+        term_table = bytearray()
+        posting_data = array("I")
+        for term in sorted(postings):
+            encoded = term.encode()
+            entry = postings[term]
+            term_table += TERM_ENTRY.pack(
+                len(strings), len(encoded), len(posting_data) // 2, len(entry) // 2
+            )
+            strings += encoded
+            posting_data.extend(entry)
+        if sys.byteorder == "big":
+            posting_data.byteswap()
+
+        avgdl = sum(lengths) / len(lengths) if lengths else 0.0
+        doc_off = HEADER.size
+        strings_off = doc_off + len(doc_table)
+        terms_off = strings_off + len(strings)
+        postings_off = terms_off + len(term_table)
+        header = HEADER.pack(
+            POSTINGS_MAGIC,
+            SCHEMA_VERSION,
+            len(labels),
+            len(postings),
+            avgdl,
+            doc_off,
+            strings_off,
+            terms_off,
+            postings_off,
+        )
+        tmp_path = f"{self.postings_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.write(doc_table)
+            f.write(strings)
+            f.write(term_table)
+            posting_data.tofile(f)
+        os.replace(tmp_path, self.postings_path)
+
+    # -- querying ----------------------------------------------------------
+
+    def _reader(self):
+        """Returns the mapped postings file, remapping it after a rebuild."""
+        try:
+            st = os.stat(self.postings_path)
+        except OSError:
+            return None
+        identity = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if identity != self._mapped_identity:
+            if self._mapped is not None:
+                self._mapped.close()
+                self._mapped = None
+            self._mapped_identity = None
+            try:
+                with open(self.postings_path, "rb") as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                return None
+            header = HEADER.unpack_from(mapped, 0)
+            if header[0] != POSTINGS_MAGIC or header[1] != SCHEMA_VERSION:
+                mapped.close()
+                return None
+            self._mapped = mapped
+            self._mapped_identity = identity
+        return self._mapped
+
+    def is_ready(self) -> bool:
+        with self._reader_lock:
+            return self._reader() is not None
+
+    def _find_term(self, mapped, header, term):
+        _, _, _, term_count, _, _, strings_off, terms_off, _ = header
+        target = term.encode()
+        lo, hi = 0, term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = TERM_ENTRY.unpack_from(mapped, terms_off + mid * TERM_ENTRY.size)
+            start = strings_off + entry[0]
+            candidate = mapped[start : start + entry[1]]
+            if candidate == target:
+                return entry[2], entry[3]
+            if candidate < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def search(self, query: str, limit: int = 20) -> list[dict]:
+        """
+        Ranks documents against a free-text query with BM25.
+
+        Args:
+            query: Words describing what the user wants to do.
+            limit: Maximum number of results.
+
+        Returns:
+            Dicts with ``command``, ``source``, ``section``, ``summary`` and
+            ``score`` keys, best first; one entry per command. Empty if the
+            index has not been built yet.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        with self._reader_lock:
+            mapped = self._reader()
+            if mapped is None:
+                return []
+            header = HEADER.unpack_from(mapped, 0)
+            doc_count, avgdl = header[2], header[4] or 1.0
+            doc_off, strings_off, postings_off = header[5], header[6], header[8]
+
+            scores = {}
+            for term in terms:
+                found = self._find_term(mapped, header, term)
+                if found is None:
+                    continue
+                first, count = found
+                idf = math.log(1 + (doc_count - count + 0.5) / (count + 0.5))
+                begin = postings_off + first * POSTING.size
+                end = begin + count * POSTING.size
+                for doc_id, tf in POSTING.iter_unpack(mapped[begin:end]):
+                    length = DOC_ENTRY.unpack_from(
+                        mapped, doc_off + doc_id * DOC_ENTRY.size
+                    )[0]
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avgdl)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (
+                        BM25_K1 + 1
+                    ) / (tf + norm)
+
+            results = []
+            seen = set()
+            for doc_id, score in sorted(scores.items(), key=lambda item: -item[1]):
+                _, label_off, label_size = DOC_ENTRY.unpack_from(
+                    mapped, doc_off + doc_id * DOC_ENTRY.size
+                )
+                start = strings_off + label_off
+                label = mapped[start : start + label_size].decode()
+                command, source, section, summary = label.split("\x1f", 3)
+                if command in seen:
+                    continue
+                seen.add(command)
+                results.append(
+                    {
+                        "command": command,
+                        "source": source,
+                        "section": section or None,
+                        "summary": summary,
+                        "score": score,
+                    }
+                )
+                if len(results) >= limit:
+                    break
+            return results
+
+    def close(self):
+        self.stop()
+        with self._reader_lock:
+            if self._mapped is not None:
+                self._mapped.close()
+                self._mapped = None
+                self._mapped_identity = None
@@ -0,0 +1,149 @@
+import os
+from core.proc_tree import ProcessInfo, ProcessTree
+
+# Unix98 pseudo-terminal slaves (/dev/pts/N) use majors 136 to 143.
+PTS_MAJORS = range(136, 144)
+
+# Returned by _resolve when no resolver could answer.
+UNRESOLVED = object()
+
+
+class ResolverUnavailable(Exception):
+    """A resolver matched but couldn't reach the tool it queries."""
+
+
+def tty_numbers(tty_nr: int) -> tuple[int, int]:
+    """Splits a ``tty_nr`` from ``/proc/<pid>/stat`` into (major, minor)."""
+    return (tty_nr >> 8) & 0xFFF, (tty_nr & 0xFF) | ((tty_nr >> 12) & 0xFFF00)
+
+
+def tty_device(tty_nr: int) -> str | None:
+    """The /dev/pts path for a ``tty_nr`` from ``/proc/<pid>/stat``, if it is one."""
+    major, minor = tty_numbers(tty_nr)
+    if major not in PTS_MAJORS:
+        return None
+    return f"/dev/pts/{(major - PTS_MAJORS.start) * 256 + minor}"
+
+
+def _last_activity(device: str) -> float:
+    try:
+        st = os.stat(device)
+    except OSError:
+        return 0.0
+    return max(st.st_atime, st.st_mtime)
+
+
+def terminal_sessions(tree: ProcessTree, terminal_pid: int) -> list[ProcessInfo]:
+    """
+    The sessions a terminal emulator runs on its pseudo-terminals.
+
+    These are the descendants of ``terminal_pid`` that lead a session on a
+    /dev/pts slave: the shell of each tab or window, whatever the terminal.
+    """
+    sessions = []
+    for pid in tree.descendants(terminal_pid):
+        info = tree.get(pid)
+        if info is not None and info.session == pid and tty_device(info.tty_nr):
+            sessions.append(info)
+    return sessions
+
+
+def sessions_on_tty(tree: ProcessTree, device: str) -> list[ProcessInfo]:
+    """The sessions whose controlling terminal is ``device``, e.g. a tmux pane's."""
+    try:
+        rdev = os.stat(device).st_rdev
+    except OSError:
+        return []
+    numbers = (os.major(rdev), os.minor(rdev))
+    sessions = []
+    for pid in tree.pids():
+        info = tree.get(pid)
+        if info.session == pid and info.tty_nr and tty_numbers(info.tty_nr) == numbers:
+            sessions.append(info)
+    return sessions
+
+
+def session_foreground(tree: ProcessTree, session: ProcessInfo) -> ProcessInfo | None:
+    """The foreground job of ``session``, or None if its leader is in the foreground."""
+    # tpgid changes as jobs come and go, and the job may have exec'd since it
+    # was indexed, so both are read fresh.
+    current = tree.update(session.pid)
+    if current is None or current.tpgid <= 0 or current.tpgid == session.pid:
+        return None
+    return tree.update(current.tpgid)
+
+
+def active_session(tree: ProcessTree, terminal_pid: int) -> ProcessInfo | None:
+    """
+    The session in the visible tab of the terminal emulator ``terminal_pid``.
+
+    When the terminal runs several sessions, the one whose pseudo-terminal
+    was used last is taken to be the visible one.
+    """
+    sessions = terminal_sessions(tree, terminal_pid)
+    if not sessions:
+        return None
+    return max(sessions, key=lambda s: (_last_activity(tty_device(s.tty_nr)), s.pid))
+
+
+def foreground_process(tree: ProcessTree, terminal_pid: int) -> ProcessInfo | None:
+    """
+    The foreground job of the terminal emulator ``terminal_pid``.
+
+    Each session's ``tpgid`` names the process group in the foreground of its
+    terminal. Returns None when the terminal has no sessions or its shell
+    itself is in the foreground.
+    """
+    session = active_session(tree, terminal_pid)
+    return session_foreground(tree, session) if session is not None else None
+
+
+def tty_foreground_command(tree: ProcessTree, device: str) -> str | None:
+    """The command line of the foreground job on the terminal ``device``."""
+    sessions = sessions_on_tty(tree, device)
+    if not sessions:
+        return None
+    process = session_foreground(tree, max(sessions, key=lambda s: s.pid))
+    return tree.cmdline(process.pid) if process is not None else None
+
+
+def foreground_command(
+    tree: ProcessTree, terminal_pid: int, resolvers=()
+) -> str | None:
+    """
+    The command line of the terminal's foreground job, if it has one.
+
+    ``resolvers`` (see :mod:`core.terminal_resolvers`) are offered the
+    terminal itself and then its foreground process; the first one that
+    matches answers for it. This is how the active pane of a multiplexer, or
+    of a terminal whose shells aren't its descendants, is found.
+    """
+    tree.refresh()
+    # The terminal and the processes below are what resolvers match on, by
+    # comm, so their entries are re-read in case they exec'd since indexed.
+    terminal = tree.update(terminal_pid)
+    if terminal is not None:
+        command = _resolve(resolvers, tree, terminal)
+        if command is not UNRESOLVED:
+            return command
+    session = active_session(tree, terminal_pid)
+    if session is None:
+        return None
+    process = session_foreground(tree, session)
+    # A terminal started straight into a multiplexer has it as its session
+    # leader, so the leader is offered to the resolvers too.
+    session = tree.get(session.pid) or session
+    command = _resolve(resolvers, tree, process or session)
+    if command is not UNRESOLVED:
+        return command
+    return tree.cmdline(process.pid) if process is not None else None
+
+
+def _resolve(resolvers, tree, process):
+    for resolver in resolvers:
+        if resolver.matches(process):
+            try:
+                return resolver.resolve(tree, process)
+            except ResolverUnavailable:
+                continue
+    return UNRESOLVED
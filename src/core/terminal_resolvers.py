@@ -0,0 +1,513 @@
+import json
+import os
+import queue
+import socket
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from core.proc_tree import ProcessInfo, ProcessTree
+from core.terminal import ResolverUnavailable, tty_foreground_command
+
+# How long to wait for a multiplexer or terminal to answer a query.
+QUERY_TIMEOUT = 1.0
+
+# tmux only notifies a control client about the sessions it can see, so a
+# cached pane is also re-read after this many seconds.
+TMUX_CACHE_TTL = 2.0
+
+
+class TerminalResolver(ABC):
+    """
+    Finds the command in the active pane of a terminal or multiplexer by asking
+    it directly, for tools where the process tree alone can't tell.
+
+    :meth:`resolve` returns the command line, or None if the active pane is
+    sitting at its shell prompt, and raises :class:`ResolverUnavailable` when
+    the tool can't be reached so that the next resolver, or the TTY-based
+    lookup, is tried instead.
+    """
+
+    @abstractmethod
+    def matches(self, process: ProcessInfo) -> bool:
+        """Whether ``process`` is the terminal or client this resolver asks."""
+
+    @abstractmethod
+    def resolve(self, tree: ProcessTree, process: ProcessInfo) -> str | None:
+        """The command in the active pane of ``process``."""
+
+    def invalidate(self):
+        """The focused terminal's title changed, so its active pane may have."""
+
+    def release(self):
+        """The terminal last resolved lost focus: drop what was held for it."""
+
+    def close(self):
+        """Drops any connections kept open between queries."""
+        self.release()
+
+
+class TmuxControl:
+    """
+    A read-only tmux control-mode client (``tmux -C``) attached to one
+    session of one server.
+
+    Commands are written to its stdin and their ``%begin``/``%end`` blocks are
+    read back by a reader thread. Any notification from the server bumps
+    ``generation``, so callers can tell whether something may have changed
+    since they last asked.
+    """
+
+    def __init__(self, socket_path: str, session: str):
+        self.socket_path = socket_path
+        self.session = session
+        self.generation = 0
+        self._replies = queue.Queue()
+        self._lock = threading.Lock()
+        self._process = subprocess.Popen(
+            [
+                "tmux",
+                "-S",
+                socket_path,
+                "-C",
+                "attach-session",
+                "-r",
+                "-t",
+                session,
+                "-f",
+                "no-output,ignore-size",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            errors="replace",
+        )
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+        # The attach itself is answered with an empty block.
+        self._reply()
+
+    def _read(self):
+        block = None
+        for line in self._process.stdout:
+            line = line.rstrip("\n")
+            if block is not None:
+                if line.startswith(("%end ", "%error ")):
+                    self._replies.put((line.startswith("%end "), block))
+                    block = None
+                else:
+                    block.append(line)
+            elif line.startswith("%begin "):
+                block = []
+            elif line.startswith("%") and not line.startswith("%output "):
+                self.generation += 1
+        self._replies.put(None)
+
+    def _reply(self) -> list[str]:
+        try:
+            reply = self._replies.get(timeout=QUERY_TIMEOUT)
+        except queue.Empty:
+            self.close()
+            raise ResolverUnavailable("tmux did not answer")
+        if reply is None:
+            raise ResolverUnavailable("tmux control client exited")
+        ok, lines = reply
+        if not ok:
+            raise ResolverUnavailable("\n".join(lines))
+        return lines
+
+    def is_alive(self) -> bool:
+        return self._process.poll() is None
+
+    def command(self, command: str) -> list[str]:
+        with self._lock:
+            if not self.is_alive():
+                raise ResolverUnavailable("tmux control client exited")
+            try:
+                self._process.stdin.write(command + "\n")
+                self._process.stdin.flush()
+            except OSError:
+                raise ResolverUnavailable("tmux control client exited")
+            return self._reply()
+
+    def close(self):
+        if self._process.poll() is None:
+            try:
+                self._process.stdin.close()
+            except OSError:
+                pass
+            try:
+                self._process.wait(timeout=QUERY_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+
+
+class TmuxResolver(TerminalResolver):
+    """
+    Resolves a tmux client to the command in its session's active pane.
+
+    The server a client talks to is found once with a one-off
+    ``list-clients``, which doesn't attach. While that client's terminal
+    has focus, one control-mode client is kept attached to the same session
+    of that server, so pane and window changes arrive as notifications; it
+    is detached again by :meth:`release` when focus moves away. The active
+    pane is cached until a notification or :data:`TMUX_CACHE_TTL`; the
+    command in the pane is always read fresh from its terminal's foreground
+    process group.
+    """
+
+    def __init__(self):
+        self._servers = {}
+        self._control = None
+        self._panes = {}
+
+    def matches(self, process):
+        # An attached client renames itself "tmux: client".
+        return process.comm in ("tmux", "tmux: client")
+
+    def socket_paths(self, tree, process) -> list[str]:
+        """
+        Server sockets the tmux client ``process`` may be talking to.
+
+        An attached client renames itself, hiding its ``-L``/``-S`` options,
+        so every socket in its tmux socket directory is a candidate; the one
+        whose server lists the client is the right one.
+        """
+        env = tree.environ(process.pid)
+        try:
+            uid = os.stat(f"{tree.proc}/{process.pid}").st_uid
+        except OSError:
+            uid = os.getuid()
+        directory = os.path.join(env.get("TMUX_TMPDIR") or "/tmp", f"tmux-{uid}")
+
+        paths = []
+        argv = tree.argv(process.pid)
+        for index, arg in enumerate(argv[1:], start=1):
+            if not arg.startswith("-") or arg == "--":
+                break
+            if arg[:2] in ("-S", "-L"):
+                value = arg[2:] or (argv[index + 1] if index + 1 < len(argv) else "")
+                paths.append(
+                    value if arg[:2] == "-S" else os.path.join(directory, value)
+                )
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError:
+            names = []
+        paths.extend(os.path.join(directory, name) for name in names)
+        return list(dict.fromkeys(paths))
+
+    @staticmethod
+    def _list_clients(path) -> list[tuple[str, str]]:
+        """``(client pid, session id)`` for each client of the server at ``path``."""
+        try:
+            result = subprocess.run(
+                [
+                    "tmux",
+                    "-S",
+                    path,
+                    "list-clients",
+                    "-F",
+                    "#{client_pid}\t#{session_id}",
+                ],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                timeout=QUERY_TIMEOUT,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return []
+        if result.returncode != 0:
+            return []
+        clients = []
+        for line in result.stdout.splitlines():
+            pid, _, session = line.partition("\t")
+            clients.append((pid, session))
+        return clients
+
+    def server(self, tree, process) -> tuple[str, str]:
+        """The socket path and session of the server that lists ``process``."""
+        key = (process.pid, process.start_time)
+        server = self._servers.get(key)
+        if server is None:
+            for path in self.socket_paths(tree, process):
+                session = next(
+                    (
+                        session
+                        for pid, session in self._list_clients(path)
+                        if pid == str(process.pid)
+                    ),
+                    None,
+                )
+                if session:
+                    server = self._servers[key] = (path, session)
+                    break
+            else:
+                raise ResolverUnavailable("no tmux server lists this client")
+        return server
+
+    def _attach(self, path, session) -> TmuxControl:
+        control = self._control
+        if (
+            control is not None
+            and control.is_alive()
+            and (control.socket_path, control.session) == (path, session)
+        ):
+            return control
+        self.release()
+        try:
+            self._control = TmuxControl(path, session)
+        except OSError as e:
+            raise ResolverUnavailable(str(e))
+        return self._control
+
+    def _active_pane(self, control, pid) -> str | None:
+        """The terminal of the active pane of tmux client ``pid``, if attached."""
+        lines = control.command("list-clients -F '#{client_pid}\t#{pane_tty}'")
+        for line in lines:
+            client_pid, _, pane_tty = line.partition("\t")
+            if client_pid == str(pid) and pane_tty:
+                return pane_tty
+        return None
+
+    def resolve(self, tree, process):
+        key = (process.pid, process.start_time)
+        try:
+            path, session = self.server(tree, process)
+            control = self._attach(path, session)
+        except ResolverUnavailable:
+            self._servers.pop(key, None)
+            raise
+        cached = self._panes.get(key)
+        now = time.monotonic()
+        if cached is not None:
+            generation, fetched, pane_tty = cached
+            if control.generation == generation and now - fetched <= TMUX_CACHE_TTL:
+                return tty_foreground_command(tree, pane_tty)
+
+        generation = control.generation
+        try:
+            pane_tty = self._active_pane(control, process.pid)
+        except ResolverUnavailable:
+            self._servers.pop(key, None)
+            raise
+        if not pane_tty:
+            # The client moved to another server or session.
+            self._servers.pop(key, None)
+            raise ResolverUnavailable("tmux no longer lists this client")
+        self._panes[key] = (generation, now, pane_tty)
+        return tty_foreground_command(tree, pane_tty)
+
+    def release(self):
+        if self._control is not None:
+            self._control.close()
+            self._control = None
+        self._panes.clear()
+
+    def close(self):
+        self.release()
+        self._servers.clear()
+
+
+class KittyResolver(TerminalResolver):
+    """
+    Asks kitty, over its remote-control socket, what runs in the focused
+    window.
+
+    This needs kitty's ``listen_on`` (or ``--listen-on``) and
+    ``allow_remote_control``; without them the TTY-based lookup is used. kitty
+    sends no change notifications, so nothing is cached beyond the socket
+    address: the detector only asks again when X reports a focus or title
+    change, which is kitty's notification in practice.
+    """
+
+    def __init__(self):
+        self._addresses = {}
+
+    def matches(self, process):
+        return process.comm == "kitty"
+
+    def address(self, tree, process) -> str | None:
+        cached = self._addresses.get((process.pid, process.start_time))
+        if cached is not None:
+            return cached
+        argv = tree.argv(process.pid)
+        address = None
+        for index, arg in enumerate(argv):
+            if arg.startswith("--listen-on="):
+                address = arg.partition("=")[2]
+            elif arg == "--listen-on" and index + 1 < len(argv):
+                address = argv[index + 1]
+        # kitty appends its PID to a configured unix socket path, so the
+        # address its own children were given is the reliable one.
+        for child in tree.children(process.pid):
+            address = tree.environ(child).get("KITTY_LISTEN_ON") or address
+            if address:
+                break
+        if address:
+            self._addresses[(process.pid, process.start_time)] = address
+        return address
+
+    @staticmethod
+    def _connect(address: str) -> socket.socket:
+        if address.startswith("unix:"):
+            path = address[len("unix:") :]
+            if path.startswith("@"):
+                path = "\0" + path[1:]
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(QUERY_TIMEOUT)
+            sock.connect(path)
+            return sock
+        if address.startswith("tcp:"):
+            host, _, port = address[len("tcp:") :].rpartition(":")
+            return socket.create_connection((host, int(port)), QUERY_TIMEOUT)
+        raise ResolverUnavailable(f"unsupported kitty address {address!r}")
+
+    @classmethod
+    def query(cls, address: str, command: dict) -> dict:
+        """Sends one remote-control command and returns kitty's response."""
+        payload = json.dumps(command).encode()
+        try:
+            with cls._connect(address) as sock:
+                sock.sendall(b"\x1bP@kitty-cmd" + payload + b"\x1b\\")
+                data = b""
+                while not data.endswith(b"\x1b\\"):
+                    chunk = sock.recv(65536)
+                    if not chunk:
+                        break
+                    data += chunk
+        except (OSError, ValueError) as e:
+            raise ResolverUnavailable(str(e))
+        start = data.find(b"@kitty-cmd")
+        if start < 0 or not data.endswith(b"\x1b\\"):
+            raise ResolverUnavailable("malformed kitty response")
+        try:
+            return json.loads(data[start + len(b"@kitty-cmd") : -2])
+        except ValueError:
+            raise ResolverUnavailable("malformed kitty response")
+
+    def resolve(self, tree, process):
+        address = self.address(tree, process)
+        if not address:
+            raise ResolverUnavailable("kitty remote control is not enabled")
+        response = self.query(address, {"cmd": "ls", "version": [0, 26, 0]})
+        if not response.get("ok"):
+            raise ResolverUnavailable(response.get("error", "kitty refused"))
+        data = response.get("data")
+        os_windows = json.loads(data) if isinstance(data, str) else data
+
+        window = _focused(_focused(_focused(os_windows, "tabs"), "windows"))
+        if window is None:
+            raise ResolverUnavailable("no focused kitty window")
+        shell_pid = window.get("pid")
+        for foreground in window.get("foreground_processes", []):
+            if foreground.get("pid") != shell_pid and foreground.get("cmdline"):
+                return " ".join(foreground["cmdline"])
+        return None
+
+
+def _focused(items, children=None):
+    """The focused (else active) entry of a kitty ``ls`` level."""
+    if items is None:
+        return None
+    chosen = next((i for i in items if i.get("is_focused")), None)
+    chosen = chosen or next((i for i in items if i.get("is_active")), None)
+    if chosen is None or children is None:
+        return chosen
+    return chosen.get(children)
+
+
+class WezTermResolver(TerminalResolver):
+    """
+    Asks WezTerm which pane is focused, through ``wezterm cli``'s JSON output.
+
+    WezTerm's shells usually belong to a separate mux server rather than the
+    GUI process, so the process tree can't find them. Its mux socket speaks a
+    private binary protocol, so ``wezterm cli`` is used to talk to it.
+
+    The focused pane's terminal is cached per WezTerm process until focus
+    moves (:meth:`release`) or the window's title changes
+    (:meth:`invalidate`), which WezTerm does whenever another pane or tab is
+    activated; until then no ``wezterm cli`` process is spawned. The terminal
+    of each pane is also cached by pane id, which it keeps for life.
+    """
+
+    def __init__(self):
+        self._pane_ttys = {}
+        self._focused = {}
+
+    def matches(self, process):
+        return process.comm.startswith("wezterm")
+
+    def _cli(self, env, *args):
+        try:
+            result = subprocess.run(
+                ["wezterm", "cli", *args, "--format", "json"],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env=env,
+                timeout=QUERY_TIMEOUT,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise ResolverUnavailable(str(e))
+        if result.returncode != 0:
+            raise ResolverUnavailable("wezterm cli failed")
+        try:
+            return json.loads(result.stdout)
+        except ValueError:
+            raise ResolverUnavailable("malformed wezterm output")
+
+    def _environment(self, tree, process):
+        env = dict(os.environ)
+        for child in tree.descendants(process.pid):
+            socket_path = tree.environ(child).get("WEZTERM_UNIX_SOCKET")
+            if socket_path:
+                env["WEZTERM_UNIX_SOCKET"] = socket_path
+                break
+        return env
+
+    def resolve(self, tree, process):
+        key = (process.pid, process.start_time)
+        pane_tty = self._focused.get(key)
+        if pane_tty is None:
+            pane_tty = self._focused[key] = self._focused_pane_tty(tree, process)
+        return tty_foreground_command(tree, pane_tty)
+
+    def _focused_pane_tty(self, tree, process) -> str:
+        env = self._environment(tree, process)
+        clients = self._cli(env, "list-clients")
+        if not clients:
+            raise ResolverUnavailable("no wezterm clients")
+        client = next((c for c in clients if c.get("pid") == process.pid), None)
+        if client is None:
+            client = min(clients, key=lambda c: _duration(c.get("idle_time")))
+        pane_id = client.get("focused_pane_id")
+        if pane_id not in self._pane_ttys:
+            for pane in self._cli(env, "list"):
+                self._pane_ttys[pane.get("pane_id")] = pane.get("tty_name")
+        pane_tty = self._pane_ttys.get(pane_id)
+        if not pane_tty:
+            raise ResolverUnavailable("focused wezterm pane has no terminal")
+        return pane_tty
+
+    def invalidate(self):
+        self._focused.clear()
+
+    def release(self):
+        self._focused.clear()
+
+
+def _duration(value) -> float:
+    """Seconds in a serialized Rust ``Duration`` (``{"secs", "nanos"}``)."""
+    if isinstance(value, dict):
+        return value.get("secs", 0) + value.get("nanos", 0) / 1e9
+    return float("inf")
+
+
+def default_resolvers() -> list[TerminalResolver]:
+    return [TmuxResolver(), KittyResolver(), WezTermResolver()]
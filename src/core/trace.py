@@ -0,0 +1,188 @@
+import gzip
+import json
+import statistics
+import time
+from PyQt6.QtCore import QTimer, pyqtSignal
+from core.app_detector import AppDetector
+from core.window_snapshot import WindowSnapshot
+
+TRACE_FORMAT = "wingman-window-trace"
+TRACE_VERSION = 1
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def encode_snapshot(offset: float, snapshot: WindowSnapshot) -> str:
+    return json.dumps(
+        [
+            round(offset, 4),
+            snapshot.window_id,
+            snapshot.title,
+            snapshot.pid,
+            snapshot.process_name,
+            snapshot.app_name,
+            list(snapshot.geometry) if snapshot.geometry else None,
+        ],
+        separators=(",", ":"),
+    )
+
+
+def decode_snapshot(line: str) -> tuple[float, WindowSnapshot]:
+    offset, window_id, title, pid, process_name, app_name, geometry = json.loads(line)
+    geometry = tuple(geometry) if geometry else None
+    return offset, WindowSnapshot(
+        window_id, title, pid, process_name, app_name, geometry
+    )
+
+
+def read_trace(path: str) -> list[tuple[float, WindowSnapshot]]:
+    """
+    Reads a trace written by :class:`TraceRecorder`.
+
+    Raises:
+        ValueError: If the file isn't a trace this version can read.
+    """
+    with _open(path, "r") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != TRACE_FORMAT:
+            raise ValueError(f"{path} is not a window trace")
+        if header.get("version") != TRACE_VERSION:
+            raise ValueError(f"unsupported trace version {header.get('version')}")
+        return [decode_snapshot(line) for line in f if line.strip()]
+
+
+class TraceRecorder:
+    """
+    Writes every snapshot published by a detector to a trace file.
+
+    A trace is JSON Lines: a header object, then one compact array per
+    snapshot, prefixed with its offset in seconds from the start of the
+    recording. Paths ending in ``.gz`` are gzip-compressed.
+    """
+
+    def __init__(self, detector: AppDetector, path: str):
+        self.path = path
+        self._file = _open(path, "w")
+        header = {"format": TRACE_FORMAT, "version": TRACE_VERSION}
+        self._file.write(json.dumps(header) + "\n")
+        self._start = time.monotonic()
+        self._detector = detector
+        detector.snapshots.snapshot_changed.connect(self.record)
+
+    def record(self, snapshot: WindowSnapshot):
+        offset = time.monotonic() - self._start
+        self._file.write(encode_snapshot(offset, snapshot) + "\n")
+
+    def close(self):
+        if self._file is not None:
+            self._detector.snapshots.snapshot_changed.disconnect(self.record)
+            self._file.close()
+            self._file = None
+
+
+class ReplayAppDetector(AppDetector):
+    """
+    Replays a recorded trace in place of a live detector, so detection and
+    docking can be reproduced and measured without a desktop.
+
+    ``speed`` scales the recorded timing; 0 replays every snapshot as soon as
+    the event loop is free. Snapshots are scheduled against the replay's start
+    time rather than each other, so timer overhead doesn't accumulate.
+    """
+
+    finished = pyqtSignal()
+
+    def __init__(self, path: str, speed: float = 1.0):
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self.trace = read_trace(path)
+        self._index = 0
+        self._start = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._step)
+
+    def start(self):
+        self._index = 0
+        self._start = time.monotonic()
+        self._schedule()
+
+    def stop(self):
+        self._timer.stop()
+
+    def _schedule(self):
+        if self._index >= len(self.trace):
+            # From the event loop, so that an empty trace still reaches slots
+            # connected after start().
+            QTimer.singleShot(0, self.finished.emit)
+            return
+        delay = 0.0
+        if self.speed > 0:
+            offset = self.trace[self._index][0] / self.speed
+            delay = max(offset - (time.monotonic() - self._start), 0.0)
+        self._timer.start(int(delay * 1000))
+
+    def _step(self):
+        _, snapshot = self.trace[self._index]
+        self._index += 1
+        self.snapshots.publish(snapshot)
+        self._schedule()
+
+
+class Benchmark:
+    """
+    Measures GUI-thread CPU time per published snapshot, and the latency from
+    the last geometry change being published to the panel being repositioned
+    for it. Timing starts at the first snapshot, so start-up isn't counted;
+    it must be created on the GUI thread.
+    """
+
+    def __init__(self, detector: AppDetector):
+        self.events = 0
+        self.latencies = []
+        self._changed_at = None
+        self._cpu_start = None
+        self._wall_start = None
+        detector.snapshots.snapshot_changed.connect(self._on_snapshot)
+        detector.snapshots.geometry_changed.connect(self._on_geometry_changed)
+
+    def _on_snapshot(self, snapshot: WindowSnapshot):
+        if self._cpu_start is None:
+            self._cpu_start = time.thread_time()
+            self._wall_start = time.monotonic()
+        self.events += 1
+
+    def _on_geometry_changed(self, snapshot: WindowSnapshot):
+        self._changed_at = time.monotonic()
+
+    def repositioned(self):
+        if self._changed_at is not None:
+            self.latencies.append(time.monotonic() - self._changed_at)
+            self._changed_at = None
+
+    def report(self) -> str:
+        if not self.events:
+            return "events:       0"
+        cpu = time.thread_time() - self._cpu_start
+        wall = time.monotonic() - self._wall_start
+        lines = [
+            f"events:       {self.events}",
+            f"wall time:    {wall:.3f} s",
+            f"gui cpu time: {cpu:.3f} s",
+        ]
+        lines.append(f"cpu/event:    {cpu / self.events * 1e6:.0f} us")
+        if self.latencies:
+            ms = sorted(latency * 1000 for latency in self.latencies)
+            p95 = ms[min(int(len(ms) * 0.95), len(ms) - 1)]
+            lines += [
+                f"repositions:  {len(ms)}",
+                f"latency p50:  {statistics.median(ms):.1f} ms",
+                f"latency p95:  {p95:.1f} ms",
+                f"latency max:  {ms[-1]:.1f} ms",
+            ]
+        return "\n".join(lines)
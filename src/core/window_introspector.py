@@ -0,0 +1,208 @@
+import Xlib.error
+import Xlib.X
+import Xlib.Xatom
+from Xlib.protocol import request
+
+# Property lengths requested up front, in 32-bit units. Anything longer is
+# fetched with a second request, which only very long titles need.
+TEXT_LENGTH = 256
+CARDINAL_LENGTH = 4
+
+TITLE = "title"
+WM_CLASS = "wm_class"
+PID = "pid"
+GEOMETRY = "geometry"
+ALL_FIELDS = (TITLE, WM_CLASS, PID, GEOMETRY)
+
+
+class AtomCache:
+    """Interns each atom name once per display connection."""
+
+    def __init__(self, display):
+        self.display = display
+        self._atoms = {}
+
+    def __getitem__(self, name: str) -> int:
+        atom = self._atoms.get(name)
+        if atom is None:
+            atom = self._atoms[name] = self.display.intern_atom(name)
+        return atom
+
+    def preload(self, names):
+        """Interns ``names`` in one pipelined batch instead of one round-trip each."""
+        pending = {
+            name: request.InternAtom(
+                display=self.display.display, defer=True, name=name, only_if_exists=0
+            )
+            for name in names
+            if name not in self._atoms
+        }
+        for name, reply in pending.items():
+            reply.reply()
+            self._atoms[name] = reply.atom
+
+
+class WindowIntrospector:
+    """
+    Reads a window's title, class, PID and geometry in a single round-trip.
+
+    python-xlib normally waits for each reply before sending the next request.
+    Here every request for a window is sent with ``defer=True`` and the replies
+    are collected afterwards, so the whole batch costs one round-trip to the X
+    server however many properties, or windows, are read.
+    """
+
+    def __init__(self, display, atoms: AtomCache | None = None):
+        self.display = display
+        self.root = display.screen().root
+        self.atoms = atoms or AtomCache(display)
+        self.atoms.preload(
+            ["_NET_WM_NAME", "_NET_WM_PID", "_NET_FRAME_EXTENTS", "UTF8_STRING"]
+        )
+
+    def _get_property(self, window, atom, length):
+        return request.GetProperty(
+            display=self.display.display,
+            defer=True,
+            delete=False,
+            window=window.id,
+            property=atom,
+            type=Xlib.X.AnyPropertyType,
+            long_offset=0,
+            long_length=length,
+        )
+
+    def query(self, window, fields=ALL_FIELDS) -> dict | None:
+        """
+        Reads ``fields`` of ``window``.
+
+        Returns:
+            A dict with an entry for each requested field (``None`` where the
+            window doesn't set it), or None if the window is gone.
+        """
+        return self.query_many([window], fields)[window.id]
+
+    def query_many(self, windows, fields=ALL_FIELDS) -> dict[int, dict | None]:
+        """Like :meth:`query` for several windows, still in one round-trip."""
+        return self.query_each([(window, fields) for window in windows])
+
+    def query_each(self, queries) -> dict[int, dict | None]:
+        """Reads each ``(window, fields)`` pair in ``queries``, in one round-trip."""
+        pending = [
+            (window, fields, self._send(window, fields)) for window, fields in queries
+        ]
+        return {
+            window.id: self._collect(window, fields, requests)
+            for window, fields, requests in pending
+        }
+
+    def _send(self, window, fields) -> dict:
+        atoms = self.atoms
+        pending = {}
+        if TITLE in fields:
+            pending["net_wm_name"] = self._get_property(
+                window, atoms["_NET_WM_NAME"], TEXT_LENGTH
+            )
+            pending["wm_name"] = self._get_property(
+                window, Xlib.Xatom.WM_NAME, TEXT_LENGTH
+            )
+        if WM_CLASS in fields:
+            pending["wm_class"] = self._get_property(
+                window, Xlib.Xatom.WM_CLASS, TEXT_LENGTH
+            )
+        if PID in fields:
+            pending["pid"] = self._get_property(
+                window, atoms["_NET_WM_PID"], CARDINAL_LENGTH
+            )
+        if GEOMETRY in fields:
+            pending["geometry"] = request.GetGeometry(
+                display=self.display.display, defer=True, drawable=window.id
+            )
+            pending["position"] = request.TranslateCoords(
+                display=self.display.display,
+                defer=True,
+                src_wid=window.id,
+                dst_wid=self.root.id,
+                src_x=0,
+                src_y=0,
+            )
+            pending["frame"] = self._get_property(
+                window, atoms["_NET_FRAME_EXTENTS"], CARDINAL_LENGTH
+            )
+        return pending
+
+    def _collect(self, window, fields, pending) -> dict | None:
+        atoms = self.atoms
+        replies = {}
+        gone = False
+        for key, reply in pending.items():
+            try:
+                reply.reply()
+                replies[key] = reply
+            except Xlib.error.BadWindow:
+                gone = True
+            except Xlib.error.XError:
+                replies[key] = None
+        if gone:
+            return None
+
+        info = {}
+        if TITLE in fields:
+            info[TITLE] = self._text(
+                window, atoms["_NET_WM_NAME"], replies["net_wm_name"]
+            ) or self._text(window, Xlib.Xatom.WM_NAME, replies["wm_name"])
+        if WM_CLASS in fields:
+            value = self._text(window, Xlib.Xatom.WM_CLASS, replies["wm_class"])
+            parts = value.split("\0") if value else []
+            info[WM_CLASS] = (parts[0], parts[1]) if len(parts) >= 2 else None
+        if PID in fields:
+            values = self._cardinals(replies["pid"])
+            info[PID] = values[0] if values else None
+        if GEOMETRY in fields:
+            info[GEOMETRY] = self._geometry(replies)
+        return info
+
+    def _text(self, window, atom, reply) -> str | None:
+        if reply is None or not reply.property_type:
+            return None
+        fmt, value = reply.value
+        if fmt != 8:
+            return None
+        if reply.bytes_after:
+            try:
+                rest = window.get_property(
+                    atom,
+                    reply.property_type,
+                    TEXT_LENGTH,
+                    reply.bytes_after // 4 + 1,
+                )
+            except Xlib.error.XError:
+                rest = None
+            if rest is not None:
+                value += rest.value
+        if reply.property_type == self.atoms["UTF8_STRING"]:
+            return value.decode("utf-8", errors="replace")
+        return value.decode("latin-1")
+
+    @staticmethod
+    def _cardinals(reply) -> list[int]:
+        if reply is None or not reply.property_type:
+            return []
+        fmt, value = reply.value
+        return list(value) if fmt == 32 else []
+
+    def _geometry(self, replies) -> tuple[int, int, int, int] | None:
+        geom = replies["geometry"]
+        position = replies["position"]
+        if geom is None or position is None:
+            return None
+        x, y = position.x, position.y
+        width, height = geom.width, geom.height
+        extents = self._cardinals(replies["frame"])
+        if len(extents) >= 4:
+            left, right, top, bottom = extents[:4]
+            x -= left
+            y -= top
+            width += left + right
+            height += top + bottom
+        return (int(x), int(y), int(width), int(height))
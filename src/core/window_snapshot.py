@@ -0,0 +1,188 @@
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+FOCUS = "focus"
+GEOMETRY = "geometry"
+TITLE = "title"
+
+
+class WindowSnapshot:
+    """
+    Immutable description of the focused window at one point in time.
+
+    ``geometry`` is an ``(x, y, width, height)`` tuple of the window including
+    its frame. Use :meth:`replace` to derive an updated snapshot.
+    """
+
+    __slots__ = ("window_id", "title", "pid", "process_name", "app_name", "geometry")
+
+    def __init__(
+        self,
+        window_id: int,
+        title: str,
+        pid: int | None,
+        process_name: str,
+        app_name: str,
+        geometry: tuple[int, int, int, int] | None,
+    ):
+        setter = object.__setattr__
+        setter(self, "window_id", window_id)
+        setter(self, "title", title)
+        setter(self, "pid", pid)
+        setter(self, "process_name", process_name)
+        setter(self, "app_name", app_name)
+        setter(self, "geometry", geometry)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("WindowSnapshot is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("WindowSnapshot is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, WindowSnapshot):
+            return NotImplemented
+        return all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, s) for s in self.__slots__))
+
+    def __repr__(self):
+        fields = ", ".join(f"{s}={getattr(self, s)!r}" for s in self.__slots__)
+        return f"WindowSnapshot({fields})"
+
+    def replace(self, **changes) -> "WindowSnapshot":
+        fields = {s: getattr(self, s) for s in self.__slots__}
+        fields.update(changes)
+        return WindowSnapshot(**fields)
+
+    def geometry_dict(self) -> dict:
+        """The geometry in the ``{"x", "y", "width", "height"}`` form the UI uses."""
+        if self.geometry is None:
+            return {}
+        x, y, width, height = self.geometry
+        return {"x": x, "y": y, "width": width, "height": height}
+
+    def diff(self, other: "WindowSnapshot | None") -> set[str]:
+        """What changed going from ``other`` to this snapshot."""
+        if other is None or other.window_id != self.window_id:
+            return {FOCUS, GEOMETRY, TITLE}
+        changes = set()
+        if other.geometry != self.geometry:
+            changes.add(GEOMETRY)
+        if other.title != self.title or other.app_name != self.app_name:
+            changes.add(TITLE)
+        return changes
+
+
+class WindowSnapshotService(QObject):
+    """
+    Holds the latest :class:`WindowSnapshot` and tells consumers what changed.
+
+    The detector samples the focused window once and publishes the result
+    here, so the cost of a sample doesn't grow with the number of consumers.
+    Each signal carries the new snapshot; ``snapshot_changed`` fires once per
+    publish that changed anything, after the more specific signals.
+    """
+
+    focus_changed = pyqtSignal(object)
+    geometry_changed = pyqtSignal(object)
+    title_changed = pyqtSignal(object)
+    snapshot_changed = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.current = None
+
+    @pyqtSlot(object)
+    def publish(self, snapshot: WindowSnapshot) -> set[str]:
+        """Makes ``snapshot`` current and emits a signal for each change."""
+        changes = snapshot.diff(self.current)
+        if not changes:
+            return changes
+        self.current = snapshot
+        if FOCUS in changes:
+            self.focus_changed.emit(snapshot)
+        if GEOMETRY in changes:
+            self.geometry_changed.emit(snapshot)
+        if TITLE in changes:
+            self.title_changed.emit(snapshot)
+        self.snapshot_changed.emit(snapshot)
+        return changes
+
+
+class DesktopModel(QObject):
+    """
+    The latest snapshot of every managed window, in stacking order, with
+    values derived from each one computed ahead of time.
+
+    Consumers register precomputers with :meth:`add_precomputer`; each value
+    is recomputed only when its key for that window changes, so by the time
+    a window gains focus, everything derived from it is a table lookup.
+    """
+
+    changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.windows = {}
+        self.stacking = ()
+        self._precomputers = {}
+        self._derived = {}
+
+    def add_precomputer(self, name: str, key, compute):
+        """Keep ``compute(snapshot)`` for every window, redone when ``key(snapshot)`` changes."""
+        self._precomputers[name] = (key, compute)
+        for snapshot in self.windows.values():
+            self._precompute(name, snapshot)
+
+    def invalidate(self, name: str):
+        """Recompute ``name`` for every window, e.g. after the screens changed."""
+        for window_id in self.windows:
+            self._derived.pop((name, window_id), None)
+        for snapshot in self.windows.values():
+            self._precompute(name, snapshot)
+
+    def _precompute(self, name, snapshot):
+        key, compute = self._precomputers[name]
+        k = key(snapshot)
+        cached = self._derived.get((name, snapshot.window_id))
+        if cached is None or cached[0] != k:
+            self._derived[(name, snapshot.window_id)] = (k, compute(snapshot))
+
+    def lookup(self, name: str, snapshot: WindowSnapshot):
+        """The value of ``name`` for ``snapshot``, computing it if it isn't ready."""
+        key, compute = self._precomputers[name]
+        cached = self._derived.get((name, snapshot.window_id))
+        if cached is not None and cached[0] == key(snapshot):
+            return cached[1]
+        return compute(snapshot)
+
+    @pyqtSlot(object, object, object)
+    def apply(self, changed, removed, stacking=None):
+        """Applies what changed on the desktop since the last call.
+
+        ``changed`` holds new snapshots of windows, ``removed`` the IDs of
+        windows that are gone and ``stacking`` the window IDs bottom of the
+        stack first, or ``None`` if the order is unchanged. Only the changed
+        windows are precomputed again.
+        """
+        for window_id in removed:
+            self.windows.pop(window_id, None)
+            for name in self._precomputers:
+                self._derived.pop((name, window_id), None)
+        for snapshot in changed:
+            self.windows[snapshot.window_id] = snapshot
+            for name in self._precomputers:
+                self._precompute(name, snapshot)
+        if stacking is not None:
+            self.stacking = tuple(stacking)
+        self.changed.emit()
+
+    @pyqtSlot(object)
+    def update_window(self, snapshot: WindowSnapshot):
+        """Refreshes one window, such as the focused one, between full updates."""
+        if snapshot.window_id not in self.windows:
+            return
+        self.windows[snapshot.window_id] = snapshot
+        for name in self._precomputers:
+            self._precompute(name, snapshot)
@@ -1,12 +1,16 @@
 import sys
 import os
 import json
+import argparse
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QCursor
 from ui.main_window import MainWindow
 from ui.system_tray import SystemTray
+from ui.docking import DockingEngine
 from core.app_detector import LinuxAppDetector as AppDetector
+from core.trace import Benchmark, ReplayAppDetector, TraceRecorder
+from core.power import HIDDEN, IDLE_TIMEOUT, IdleMonitor, PowerManager
 from core.doc_retriever import DocRetriever
 
 
@@ -33,12 +37,48 @@ class Config:
             json.dump(self.data, f, indent=4)
 
 
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="wingman")
+    parser.add_argument(
+        "--record",
+        metavar="TRACE",
+        help="record the focused-window snapshots to TRACE (.gz to compress)",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="TRACE",
+        help="replay a recorded trace instead of watching the X server",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        metavar="FACTOR",
+        help="replay speed multiplier; 0 replays as fast as possible",
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="with --replay, print CPU and docking-latency figures and exit",
+    )
+    args, qt_args = parser.parse_known_args(argv[1:])
+    if args.benchmark and not args.replay:
+        parser.error("--benchmark needs --replay")
+    return args, argv[:1] + qt_args
+
+
 def main():
     """Main entry point for the wingman application."""
-    app = QApplication(sys.argv)
+    args, qt_argv = parse_args(sys.argv)
+    app = QApplication(qt_argv)
 
     config = Config()
-    app_detector = AppDetector()
+    if args.replay:
+        app_detector = ReplayAppDetector(args.replay, args.replay_speed)
+    else:
+        app_detector = AppDetector()
+    recorder = TraceRecorder(app_detector, args.record) if args.record else None
+    benchmark = Benchmark(app_detector) if args.benchmark else None
     doc_retriever = DocRetriever(config)
 
     main_window = MainWindow(doc_retriever)
@@ -63,54 +103,48 @@ def main():
     app_detector.app_changed.connect(handle_app_change_for_docs)
 
     def handle_command():
-        command = main_window.command_input.text()
-        if command:
-            doc = doc_retriever.get_documentation(command)
-            main_window.set_documentation(doc)
+        command = main_window.command_input.text().strip()
+        if len(command.split()) > 1:
+            main_window.search_documentation(command)
+        elif command:
+            main_window.request_documentation(command)
 
     main_window.command_input.returnPressed.connect(handle_command)
 
     app_detector.start()
     main_window.show()
+    doc_retriever.search_index.start_background_build()
 
     system_tray = SystemTray(app, main_window)
 
-    poll_timer = QTimer()
-    poll_state = {"last_geom": None, "stable_count": 0, "last_docked_geom": None}
-
-    def poll_active_window():
-        """Poll the active window every 100 ms and reposition MainWindow once the
-        target window has been stable (no geometry changes) for ≥ 300 ms.
-        Skip repositioning if the panel is being interactively moved."""
-
-        if main_window.is_being_interactively_moved():
-            return
-
-        info = app_detector.get_active_window_info()
-        geom = info.get("geometry", {})
-        geom_tuple = (
-            geom.get("x"),
-            geom.get("y"),
-            geom.get("width"),
-            geom.get("height"),
-        )
+    docking = DockingEngine(main_window, app_detector)
+    if benchmark is not None:
+        docking.docked.connect(lambda _: benchmark.repositioned())
 
-        if geom_tuple == poll_state["last_geom"]:
-            poll_state["stable_count"] += 1
-        else:
-            poll_state["stable_count"] = 1
-            poll_state["last_geom"] = geom_tuple
+    power = PowerManager(app_detector, main_window.doc_loader)
+    main_window.visibility_changed.connect(
+        lambda visible: power.set_reason(HIDDEN, not visible)
+    )
+    idle_monitor = None
+    if not args.replay:
+        idle_monitor = IdleMonitor(config.get("idle_timeout", IDLE_TIMEOUT))
+        power.watch_idle(idle_monitor)
 
-        if poll_state["stable_count"] >= 3:
-            if geom_tuple != poll_state["last_docked_geom"] and None not in geom_tuple:
-                poll_state["last_docked_geom"] = geom_tuple
+    if benchmark is not None:
 
-                main_window.reposition_to_window(geom)
+        def finish_benchmark():
+            # Let the last docking settle before reporting.
+            QTimer.singleShot(500, lambda: (print(benchmark.report()), app.quit()))
 
-    poll_timer.timeout.connect(poll_active_window)
-    poll_timer.start(100)
+        app_detector.finished.connect(finish_benchmark)
 
     app.aboutToQuit.connect(app_detector.stop)
+    if idle_monitor is not None:
+        app.aboutToQuit.connect(idle_monitor.close)
+    if recorder is not None:
+        app.aboutToQuit.connect(recorder.close)
+    app.aboutToQuit.connect(main_window.doc_loader.shutdown)
+    app.aboutToQuit.connect(doc_retriever.close)
 
     sys.exit(app.exec())
 
@@ -0,0 +1,76 @@
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+
+DEFAULT_REFRESH_RATE = 60.0
+
+
+class DockingEngine(QObject):
+    """
+    Keeps the panel docked to the focused window as it moves.
+
+    Geometry changes arrive from the detector as they happen, which during
+    a drag is far more often than the screen can show them. The first change
+    after a quiet spell is applied at once; later ones only record the latest
+    snapshot, which is applied on the next display frame. The panel therefore
+    follows a drag at most one ``setGeometry`` per frame and, because the
+    last change is always applied, settles exactly where the window stops.
+
+    Where the panel goes for each window is precomputed in the detector's
+    desktop model as ``"placement"``, so a frame is a lookup and one move.
+    """
+
+    docked = pyqtSignal(object)
+
+    def __init__(self, main_window, detector, parent=None):
+        super().__init__(parent)
+        self.main_window = main_window
+        self.detector = detector
+        self.last_docked_geometry = None
+        self._pending = None
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._frame_timer.timeout.connect(self._on_frame)
+        detector.desktop.add_precomputer(
+            "placement",
+            lambda snapshot: snapshot.geometry,
+            lambda snapshot: main_window.panel_geometry_for(snapshot.geometry_dict()),
+        )
+        main_window.placement.changed.connect(self.invalidate_placements)
+        detector.snapshots.geometry_changed.connect(self.schedule)
+
+    def invalidate_placements(self):
+        self.detector.desktop.invalidate("placement")
+
+    def frame_interval(self) -> int:
+        """Milliseconds per frame on the panel's screen."""
+        screen = self.main_window.screen()
+        rate = screen.refreshRate() if screen is not None else 0
+        if rate <= 0:
+            rate = DEFAULT_REFRESH_RATE
+        return max(1, round(1000 / rate))
+
+    def schedule(self, snapshot):
+        """Dock to ``snapshot`` now, or on the next frame if one was just drawn."""
+        if self._frame_timer.isActive():
+            self._pending = snapshot
+            return
+        self._dock(snapshot)
+        self._frame_timer.start(self.frame_interval())
+
+    def _on_frame(self):
+        snapshot, self._pending = self._pending, None
+        if snapshot is None:
+            # A frame without changes: the burst is over.
+            self._frame_timer.stop()
+            return
+        self._dock(snapshot)
+
+    def _dock(self, snapshot):
+        if self.main_window.is_being_interactively_moved():
+            return
+        if snapshot.geometry is None or snapshot.geometry == self.last_docked_geometry:
+            return
+        self.last_docked_geometry = snapshot.geometry
+
+        placement = self.detector.desktop.lookup("placement", snapshot)
+        self.main_window.reposition_to_window(snapshot.geometry_dict(), placement)
+        self.docked.emit(placement)
@@ -0,0 +1,138 @@
+from PyQt6.QtWidgets import (
+    QApplication,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QKeySequence, QShortcut
+
+
+class InlinePrompt(QWidget):
+    """
+    A yes/no question shown inside the panel instead of in a modal dialog.
+
+    The widget and its ``Y``/``N``/``Enter``/``Esc`` shortcuts are built once
+    and reused: :meth:`ask` replaces whatever was being asked and shows the
+    prompt, and the answer arrives later as ``answered(kind, context, yes)``.
+    Nothing waits for it, so timers and detection carry on while the
+    question is up. A question replaced before it was answered gets no
+    answer.
+
+    The shortcuts only apply while the prompt has focus, which it takes
+    unless the user is typing somewhere else.
+    """
+
+    answered = pyqtSignal(str, object, bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.kind = None
+        self.context = None
+        self.default = True
+
+        self.setObjectName("inlinePrompt")
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground)
+        self.setStyleSheet("""
+            QWidget#inlinePrompt {
+                background-color: rgba(40, 40, 40, 240);
+                border: 1px solid rgba(80, 80, 80, 180);
+                border-radius: 6px;
+            }
+            QLabel {
+                color: white;
+                font-size: 12px;
+            }
+            QPushButton {
+                background-color: rgba(60, 60, 60, 200);
+                color: white;
+                border: 1px solid rgba(100, 100, 100, 180);
+                border-radius: 4px;
+                padding: 4px 16px;
+                min-width: 60px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: rgba(80, 80, 80, 220);
+                border: 1px solid rgba(120, 120, 120, 200);
+            }
+            QPushButton:pressed {
+                background-color: rgba(100, 100, 100, 200);
+            }
+            QPushButton:default {
+                background-color: rgba(70, 120, 70, 200);
+                border: 1px solid rgba(100, 150, 100, 180);
+            }
+        """)
+
+        layout = QHBoxLayout(self)
+        text_layout = QVBoxLayout()
+        # The question may quote a command or window title, which must not
+        # be taken for rich text.
+        self.text_label = QLabel()
+        self.text_label.setTextFormat(Qt.TextFormat.PlainText)
+        self.text_label.setWordWrap(True)
+        text_layout.addWidget(self.text_label)
+        self.informative_label = QLabel()
+        self.informative_label.setTextFormat(Qt.TextFormat.PlainText)
+        self.informative_label.setWordWrap(True)
+        self.informative_label.setStyleSheet("color: lightgray; font-size: 11px;")
+        text_layout.addWidget(self.informative_label)
+        layout.addLayout(text_layout, 1)
+
+        self.yes_button = QPushButton("&Yes")
+        self.yes_button.clicked.connect(lambda: self.answer(True))
+        layout.addWidget(self.yes_button)
+        self.no_button = QPushButton("&No")
+        self.no_button.clicked.connect(lambda: self.answer(False))
+        layout.addWidget(self.no_button)
+
+        context = Qt.ShortcutContext.WidgetWithChildrenShortcut
+        for key, yes in (("Y", True), ("N", False), ("Esc", False)):
+            shortcut = QShortcut(QKeySequence(key), self)
+            shortcut.setContext(context)
+            shortcut.activated.connect(lambda yes=yes: self.answer(yes))
+        for key in ("Return", "Enter"):
+            shortcut = QShortcut(QKeySequence(key), self)
+            shortcut.setContext(context)
+            shortcut.activated.connect(lambda: self.answer(self.default))
+
+        self.setVisible(False)
+
+    def ask(self, kind: str, text: str, informative="", context=None, default=True):
+        """Shows a question, replacing any unanswered one.
+
+        Args:
+            kind (str): What is being asked, passed back with the answer
+            text (str): The question
+            informative (str): A smaller line of detail under it
+            context: Passed back with the answer
+            default (bool): Whether Enter means yes
+        """
+        self.kind = kind
+        self.context = context
+        self.default = default
+        self.text_label.setText(text)
+        self.informative_label.setText(informative)
+        self.informative_label.setVisible(bool(informative))
+        self.yes_button.setDefault(default)
+        self.no_button.setDefault(not default)
+        self.setVisible(True)
+        if not isinstance(QApplication.focusWidget(), QLineEdit):
+            (self.yes_button if default else self.no_button).setFocus()
+
+    def dismiss(self):
+        """Hides the prompt without answering it."""
+        self.kind = None
+        self.context = None
+        self.setVisible(False)
+
+    def answer(self, yes: bool):
+        if self.kind is None:
+            return
+        kind, context = self.kind, self.context
+        self.dismiss()
+        self.answered.emit(kind, context, yes)
@@ -1,7 +1,7 @@
+import html
 from PyQt6.QtWidgets import (
     QMainWindow,
     QStackedWidget,
-    QApplication,
     QWidget,
     QVBoxLayout,
     QLineEdit,
@@ -10,19 +10,44 @@ from PyQt6.QtWidgets import (
     QScrollArea,
     QPushButton,
     QHBoxLayout,
-    QMessageBox,
+    QTabBar,
+    QSizePolicy,
 )
-from PyQt6.QtCore import QPropertyAnimation, QEasingCurve, QRect, Qt, QTimer, QPoint
-from PyQt6.QtGui import QScreen, QGuiApplication, QKeySequence, QShortcut
+from PyQt6.QtCore import (
+    QEvent,
+    QPropertyAnimation,
+    QEasingCurve,
+    Qt,
+    QTimer,
+    pyqtSignal,
+)
+from PyQt6.QtGui import (
+    QScreen,
+    QDesktopServices,
+    QTextCursor,
+)
+from core.doc_loader import DocLoader
+from ui.inline_prompt import InlinePrompt
+from ui.placement import PlacementEngine
 
 
 class MainWindow(QMainWindow):
+    visibility_changed = pyqtSignal(bool)
+
     def __init__(self, doc_retriever=None):
         super().__init__()
         self.position = None
         self.is_being_moved = False
         self.auto_positioning_enabled = True
         self.doc_retriever = doc_retriever
+        self.placement = PlacementEngine(self)
+
+        self.doc_loader = None
+        if doc_retriever is not None:
+            self.doc_loader = DocLoader(doc_retriever, self)
+            self.doc_loader.documentation_ready.connect(self._on_documentation_ready)
+            self.doc_loader.documentation_failed.connect(self._on_documentation_failed)
+            self.doc_loader.documentation_part.connect(self._on_documentation_part)
 
         self.countdown_timer = QTimer()
         self.countdown_timer.timeout.connect(self.show_confirmation_dialog)
@@ -33,6 +58,10 @@ class MainWindow(QMainWindow):
         self.doc_delay_timer.setSingleShot(True)
         self.doc_delay_timer.timeout.connect(self._show_delayed_documentation)
         self.pending_doc_app = None
+        # The command whose "Loading..." message is showing, and whether it
+        # was asked for the detected application rather than typed.
+        self.loading_command = None
+        self.loading_follows_focus = False
 
         self.setWindowFlags(
             Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint
@@ -46,7 +75,20 @@ class MainWindow(QMainWindow):
         self.central_widget.setStyleSheet(
             "background-color: rgba(40, 40, 40, 128); color: white;"
         )
-        self.setCentralWidget(self.central_widget)
+        # While the panel animates, the stack shows a snapshot of the content
+        # instead, so the document isn't laid out again on every frame.
+        self.content_stack = QStackedWidget()
+        self.content_stack.addWidget(self.central_widget)
+        self.frozen_view = QLabel()
+        self.frozen_view.setAlignment(
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop
+        )
+        self.frozen_view.setSizePolicy(
+            QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored
+        )
+        self.content_stack.addWidget(self.frozen_view)
+        self.frozen_layout = None
+        self.setCentralWidget(self.content_stack)
         self.main_layout = QVBoxLayout(self.central_widget)
 
         self.command_input = QLineEdit()
@@ -82,8 +124,26 @@ class MainWindow(QMainWindow):
         info_widget.setLayout(info_layout)
         self.main_layout.addWidget(info_widget)
 
+        self.prompt = InlinePrompt()
+        self.prompt.answered.connect(self._on_prompt_answered)
+        self.main_layout.addWidget(self.prompt)
+
+        self.source_tabs = QTabBar()
+        self.source_tabs.setStyleSheet("color: white;")
+        self.source_tabs.setVisible(False)
+        self.source_tabs.currentChanged.connect(self._on_source_tab_changed)
+        self.main_layout.addWidget(self.source_tabs)
+        self.source_documents = []
+
         self.doc_view = QTextBrowser()
         self.doc_view.setStyleSheet("color: white;")
+        self.doc_view.setOpenLinks(False)
+        self.doc_view.anchorClicked.connect(self._on_doc_link_clicked)
+        self.doc_view.verticalScrollBar().valueChanged.connect(
+            self._render_visible_sections
+        )
+        self.current_document = None
+        self.rendered_sections = 0
         self.doc_scroll_area = QScrollArea()
         self.doc_scroll_area.setWidget(self.doc_view)
         self.doc_scroll_area.setWidgetResizable(True)
@@ -92,6 +152,7 @@ class MainWindow(QMainWindow):
         self.animation = QPropertyAnimation(self, b"geometry")
         self.animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
         self.animation.setDuration(300)
+        self.animation.stateChanged.connect(self._on_animation_state_changed)
 
     def mousePressEvent(self, event):
         """Track when the panel is being moved interactively"""
@@ -147,24 +208,9 @@ class MainWindow(QMainWindow):
             return
 
         self.position = position
-        primary_screen = QApplication.primaryScreen()
-        if primary_screen is None:
-            return
-        screen_geometry = primary_screen.availableGeometry()
-        width = 600
-        height = 200
-
-        if position == "top":
-            end_rect = QRect(0, 0, width, height)
-        elif position == "bottom":
-            end_rect = QRect(0, screen_geometry.height() - height, width, height)
-        elif position == "left":
-            end_rect = QRect(0, 0, width, screen_geometry.height())
-        elif position == "right":
-            end_rect = QRect(
-                screen_geometry.width() - width, 0, width, screen_geometry.height()
-            )
-        else:
+        current = self.geometry() if self.isVisible() else None
+        end_rect = self.placement.edge_rect(position, current)
+        if end_rect is None:
             return
 
         start_rect = self.geometry()
@@ -174,6 +220,56 @@ class MainWindow(QMainWindow):
         self.animation.start()
         self.setGeometry(end_rect)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not event.spontaneous():
+            self.visibility_changed.emit(True)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        if not event.spontaneous():
+            self.visibility_changed.emit(False)
+
+    def _on_animation_state_changed(self, new_state, old_state):
+        if new_state == QPropertyAnimation.State.Running:
+            # Hovering an edge-docked panel that is already in place runs an
+            # animation with nothing to move; a snapshot would be wasted.
+            if self.animation.startValue() != self.animation.endValue():
+                self._freeze_content()
+        else:
+            self._thaw_content()
+
+    def _freeze_content(self):
+        """Show a snapshot of the panel's content in place of the live widgets.
+
+        Only the stack's current page follows the window's size, so while
+        frozen, each animation frame moves a pixmap rather than laying out
+        the document again. The document's layout also lays out a long
+        document in steps from a timer after each resize; those steps are
+        held back until the animation ends.
+        """
+        if self.content_stack.currentWidget() is self.frozen_view:
+            return
+        self.frozen_view.setPixmap(self.central_widget.grab())
+        self.content_stack.setCurrentWidget(self.frozen_view)
+        self.frozen_layout = self.doc_view.document().documentLayout()
+        self.frozen_layout.installEventFilter(self)
+
+    def _thaw_content(self):
+        """Bring back the live content, laid out once at the final size."""
+        if self.content_stack.currentWidget() is self.central_widget:
+            return
+        if self.frozen_layout is not None:
+            self.frozen_layout.removeEventFilter(self)
+            self.frozen_layout = None
+        self.content_stack.setCurrentWidget(self.central_widget)
+        self.frozen_view.clear()
+
+    def eventFilter(self, obj, event):
+        if obj is self.frozen_layout and event.type() == QEvent.Type.Timer:
+            return True
+        return super().eventFilter(obj, event)
+
     def enterEvent(self, event):
         if not self.is_being_interactively_moved():
             self.animation.setDirection(QPropertyAnimation.Direction.Forward)
@@ -206,7 +302,17 @@ class MainWindow(QMainWindow):
         """Return True if the panel is currently being moved by the user or auto-positioning is disabled"""
         return self.is_being_moved or not self.auto_positioning_enabled
 
-    def reposition_to_window(self, target_geometry: dict):
+    def panel_geometry_for(self, target_geometry: dict):
+        """Return the panel geometry that aligns with the given window, as a
+        ``QRect``, or ``None`` if there is no screen to place it on.
+
+        See :pymeth:`ui.placement.PlacementEngine.panel_rect`. This only
+        computes; it has no effect on the panel, so the result can be
+        prepared before it is needed.
+        """
+        return self.placement.panel_rect(target_geometry)
+
+    def reposition_to_window(self, target_geometry: dict, placement=None):
         """Position the panel so that it aligns with the given window's position and size.
         Uses the active window's x position and width instead of always spanning full screen.
         Ensures the panel stays on the same monitor as the target window.
@@ -221,159 +327,114 @@ class MainWindow(QMainWindow):
         target_geometry : dict
             Mapping returned by :pyclass:`~src.core.app_detector.LinuxAppDetector`.
             Expected keys are ``x``, ``y``, ``width`` and ``height``.
+        placement : QRect, optional
+            The result of :pymeth:`panel_geometry_for` for ``target_geometry``,
+            if it was computed ahead of time.
         """
         if not target_geometry or not self.auto_positioning_enabled:
             return
 
-        target_x = target_geometry.get("x", 0)
-        target_y = target_geometry.get("y", 0)
-        target_width = target_geometry.get("width", 600)
-
-        origin_pt = QPoint(target_x, target_y)
-        target_screen = None
-        for screen in QGuiApplication.screens():
-            if screen and screen.geometry().contains(origin_pt):
-                target_screen = screen
-                break
-
-        if target_screen is None:
-            target_screen = QGuiApplication.primaryScreen()
-
-        if target_screen is None:
-            return
-
-        screen_geom = target_screen.geometry()
-
-        panel_width = min(target_width, 800)
-        panel_width = max(panel_width, 400)
-        panel_height = 200
-
-        panel_x = target_x
-        panel_y = target_y
-
-        if panel_x + panel_width > screen_geom.right():
-            panel_x = screen_geom.right() - panel_width
-        if panel_x < screen_geom.left():
-            panel_x = screen_geom.left()
-
-        if panel_y + panel_height > screen_geom.bottom():
-            panel_y = screen_geom.bottom() - panel_height
-        if panel_y < screen_geom.top():
-            panel_y = screen_geom.top()
-
-        current_geom = self.geometry()
-        if (
-            current_geom.x() == panel_x
-            and current_geom.y() == panel_y
-            and current_geom.width() == panel_width
-            and current_geom.height() == panel_height
-        ):
+        if placement is None:
+            placement = self.panel_geometry_for(target_geometry)
+        if placement is None or placement == self.geometry():
             return
 
         if self.animation.state() == QPropertyAnimation.State.Running:
             self.animation.stop()
 
-        self.setGeometry(panel_x, panel_y, panel_width, panel_height)
+        self.setGeometry(placement)
 
         self.position = "custom"
 
     def set_documentation(self, doc_text):
+        self._clear_source_tabs()
+        self.current_document = None
         self.doc_view.setHtml(doc_text)
 
-    def show_confirmation_dialog(self):
-        """Show a confirmation dialog after the 30-second countdown expires"""
-        msg_box = QMessageBox(self)
-        msg_box.setWindowTitle("Action Required")
-        msg_box.setText(
-            f"Do you want to continue with the detected application:\n\n{self.current_detected_app}"
-        )
-        msg_box.setInformativeText("Press 'Y' for Yes or 'N' for No")
-
-        yes_button = msg_box.addButton("&Yes", QMessageBox.ButtonRole.YesRole)
-        no_button = msg_box.addButton("&No", QMessageBox.ButtonRole.NoRole)
-        msg_box.setDefaultButton(yes_button)
-
-        main_geometry = self.geometry()
-        dialog_width = 400
-        dialog_height = 150
-
-        center_x = main_geometry.x() + (main_geometry.width() - dialog_width) // 2
-        center_y = main_geometry.y() + (main_geometry.height() - dialog_height) // 2
-
-        screen = QApplication.screenAt(QPoint(center_x, center_y))
-        if screen:
-            screen_geometry = screen.availableGeometry()
-            center_x = max(
-                screen_geometry.x(),
-                min(
-                    center_x,
-                    screen_geometry.x() + screen_geometry.width() - dialog_width,
-                ),
-            )
-            center_y = max(
-                screen_geometry.y(),
-                min(
-                    center_y,
-                    screen_geometry.y() + screen_geometry.height() - dialog_height,
-                ),
-            )
+    def _clear_source_tabs(self):
+        self.source_documents = []
+        self.source_tabs.blockSignals(True)
+        while self.source_tabs.count():
+            self.source_tabs.removeTab(0)
+        self.source_tabs.blockSignals(False)
+        self.source_tabs.setVisible(False)
 
-        msg_box.setGeometry(center_x, center_y, dialog_width, dialog_height)
-
-        msg_box.setStyleSheet("""
-            QMessageBox {
-                background-color: rgba(40, 40, 40, 240);
-                color: white;
-                border: 2px solid rgba(80, 80, 80, 180);
-                border-radius: 8px;
-                font-size: 12px;
-            }
-            QMessageBox QLabel {
-                color: white;
-                font-size: 12px;
-                padding: 10px;
-            }
-            QMessageBox QPushButton {
-                background-color: rgba(60, 60, 60, 200);
-                color: white;
-                border: 1px solid rgba(100, 100, 100, 180);
-                border-radius: 4px;
-                padding: 8px 20px;
-                min-width: 80px;
-                font-size: 11px;
-                font-weight: bold;
-                margin: 4px;
-            }
-            QMessageBox QPushButton:hover {
-                background-color: rgba(80, 80, 80, 220);
-                border: 1px solid rgba(120, 120, 120, 200);
-            }
-            QMessageBox QPushButton:pressed {
-                background-color: rgba(100, 100, 100, 200);
-                border: 1px solid rgba(140, 140, 140, 220);
-            }
-            QMessageBox QPushButton:default {
-                background-color: rgba(70, 120, 70, 200);
-                border: 1px solid rgba(100, 150, 100, 180);
-            }
-            QMessageBox QPushButton:default:hover {
-                background-color: rgba(90, 140, 90, 220);
-                border: 1px solid rgba(120, 170, 120, 200);
-            }
-        """)
-
-        yes_shortcut = QShortcut(QKeySequence("Y"), msg_box)
-        yes_shortcut.activated.connect(
-            lambda: msg_box.done(QMessageBox.StandardButton.Yes.value)
-        )
+    def _on_source_tab_changed(self, index):
+        if 0 <= index < len(self.source_documents):
+            self.show_document(self.source_documents[index][1])
 
-        no_shortcut = QShortcut(QKeySequence("N"), msg_box)
-        no_shortcut.activated.connect(
-            lambda: msg_box.done(QMessageBox.StandardButton.No.value)
-        )
+    def show_document(self, document):
+        """Display a :pyclass:`~core.document.Document` section by section.
 
-        result = msg_box.exec()
-        return msg_box.clickedButton() == yes_button
+        Only the leading NAME and SYNOPSIS sections are laid out straight away,
+        followed by a line of links to the remaining sections. Those are
+        appended as the reader scrolls down to them or follows a link.
+
+        Args:
+            document (Document): The documentation to show
+        """
+        self.current_document = document
+        self.rendered_sections = document.lead_count()
+
+        parts = [f"<h3>{html.escape(document.title)}</h3>"]
+        links = [
+            f'<a href="#section-{index}">{html.escape(section.name)}</a>'
+            for index, section in enumerate(document.sections)
+            if index >= self.rendered_sections and section.name
+        ]
+        if links:
+            parts.append(f"<p>{' | '.join(links)}</p>")
+        for index in range(self.rendered_sections):
+            parts.append(self._section_html(index))
+
+        self.doc_view.setHtml("".join(parts))
+        QTimer.singleShot(0, self._render_visible_sections)
+
+    def _section_html(self, index):
+        fragment = self.current_document.section_html(index)
+        return f'<a name="section-{index}"></a>{fragment}'
+
+    def _render_sections_until(self, index):
+        """Append the not yet rendered sections up to and including ``index``."""
+        document = self.current_document
+        if document is None:
+            return
+        index = min(index, len(document.sections) - 1)
+        if index < self.rendered_sections:
+            return
+        parts = [
+            self._section_html(i) for i in range(self.rendered_sections, index + 1)
+        ]
+        self.rendered_sections = index + 1
+        cursor = QTextCursor(self.doc_view.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertHtml("".join(parts))
+
+    def _render_visible_sections(self, *args):
+        """Lay out further sections while the end of the text is within a
+        screenful of the visible area."""
+        document = self.current_document
+        if document is None:
+            return
+        scroll_bar = self.doc_view.verticalScrollBar()
+        viewport_height = self.doc_view.viewport().height()
+        while (
+            self.rendered_sections < len(document.sections)
+            and scroll_bar.maximum() - scroll_bar.value() < viewport_height
+        ):
+            self._render_sections_until(self.rendered_sections)
+
+    def show_confirmation_dialog(self):
+        """Ask inline whether to continue with the detected application, once
+        the 30-second countdown expires. Replaces any question still up."""
+        self.prompt.ask(
+            "confirm_app",
+            "Do you want to continue with the detected application: "
+            f"{self.current_detected_app}?",
+            "Press 'Y' for Yes or 'N' for No",
+            context=self.current_detected_app,
+            default=True,
+        )
 
     def start_countdown_timer(self):
         """Start the 30-second countdown timer"""
@@ -403,23 +464,39 @@ class MainWindow(QMainWindow):
         if self.doc_delay_timer.isActive():
             self.doc_delay_timer.stop()
         self.load_docs_button.setVisible(False)
+        # A lookup for the application that had focus is stale now; one the
+        # user typed or clicked is not.
+        if self.loading_follows_focus:
+            self.cancel_documentation()
 
         if not self.doc_retriever or not app_name or app_name == "None":
+            if self.doc_loader:
+                self.doc_loader.cancel_prefetch()
             return
 
-        clean_app_name = app_name
-        if "/" in clean_app_name:
-            clean_app_name = clean_app_name.split("/")[-1]
-        if "." in clean_app_name:
-            clean_app_name = clean_app_name.split(".")[0]
-
+        clean_app_name = self._clean_app_name(app_name)
         self.pending_doc_app = clean_app_name
 
+        # Fetch in the background now so the docs are cached by the time the
+        # button appears; switching apps again replaces this prefetch.
+        if self.doc_loader and clean_app_name:
+            self.doc_loader.prefetch(clean_app_name)
+
         if self.doc_delay_timer.isActive():
             self.doc_delay_timer.stop()
 
         self.doc_delay_timer.start(5000)
 
+    @staticmethod
+    def _clean_app_name(app_name):
+        """Reduce a detected application name to the command to document."""
+        clean_app_name = app_name
+        if "/" in clean_app_name:
+            clean_app_name = clean_app_name.split("/")[-1]
+        if "." in clean_app_name:
+            clean_app_name = clean_app_name.split(".")[0]
+        return clean_app_name
+
     def _show_delayed_documentation(self):
         """Called by the delay timer to show the documentation load button.
 
@@ -441,57 +518,120 @@ class MainWindow(QMainWindow):
         self.pending_doc_app = None
         self.load_docs_button.setVisible(False)
 
-        try:
-            documentation = self.doc_retriever.get_documentation(app_name)
-            self.set_documentation(documentation)
-        except Exception as e:
-            error_msg = f"Error retrieving documentation for {app_name}: {str(e)}"
-            self.set_documentation(error_msg)
+        self.request_documentation(app_name, follows_focus=True)
 
-    def show_documentation_dialog(self, app_name):
-        """Show a non-intrusive dialog asking if the user wants documentation.
+    def request_documentation(self, command, follows_focus=False):
+        """Retrieve documentation for ``command`` without blocking the GUI thread.
+
+        The result arrives through :pyclass:`~core.doc_loader.DocLoader`; a newer
+        request or a call to :pymeth:`cancel_documentation` discards it.
 
         Args:
-            app_name (str): The name of the application
+            command (str): The command to look up
+            follows_focus (bool): The request is for the detected application,
+                so focus moving to another one discards it too
+        """
+        if not self.doc_loader or not command:
+            return
+
+        self.set_documentation(f"Loading documentation for {command}...")
+        self.loading_command = command
+        self.loading_follows_focus = follows_focus
+        self.doc_loader.request(command)
+
+    def search_documentation(self, query):
+        """Show installed commands matching a free-text query, best first.
 
-        Returns:
-            bool: True if user wants documentation, False otherwise
+        Each result links to its documentation.
+
+        Args:
+            query (str): Words describing the task, e.g. "compress a directory"
         """
-        msg_box = QMessageBox(self)
-        msg_box.setWindowTitle("Documentation Available")
-        msg_box.setText(f"Would you like to view documentation for '{app_name}'?")
-        msg_box.setInformativeText(
-            "This will retrieve and display help information for the detected application."
+        if not self.doc_retriever or not query.strip():
+            return
+
+        self.cancel_documentation()
+        results = self.doc_retriever.search(query)
+        if not results:
+            if self.doc_retriever.search_index.is_building():
+                self.set_documentation(
+                    "The search index is still being built, try again shortly."
+                )
+            else:
+                self.set_documentation(f"No commands found for '{html.escape(query)}'")
+            return
+
+        items = []
+        for result in results:
+            command = html.escape(result["command"])
+            section = f"({html.escape(result['section'])})" if result["section"] else ""
+            summary = html.escape(result["summary"])
+            items.append(
+                f'<li><a href="man:{command}"><b>{command}</b></a>{section}'
+                f" — {summary}</li>"
+            )
+        self.set_documentation(
+            f"<h3>Commands matching '{html.escape(query)}'</h3><ul>{''.join(items)}</ul>"
         )
-        msg_box.setStandardButtons(
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+
+    def _on_doc_link_clicked(self, url):
+        fragment = url.fragment()
+        if not url.scheme() and fragment.startswith("section-"):
+            self._render_sections_until(int(fragment.removeprefix("section-")))
+            self.doc_view.scrollToAnchor(fragment)
+        elif url.scheme() == "man":
+            self.request_documentation(url.path())
+        else:
+            QDesktopServices.openUrl(url)
+
+    def cancel_documentation(self):
+        """Drop any documentation request that is still in flight, and its
+        loading message."""
+        if self.doc_loader:
+            self.doc_loader.cancel()
+        if self.loading_command is not None:
+            self.set_documentation("")
+            self._loaded()
+
+    def _loaded(self):
+        self.loading_command = None
+        self.loading_follows_focus = False
+
+    def _on_documentation_part(self, generation, command, source, document):
+        """Add a tab for one source's documentation as soon as it arrives."""
+        labels = {"man": "Man page", "help": "--help", "online": "Online"}
+        self._loaded()
+        self.source_documents.append((source, document))
+        self.source_tabs.addTab(labels.get(source, source))
+        self.source_tabs.setVisible(len(self.source_documents) > 1)
+
+    def _on_documentation_ready(self, generation, command, document):
+        self._loaded()
+        if self.source_documents:
+            return
+        self.show_document(document)
+
+    def _on_documentation_failed(self, generation, command, error):
+        self._loaded()
+        error_msg = f"Error retrieving documentation for {command}: {error}"
+        self.set_documentation(error_msg)
+
+    def show_documentation_dialog(self, app_name):
+        """Ask inline whether the user wants documentation for ``app_name``.
+
+        Does not wait for the answer; saying yes loads the documentation.
+
+        Args:
+            app_name (str): The name of the application
+        """
+        self.prompt.ask(
+            "documentation",
+            f"Would you like to view documentation for '{app_name}'?",
+            "This will retrieve and display help information for the detected application.",
+            context=app_name,
+            default=False,
         )
-        msg_box.setDefaultButton(QMessageBox.StandardButton.No)
-
-        msg_box.setStyleSheet("""
-            QMessageBox {
-                background-color: rgba(40, 40, 40, 200);
-                color: white;
-                border: 1px solid gray;
-            }
-            QMessageBox QLabel {
-                color: white;
-            }
-            QMessageBox QPushButton {
-                background-color: rgba(60, 60, 60, 180);
-                color: white;
-                border: 1px solid gray;
-                padding: 5px 15px;
-                min-width: 60px;
-                margin: 2px;
-            }
-            QMessageBox QPushButton:hover {
-                background-color: rgba(80, 80, 80, 180);
-            }
-            QMessageBox QPushButton:pressed {
-                background-color: rgba(100, 100, 100, 180);
-            }
-        """)
-
-        result = msg_box.exec()
-        return result == QMessageBox.StandardButton.Yes
+
+    def _on_prompt_answered(self, kind, context, yes):
+        if kind == "documentation" and yes:
+            self.request_documentation(context, follows_focus=True)
@@ -0,0 +1,195 @@
+from collections import OrderedDict
+from PyQt6.QtCore import QObject, QRect, pyqtSignal
+from PyQt6.QtGui import QGuiApplication
+
+PLACEMENT_CACHE_SIZE = 256
+PANEL_MIN_WIDTH = 400
+PANEL_MAX_WIDTH = 800
+PANEL_HEIGHT = 200
+EDGE_PANEL_WIDTH = 600
+
+
+class ScreenInfo:
+    """
+    What placement needs to know about one screen, read once from ``QScreen``.
+
+    ``geometry`` and ``available`` are in Qt's device-independent pixels;
+    ``native`` is the screen in device pixels, as X reports window
+    geometry. Qt keeps a screen's top-left corner in device pixels and
+    scales only its size, so the two agree at the origin. ``struts`` are
+    the ``(left, top, right, bottom)`` margins reserved by docks and panels.
+    """
+
+    __slots__ = ("name", "geometry", "available", "native", "ratio", "struts")
+
+    def __init__(self, screen):
+        self.name = screen.name()
+        self.geometry = screen.geometry()
+        self.available = screen.availableGeometry()
+        self.ratio = screen.devicePixelRatio() or 1.0
+        self.native = QRect(
+            self.geometry.x(),
+            self.geometry.y(),
+            round(self.geometry.width() * self.ratio),
+            round(self.geometry.height() * self.ratio),
+        )
+        self.struts = (
+            self.available.left() - self.geometry.left(),
+            self.available.top() - self.geometry.top(),
+            self.geometry.right() - self.available.right(),
+            self.geometry.bottom() - self.available.bottom(),
+        )
+
+    def to_logical(self, x: int, y: int, width: int, height: int) -> QRect:
+        """Converts a rectangle in device pixels on this screen to Qt's."""
+        origin = self.native.topLeft()
+        return QRect(
+            origin.x() + round((x - origin.x()) / self.ratio),
+            origin.y() + round((y - origin.y()) / self.ratio),
+            round(width / self.ratio),
+            round(height / self.ratio),
+        )
+
+
+class PlacementEngine(QObject):
+    """
+    Works out where the panel goes, for any window on any screen.
+
+    Screens are indexed once and re-read only when Qt reports a screen added,
+    removed, resized, or its work area or DPI changed; ``changed`` is emitted
+    then, since earlier placements may no longer hold. Panel rectangles are
+    cached per (screen, window geometry), so placing the panel for a window
+    seen before is a dictionary lookup.
+    """
+
+    changed = pyqtSignal()
+
+    def __init__(self, parent=None, size=PLACEMENT_CACHE_SIZE):
+        super().__init__(parent)
+        self.screens = []
+        self.primary = None
+        self.size = size
+        self._cache = OrderedDict()
+        self._watched = set()
+
+        app = QGuiApplication.instance()
+        app.screenAdded.connect(self.rebuild)
+        app.screenRemoved.connect(self.rebuild)
+        app.primaryScreenChanged.connect(self.rebuild)
+        self.rebuild()
+
+    def _watch(self, screen):
+        if screen in self._watched:
+            return
+        self._watched.add(screen)
+        screen.geometryChanged.connect(self.rebuild)
+        screen.availableGeometryChanged.connect(self.rebuild)
+        screen.logicalDotsPerInchChanged.connect(self.rebuild)
+        screen.physicalDotsPerInchChanged.connect(self.rebuild)
+        screen.destroyed.connect(lambda: self._watched.discard(screen))
+
+    def rebuild(self, *_):
+        """Re-reads every screen and drops all cached placements."""
+        screens = QGuiApplication.screens()
+        for screen in screens:
+            self._watch(screen)
+        self.screens = [ScreenInfo(screen) for screen in screens]
+        primary = QGuiApplication.primaryScreen()
+        self.primary = next(
+            (info for info, screen in zip(self.screens, screens) if screen is primary),
+            self.screens[0] if self.screens else None,
+        )
+        self._cache.clear()
+        self.changed.emit()
+
+    def screen_at(self, x: int, y: int) -> ScreenInfo | None:
+        """The screen containing the device-pixel point, else the primary one."""
+        for info in self.screens:
+            if info.native.contains(x, y):
+                return info
+        return self.primary
+
+    def screen_for(self, rect: QRect) -> ScreenInfo | None:
+        """The screen containing the centre of ``rect``, in Qt's pixels."""
+        centre = rect.center()
+        for info in self.screens:
+            if info.geometry.contains(centre):
+                return info
+        return self.primary
+
+    def panel_rect(self, target_geometry: dict) -> QRect | None:
+        """
+        The panel's rectangle when docked to a window, or ``None`` without
+        a screen.
+
+        ``target_geometry`` is the window's ``x``, ``y``, ``width`` and
+        ``height`` in device pixels. The panel takes the window's position
+        and width, within limits, and is kept inside the work area of the
+        screen the window's top-left corner is on.
+        """
+        if not target_geometry:
+            return None
+        x = target_geometry.get("x", 0)
+        y = target_geometry.get("y", 0)
+        width = target_geometry.get("width", 600)
+        height = target_geometry.get("height", 0)
+
+        screen = self.screen_at(x, y)
+        if screen is None:
+            return None
+
+        key = (screen.name, x, y, width, height)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return QRect(cached)
+
+        target = screen.to_logical(x, y, width, height)
+        available = screen.available
+
+        panel_width = min(max(target.width(), PANEL_MIN_WIDTH), PANEL_MAX_WIDTH)
+        panel_height = PANEL_HEIGHT
+
+        panel_x = target.x()
+        panel_y = target.y()
+
+        if panel_x + panel_width > available.right():
+            panel_x = available.right() - panel_width
+        if panel_x < available.left():
+            panel_x = available.left()
+
+        if panel_y + panel_height > available.bottom():
+            panel_y = available.bottom() - panel_height
+        if panel_y < available.top():
+            panel_y = available.top()
+
+        rect = QRect(panel_x, panel_y, panel_width, panel_height)
+        self._cache[key] = rect
+        if len(self._cache) > self.size:
+            self._cache.popitem(last=False)
+        return QRect(rect)
+
+    def edge_rect(self, position: str, current: QRect | None = None) -> QRect | None:
+        """
+        The panel's rectangle along an edge (``top``, ``bottom``, ``left`` or
+        ``right``) of the work area of the screen it's on, given its
+        ``current`` rectangle, or of the primary screen.
+        """
+        screen = self.screen_for(current) if current is not None else self.primary
+        if screen is None:
+            return None
+        area = screen.available
+        width = EDGE_PANEL_WIDTH
+        height = PANEL_HEIGHT
+
+        if position == "top":
+            return QRect(area.x(), area.y(), width, height)
+        if position == "bottom":
+            return QRect(area.x(), area.y() + area.height() - height, width, height)
+        if position == "left":
+            return QRect(area.x(), area.y(), width, area.height())
+        if position == "right":
+            return QRect(
+                area.x() + area.width() - width, area.y(), width, area.height()
+            )
+        return None
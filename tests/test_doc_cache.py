@@ -0,0 +1,32 @@
+from core import doc_cache
+from core.doc_cache import MemoryCache
+
+
+def test_memory_cache_shrinks_on_lookup_under_pressure(monkeypatch):
+    pressure = [(0.9, 0.0)]
+    monkeypatch.setattr(doc_cache, "read_memory_pressure", lambda: pressure[0])
+    cache = MemoryCache(max_bytes=1024 * 1024, pressure_interval=0.0)
+    for i in range(4):
+        cache.put(i, "fp", "x" * 1000)
+    assert cache.get(3, "fp") == "x" * 1000
+
+    # Nothing is stored any more, but a lookup still sees the pressure.
+    pressure[0] = (0.01, 50.0)
+    assert cache.get(3, "fp") is MemoryCache.MISS
+    assert cache.budget == 0
+    assert cache.size == 0
+
+
+def test_memory_cache_samples_pressure_at_most_every_interval(monkeypatch):
+    samples = []
+
+    def read():
+        samples.append(1)
+        return 0.9, 0.0
+
+    monkeypatch.setattr(doc_cache, "read_memory_pressure", read)
+    cache = MemoryCache(pressure_interval=60.0)
+    cache.put("a", "fp", "content")
+    for _ in range(10):
+        cache.get("a", "fp")
+    assert len(samples) == 1
@@ -0,0 +1,140 @@
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from core.document import Document
+from core.doc_retriever import GATHER_ALL, DocRetriever, ProbeAborted, run_bounded
+
+
+@pytest.fixture
+def retriever(tmp_path):
+    def make(**config):
+        config = {
+            "doc_cache_path": str(tmp_path / "docs.sqlite3"),
+            "search_index_path": str(tmp_path / "index"),
+            "http_cache_path": str(tmp_path / "http.sqlite3"),
+            "doc_sources": ["man", "help"],
+            **config,
+        }
+        retriever = DocRetriever(config)
+        retriever.fetched = []
+
+        def fetch(source, command, stop):
+            retriever.fetched.append(source)
+            return None
+
+        retriever._fetch = fetch
+        made.append(retriever)
+        return retriever
+
+    made = []
+    yield make
+    for retriever in made:
+        retriever.close()
+
+
+def with_man_page(retriever, page):
+    retriever.man_index.locate = lambda command: page
+    return retriever
+
+
+def test_help_is_skipped_when_a_man_page_exists(retriever):
+    r = with_man_page(retriever(), "/usr/share/man/man1/tar.1.gz")
+    assert not r.uses_help("tar")
+    r.get_documentation("tar")
+    assert r.fetched == ["man"]
+
+
+def test_help_runs_without_a_man_page(retriever):
+    r = with_man_page(retriever(), None)
+    assert r.uses_help("mytool")
+    r.get_documentation("mytool")
+    assert sorted(r.fetched) == ["help", "man"]
+
+
+def test_help_runs_alongside_man_when_gathering_all(retriever):
+    r = with_man_page(retriever(doc_mode=GATHER_ALL), "/usr/share/man/man1/tar.1")
+    r.get_documentation("tar")
+    assert sorted(r.fetched) == ["help", "man"]
+
+
+def test_prefetch_never_runs_help(retriever):
+    r = with_man_page(retriever(), None)
+    result = r.get_documentation("mytool", run_help=False)
+    assert r.fetched == ["man"]
+    assert isinstance(result, Document)
+
+
+def wait_gone(pid, timeout=2.0):
+    """Whether ``pid`` exits (or is left a zombie) within ``timeout``."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                if f.read().rpartition(")")[2].split()[0] == "Z":
+                    return True
+        except FileNotFoundError:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def grandchild(tmp_path):
+    """A shell snippet that starts ``sleep 30`` in the background, and a
+    function returning that sleep's PID."""
+    pidfile = tmp_path / "pid"
+    pids = []
+
+    def pid():
+        pids.append(int(pidfile.read_text()))
+        return pids[-1]
+
+    yield f"sleep 30 & echo $! > {pidfile}; ", pid
+    for leftover in pids:
+        try:
+            os.kill(leftover, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+def test_run_bounded_kills_the_group_at_the_deadline(grandchild):
+    start_sleep, pid = grandchild
+    started = time.monotonic()
+    with pytest.raises(ProbeAborted, match="timed out"):
+        run_bounded(["sh", "-c", start_sleep + "wait"], timeout=0.5)
+    assert time.monotonic() - started < 3
+    assert wait_gone(pid())
+
+
+def test_run_bounded_stops_at_the_byte_cap(grandchild):
+    start_sleep, pid = grandchild
+    started = time.monotonic()
+    with pytest.raises(ProbeAborted, match="more than 65536 bytes"):
+        run_bounded(["sh", "-c", start_sleep + "yes"], timeout=10, max_bytes=65536)
+    assert time.monotonic() - started < 3
+    assert wait_gone(pid())
+
+
+def test_run_bounded_aborts_on_cancel(grandchild):
+    start_sleep, pid = grandchild
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+    started = time.monotonic()
+    with pytest.raises(ProbeAborted, match="cancelled"):
+        run_bounded(["sh", "-c", start_sleep + "wait"], timeout=30, cancel=cancel)
+    assert time.monotonic() - started < 3
+    assert wait_gone(pid())
+
+
+def test_run_bounded_returns_output_and_kills_what_is_left(grandchild):
+    start_sleep, pid = grandchild
+    started = time.monotonic()
+    # The background sleep keeps stdout open after the shell exits.
+    code, output = run_bounded(["sh", "-c", start_sleep + "echo done"], timeout=10)
+    assert (code, output) == (0, "done\n")
+    assert time.monotonic() - started < 3
+    assert wait_gone(pid())
@@ -0,0 +1,141 @@
+import http.server
+import threading
+
+import pytest
+
+from core.http_cache import HttpCache, HttpClient
+
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    """Serves a few paths with different caching headers, counting requests."""
+
+    def do_GET(self):
+        requests = self.server.requests
+        requests.append((self.path, dict(self.headers)))
+        count = sum(path == self.path for path, _ in requests)
+        headers = {}
+        if self.path == "/max-age":
+            headers["Cache-Control"] = "max-age=60"
+        elif self.path == "/etag":
+            headers["Cache-Control"] = "no-cache"
+            headers["ETag"] = '"v1"'
+            if self.headers.get("If-None-Match") == '"v1"':
+                return self.reply(304, headers)
+        elif self.path == "/last-modified":
+            headers["Cache-Control"] = "max-age=0"
+            headers["Last-Modified"] = LAST_MODIFIED
+            if self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                return self.reply(304, headers)
+        elif self.path == "/must-revalidate":
+            headers["Cache-Control"] = "max-age=0, must-revalidate"
+        elif self.path == "/no-store":
+            headers["Cache-Control"] = "no-store"
+        elif self.path == "/vary-user-agent":
+            headers["Cache-Control"] = "max-age=60"
+            headers["Vary"] = "User-Agent"
+        elif self.path == "/vary-accept-encoding":
+            headers["Cache-Control"] = "max-age=60"
+            headers["Vary"] = "Accept-Encoding"
+        else:
+            return self.reply(404, headers)
+        self.reply(200, headers, f"{self.path} #{count}".encode())
+
+    def reply(self, status, headers, body=b""):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(tmp_path):
+    client = HttpClient(HttpCache(str(tmp_path / "http.sqlite3")))
+    yield client
+    client.close()
+
+
+def url(server, path):
+    host, port = server.server_address
+    return f"http://{host}:{port}{path}"
+
+
+def hits(server, path):
+    return [headers for p, headers in server.requests if p == path]
+
+
+def test_fresh_response_is_served_from_cache(server, client):
+    assert client.get_text(url(server, "/max-age")) == "/max-age #1"
+    assert client.get_text(url(server, "/max-age")) == "/max-age #1"
+    assert len(hits(server, "/max-age")) == 1
+
+
+def test_stale_response_is_revalidated_with_etag(server, client):
+    assert client.get_text(url(server, "/etag")) == "/etag #1"
+    assert client.get_text(url(server, "/etag")) == "/etag #1"
+    requests = hits(server, "/etag")
+    assert len(requests) == 2
+    assert requests[1]["If-None-Match"] == '"v1"'
+
+
+def test_stale_response_is_revalidated_with_last_modified(server, client):
+    assert client.get_text(url(server, "/last-modified")) == "/last-modified #1"
+    assert client.get_text(url(server, "/last-modified")) == "/last-modified #1"
+    requests = hits(server, "/last-modified")
+    assert len(requests) == 2
+    assert requests[1]["If-Modified-Since"] == LAST_MODIFIED
+
+
+def test_no_store_response_is_not_cached(server, client):
+    assert client.get_text(url(server, "/no-store")) == "/no-store #1"
+    assert client.get_text(url(server, "/no-store")) == "/no-store #2"
+    assert client.cache.get(url(server, "/no-store")) is None
+
+
+def test_varying_response_is_not_cached(server, client):
+    assert client.get_text(url(server, "/vary-user-agent")) == "/vary-user-agent #1"
+    assert client.get_text(url(server, "/vary-user-agent")) == "/vary-user-agent #2"
+    assert client.cache.get(url(server, "/vary-user-agent")) is None
+
+
+def test_vary_accept_encoding_is_cached(server, client):
+    path = "/vary-accept-encoding"
+    assert client.get_text(url(server, path)) == f"{path} #1"
+    assert client.get_text(url(server, path)) == f"{path} #1"
+    assert len(hits(server, path)) == 1
+
+
+def test_stale_response_is_served_when_server_is_gone(server, client):
+    assert client.get_text(url(server, "/last-modified")) == "/last-modified #1"
+    server.shutdown()
+    server.server_close()
+    assert client.get_text(url(server, "/last-modified")) == "/last-modified #1"
+
+
+@pytest.mark.parametrize("path", ["/must-revalidate", "/etag"])
+def test_stale_response_must_be_revalidated(server, client, path):
+    assert client.get_text(url(server, path)) == f"{path} #1"
+    assert client.cache.get(url(server, path)) is not None
+    server.shutdown()
+    server.server_close()
+    assert client.get_text(url(server, path)) is None
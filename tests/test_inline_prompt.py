@@ -0,0 +1,25 @@
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+from PyQt6.QtCore import Qt  # noqa: E402
+
+from ui.inline_prompt import InlinePrompt  # noqa: E402
+
+
+def test_prompt_shows_markup_as_plain_text(qapp):
+    prompt = InlinePrompt()
+    prompt.ask("open", "Open <b>docs</b> for a<br>b?", "from <i>window</i>")
+    for label in (prompt.text_label, prompt.informative_label):
+        assert label.textFormat() == Qt.TextFormat.PlainText
+    assert prompt.text_label.text() == "Open <b>docs</b> for a<br>b?"
+
+
+def test_prompt_answers_once(qapp):
+    prompt = InlinePrompt()
+    answers = []
+    prompt.answered.connect(lambda *args: answers.append(args))
+    prompt.ask("open", "Open docs?", context="ls")
+    prompt.answer(True)
+    prompt.answer(False)
+    assert answers == [("open", "ls", True)]
@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+from PyQt6.QtCore import QRect  # noqa: E402
+
+from ui.main_window import MainWindow  # noqa: E402
+
+
+@pytest.fixture
+def window(qapp, monkeypatch):
+    window = MainWindow()
+    window.show()
+    window.animation.stop()
+    grabs = []
+    grab = window.central_widget.grab
+    monkeypatch.setattr(
+        window.central_widget, "grab", lambda: grabs.append(1) or grab()
+    )
+    window.grabs = grabs
+    yield window
+    window.animation.stop()
+    window.close()
+
+
+def test_content_is_frozen_while_the_panel_slides(window):
+    window.animation.setStartValue(QRect(0, 0, 600, 200))
+    window.animation.setEndValue(QRect(0, 300, 600, 200))
+    window.animation.start()
+    assert window.content_stack.currentWidget() is window.frozen_view
+    assert window.frozen_layout is window.doc_view.document().documentLayout()
+    assert len(window.grabs) == 1
+
+    window.animation.setCurrentTime(window.animation.duration())
+    assert window.content_stack.currentWidget() is window.central_widget
+    assert window.frozen_layout is None
+
+
+def test_animation_with_nothing_to_move_does_not_freeze(window):
+    rect = QRect(0, 0, 600, 200)
+    window.animation.setStartValue(rect)
+    window.animation.setEndValue(rect)
+    window.animation.start()
+    assert window.content_stack.currentWidget() is window.central_widget
+    assert window.grabs == []
@@ -0,0 +1,47 @@
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+from ui.main_window import MainWindow  # noqa: E402
+
+
+class FakeLoader:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name, *args))
+
+
+@pytest.fixture
+def window(qapp):
+    window = MainWindow()
+    window.doc_loader = FakeLoader()
+    yield window
+    window.close()
+
+
+def shown(window):
+    return window.doc_view.toPlainText()
+
+
+def test_focus_change_keeps_a_typed_lookup(window):
+    window.request_documentation("tar")
+    window.handle_auto_documentation("firefox")
+    assert ("cancel",) not in window.doc_loader.calls
+    assert shown(window) == "Loading documentation for tar..."
+
+
+def test_focus_change_drops_a_lookup_for_the_detected_app(window):
+    window.request_documentation("vim", follows_focus=True)
+    window.handle_auto_documentation("firefox")
+    assert ("cancel",) in window.doc_loader.calls
+    assert "Loading" not in shown(window)
+    assert window.loading_command is None
+
+
+def test_cancel_keeps_documentation_already_shown(window):
+    window.request_documentation("vim", follows_focus=True)
+    window._on_documentation_failed(1, "vim", "no page")
+    window.cancel_documentation()
+    assert shown(window) == "Error retrieving documentation for vim: no page"
@@ -0,0 +1,103 @@
+import pytest
+
+from core.proc_tree import ProcessTree
+from core.terminal import foreground_command, session_foreground
+
+
+class FakeProc:
+    """A ``/proc`` of ``stat`` and ``cmdline`` files under a temporary directory."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def start(self, pid, comm, ppid, session=0, tpgid=-1, start_time=1):
+        directory = self.path / str(pid)
+        directory.mkdir(exist_ok=True)
+        # pid (comm) state ppid pgrp session tty_nr tpgid, then fields 9-21,
+        # then start_time (22).
+        fields = ["S", ppid, pid, session, 0, tpgid] + [0] * 13 + [start_time]
+        (directory / "stat").write_text(
+            f"{pid} ({comm}) " + " ".join(map(str, fields)) + "\n"
+        )
+        (directory / "cmdline").write_bytes(comm.encode() + b"\0")
+
+    def exit(self, pid):
+        for name in ("stat", "cmdline"):
+            (self.path / str(pid) / name).unlink()
+        (self.path / str(pid)).rmdir()
+
+
+@pytest.fixture
+def proc(tmp_path):
+    proc = FakeProc(tmp_path)
+    proc.start(1, "init", 0)
+    return proc
+
+
+def test_update_sees_exec(proc):
+    proc.start(100, "bash", 1)
+    tree = ProcessTree(str(proc.path))
+    tree.refresh()
+    assert tree.get(100).comm == "bash"
+
+    proc.start(100, "tmux", 1)
+    tree.refresh()
+    assert tree.get(100).comm == "bash"
+    assert tree.update(100).comm == "tmux"
+    assert tree.get(100).comm == "tmux"
+    assert tree.children(1) == [100]
+
+
+def test_update_replaces_a_reused_pid(proc):
+    proc.start(100, "bash", 1, start_time=10)
+    proc.start(200, "sleep", 100, start_time=11)
+    tree = ProcessTree(str(proc.path))
+    tree.refresh()
+    assert tree.children(100) == [200]
+
+    # 100 exited, orphaning 200 to init, and its PID went to a new process.
+    proc.start(200, "sleep", 1, start_time=11)
+    proc.start(100, "vim", 1, start_time=50)
+    tree.refresh()
+    info = tree.update(100)
+    assert (info.comm, info.start_time) == ("vim", 50)
+    assert tree.children(100) == []
+    assert tree.children(1) == [100, 200]
+
+
+def test_update_drops_an_exited_process(proc):
+    proc.start(100, "bash", 1)
+    tree = ProcessTree(str(proc.path))
+    tree.refresh()
+    proc.exit(100)
+    assert tree.update(100) is None
+    assert 100 not in tree
+
+
+def test_session_foreground_is_read_fresh(proc):
+    proc.start(100, "bash", 1, session=100, tpgid=100)
+    proc.start(150, "bash", 100, session=100, tpgid=100)
+    tree = ProcessTree(str(proc.path))
+    tree.refresh()
+
+    # 150 exec'd into vim and took the foreground after it was indexed.
+    proc.start(100, "bash", 1, session=100, tpgid=150)
+    proc.start(150, "vim", 100, session=100, tpgid=150)
+    session = tree.get(100)
+    assert session_foreground(tree, session).comm == "vim"
+
+
+def test_resolvers_see_the_terminal_after_exec(proc):
+    proc.start(100, "sh", 1)
+    tree = ProcessTree(str(proc.path))
+    tree.refresh()
+    proc.start(100, "tmux", 1)
+
+    class Resolver:
+        def matches(self, process):
+            return process.comm == "tmux"
+
+        def resolve(self, tree, process):
+            return "resolved"
+
+    assert foreground_command(tree, 100, [Resolver()]) == "resolved"
@@ -0,0 +1,45 @@
+import gzip
+import os
+
+from core.roff import page_fingerprint, render_man_page
+
+PAGE = """.TH TARGET 1
+.SH NAME
+target \\- the page a stub points to
+.SH DESCRIPTION
+First version.
+"""
+
+
+def write_man_tree(tmp_path):
+    man1 = tmp_path / "man1"
+    man1.mkdir()
+    target = man1 / "target.1.gz"
+    target.write_bytes(gzip.compress(PAGE.encode()))
+    stub = man1 / "stub.1.gz"
+    stub.write_bytes(gzip.compress(b".so man1/target.1\n"))
+    return str(stub), str(target)
+
+
+def test_so_stub_renders_its_target(tmp_path):
+    stub, _ = write_man_tree(tmp_path)
+    assert "First version." in render_man_page(stub)
+
+
+def test_fingerprint_follows_so_to_the_page_that_is_read(tmp_path):
+    stub, target = write_man_tree(tmp_path)
+    before = page_fingerprint(stub)
+    assert target in before
+
+    stat = os.stat(stub)
+    with open(target, "wb") as f:
+        f.write(gzip.compress(PAGE.replace("First", "Second").encode()))
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert os.stat(stub).st_mtime_ns == stat.st_mtime_ns
+    assert page_fingerprint(stub) != before
+    assert "Second version." in render_man_page(stub)
+
+
+def test_fingerprint_of_a_missing_page(tmp_path):
+    assert page_fingerprint(str(tmp_path / "missing.1")) is None
@@ -0,0 +1,47 @@
+import time
+
+from core.search_index import SearchIndex
+
+
+class ManIndex:
+    def pages(self):
+        return {}
+
+
+class DocCache:
+    def __init__(self, entries):
+        self._entries = entries
+
+    def entries(self, source):
+        return self._entries if source == "help" else []
+
+
+HELP = [
+    ("rsync", "1", "usage: rsync [OPTION]... SRC DEST\nsynchronize files remotely"),
+    ("grep", "1", "usage: grep PATTERN [FILE]...\nsearch files for a pattern"),
+]
+
+
+def wait_for_build(index, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while index.is_building() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return not index.is_building()
+
+
+def test_build_indexes_help_text(tmp_path):
+    index = SearchIndex(ManIndex(), DocCache(HELP), str(tmp_path))
+    assert index.build()
+    results = index.search("synchronize files")
+    assert results[0]["command"] == "rsync"
+    assert results[0]["source"] == "help"
+    index.close()
+
+
+def test_background_build_runs_in_another_process(tmp_path):
+    index = SearchIndex(ManIndex(), DocCache(HELP), str(tmp_path))
+    index.start_background_build()
+    assert wait_for_build(index)
+    assert index.is_ready()
+    assert index.search("pattern")[0]["command"] == "grep"
+    index.close()
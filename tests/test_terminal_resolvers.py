@@ -0,0 +1,233 @@
+"""
+Terminal resolvers against locally started tmux, kitty and WezTerm.
+
+Each test starts its own private instance and skips when the tool isn't
+installed; kitty and WezTerm also need an X display.
+"""
+
+import os
+import shutil
+import subprocess
+import time
+import uuid
+
+import pytest
+
+from core.proc_tree import ProcessTree
+from core.terminal import ResolverUnavailable, foreground_command
+from core.terminal_resolvers import KittyResolver, TmuxResolver, WezTermResolver
+
+needs_display = pytest.mark.skipif(
+    not os.environ.get("DISPLAY"), reason="needs an X display"
+)
+
+
+def wait_for(check, timeout=10.0):
+    """Polls ``check`` until it returns something truthy, or fails."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            result = check()
+        except ResolverUnavailable:
+            result = None
+        if result or time.monotonic() > deadline:
+            return result
+        time.sleep(0.1)
+
+
+def process_named(tree, comm_prefix, ancestor):
+    """The first descendant of ``ancestor`` whose comm starts with ``comm_prefix``."""
+    tree.refresh()
+    for pid in [ancestor, *tree.descendants(ancestor)]:
+        process = tree.get(pid)
+        if process is not None and process.comm.startswith(comm_prefix):
+            return process
+    return None
+
+
+@pytest.fixture
+def tmux():
+    if shutil.which("tmux") is None:
+        pytest.skip("tmux is not installed")
+    sockets = []
+
+    def run(socket, *args):
+        if socket not in sockets:
+            sockets.append(socket)
+        return subprocess.run(
+            ["tmux", "-L", socket, *args], capture_output=True, text=True, check=False
+        )
+
+    yield run
+    # Where tmux puts -L sockets; a server doesn't remove its socket on exit.
+    directory = os.path.join(
+        os.environ.get("TMUX_TMPDIR") or "/tmp", f"tmux-{os.getuid()}"
+    )
+    for socket in sockets:
+        run(socket, "kill-server")
+        try:
+            os.unlink(os.path.join(directory, socket))
+        except FileNotFoundError:
+            pass
+
+
+@pytest.fixture
+def nested_tmux(tmux):
+    """
+    An outer tmux server acting as the terminal, running a client of an inner
+    server, as a terminal emulator running tmux would. Returns the outer
+    server's PID and a function to run commands on the inner server.
+    """
+    name = f"wingman-test-{uuid.uuid4().hex[:8]}"
+    inner, outer = f"{name}-inner", f"{name}-outer"
+    tmux(inner, "new-session", "-d", "-s", "work", "sh")
+    tmux(
+        outer,
+        "new-session",
+        "-d",
+        "-x",
+        "80",
+        "-y",
+        "24",
+        f"tmux -L {inner} attach -t work",
+    )
+    tree = ProcessTree()
+    terminal = int(tmux(outer, "display", "-p", "#{pid}").stdout)
+    assert wait_for(lambda: process_named(tree, "tmux", terminal))
+    return terminal, lambda *args: tmux(inner, *args)
+
+
+def test_tmux_idle_pane_has_no_command(nested_tmux):
+    terminal, _ = nested_tmux
+    resolver = TmuxResolver()
+    try:
+        tree = ProcessTree()
+        assert foreground_command(tree, terminal, [resolver]) is None
+    finally:
+        resolver.close()
+
+
+def test_tmux_follows_the_active_pane(nested_tmux):
+    terminal, inner = nested_tmux
+    resolver = TmuxResolver()
+    tree = ProcessTree()
+    try:
+        inner("send-keys", "-t", "work", "sleep 77", "Enter")
+        assert (
+            wait_for(lambda: foreground_command(tree, terminal, [resolver]))
+            == "sleep 77"
+        )
+
+        inner("new-window", "-t", "work", "sh")
+        inner("send-keys", "-t", "work:1", "cat", "Enter")
+        assert wait_for(lambda: foreground_command(tree, terminal, [resolver])) == "cat"
+
+        inner("select-window", "-t", "work:0")
+        assert (
+            wait_for(lambda: foreground_command(tree, terminal, [resolver]))
+            == "sleep 77"
+        )
+    finally:
+        resolver.close()
+
+
+def test_tmux_attaches_only_while_focused(nested_tmux):
+    terminal, inner = nested_tmux
+    resolver = TmuxResolver()
+    tree = ProcessTree()
+    try:
+
+        def clients():
+            return len(inner("list-clients").stdout.splitlines())
+
+        assert clients() == 1
+
+        foreground_command(tree, terminal, [resolver])
+        assert clients() == 2
+
+        resolver.release()
+        assert wait_for(lambda: clients() == 1, timeout=2.0)
+    finally:
+        resolver.close()
+
+
+@pytest.fixture
+def spawn(tmp_path):
+    processes = []
+
+    def run(*args, env=None):
+        process = subprocess.Popen(
+            args,
+            env={**os.environ, **(env or {})},
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        processes.append(process)
+        return process
+
+    yield run
+    for process in processes:
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+@needs_display
+def test_kitty_reports_the_focused_window(spawn, tmp_path):
+    if shutil.which("kitty") is None:
+        pytest.skip("kitty is not installed")
+    kitty = spawn(
+        "kitty",
+        "-o",
+        "allow_remote_control=yes",
+        "--listen-on",
+        f"unix:{tmp_path}/kitty",
+        "sh",
+        "-c",
+        "sleep 77; :",
+    )
+    tree = ProcessTree()
+    resolver = KittyResolver()
+    process = wait_for(lambda: process_named(tree, "kitty", kitty.pid))
+    assert process is not None
+
+    def resolve():
+        tree.refresh()
+        return resolver.resolve(tree, process)
+
+    assert wait_for(resolve) == "sleep 77"
+
+
+@needs_display
+def test_wezterm_reports_the_focused_pane(spawn, tmp_path):
+    if shutil.which("wezterm") is None:
+        pytest.skip("wezterm is not installed")
+    wezterm = spawn(
+        "wezterm",
+        "--config",
+        "enable_wayland=false",
+        "start",
+        "--always-new-process",
+        "--",
+        "sh",
+        "-c",
+        "sleep 78; :",
+        env={"XDG_RUNTIME_DIR": str(tmp_path)},
+    )
+    tree = ProcessTree()
+    resolver = WezTermResolver()
+    process = wait_for(lambda: process_named(tree, "wezterm", wezterm.pid))
+    assert process is not None
+
+    def resolve():
+        tree.refresh()
+        return resolver.resolve(tree, process)
+
+    assert wait_for(resolve) == "sleep 78"
+    # Cached until focus or title changes.
+    assert resolver._focused
+    resolver.release()
+    assert not resolver._focused
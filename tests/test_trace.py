@@ -0,0 +1,62 @@
+import pytest
+
+pytest.importorskip("PyQt6.QtCore")
+
+from PyQt6.QtCore import QEventLoop, QTimer  # noqa: E402
+
+from core.trace import ReplayAppDetector, TraceRecorder  # noqa: E402
+from core.window_snapshot import WindowSnapshot  # noqa: E402
+
+
+def run_until_finished(detector, timeout_ms=2000):
+    loop = QEventLoop()
+    detector.finished.connect(loop.quit)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec()
+
+
+def write_trace(path, snapshots=()):
+    recorder = TraceRecorder(_Source(), str(path))
+    for snapshot in snapshots:
+        recorder.record(snapshot)
+    recorder.close()
+
+
+class _Source:
+    """Just enough of a detector for :class:`TraceRecorder`."""
+
+    class snapshots:
+        class snapshot_changed:
+            @staticmethod
+            def connect(slot):
+                pass
+
+            @staticmethod
+            def disconnect(slot):
+                pass
+
+
+def test_empty_trace_finishes_after_start_returns(qapp, tmp_path):
+    path = tmp_path / "empty.jsonl"
+    write_trace(path)
+    detector = ReplayAppDetector(str(path), speed=0)
+    detector.start()
+    finished = []
+    detector.finished.connect(lambda: finished.append(True))
+    run_until_finished(detector)
+    assert finished == [True]
+
+
+def test_replay_publishes_every_snapshot(qapp, tmp_path):
+    path = tmp_path / "trace.jsonl.gz"
+    snapshots = [
+        WindowSnapshot(1, "one", None, "sh", "App", (0, 0, 10, 10)),
+        WindowSnapshot(2, "two", None, "sh", "App", (5, 5, 10, 10)),
+    ]
+    write_trace(path, snapshots)
+    detector = ReplayAppDetector(str(path), speed=0)
+    published = []
+    detector.snapshots.snapshot_changed.connect(published.append)
+    detector.start()
+    run_until_finished(detector)
+    assert published == snapshots
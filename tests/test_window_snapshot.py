@@ -0,0 +1,40 @@
+from core.window_snapshot import DesktopModel, WindowSnapshot
+
+
+def snapshot(window_id, title="title", geometry=(0, 0, 100, 100)):
+    return WindowSnapshot(window_id, title, None, "proc", "App", geometry)
+
+
+def test_desktop_model_precomputes_only_changed_windows():
+    model = DesktopModel()
+    computed = []
+    model.add_precomputer(
+        "placement",
+        lambda s: s.geometry,
+        lambda s: computed.append(s.window_id) or s.geometry,
+    )
+
+    model.apply((snapshot(1), snapshot(2)), (), (1, 2))
+    assert computed == [1, 2]
+    assert model.stacking == (1, 2)
+
+    computed.clear()
+    model.apply((snapshot(2, geometry=(5, 5, 100, 100)),), (), None)
+    assert computed == [2]
+    assert model.stacking == (1, 2)
+    assert model.lookup("placement", model.windows[2]) == (5, 5, 100, 100)
+
+    computed.clear()
+    model.apply((snapshot(1, title="other"),), (), None)
+    assert computed == []
+
+
+def test_desktop_model_forgets_removed_windows():
+    model = DesktopModel()
+    model.add_precomputer("placement", lambda s: s.geometry, lambda s: s.geometry)
+    model.apply((snapshot(1), snapshot(2)), (), (1, 2))
+
+    model.apply((), (1,), (2,))
+    assert set(model.windows) == {2}
+    assert model.stacking == (2,)
+    assert ("placement", 1) not in model._derived